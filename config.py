@@ -12,11 +12,80 @@ WHISPER_MODEL       = "small"
 WHISPER_DEVICE      = "cpu"        
 SAMPLE_RATE         = 44100
 SILENCE_THRESHOLD   = 2.0          
+STT_RATE            = 16000        # what Whisper consumes — mic opened at this rate when it can be
+STT_UPLOAD_FORMAT   = "flac"       # "flac" (lossless, ~2x smaller than WAV) or "opus" (~10x, lossy)
+
+# ── STT backend routing (modules/stt/backends.py) ────
+STT_BACKEND            = os.getenv("STT_BACKEND", "auto")   # "auto" | "groq" | "local"
+WHISPER_COMPUTE_TYPE   = "int8"       # faster-whisper quantization on CPU
+WHISPER_BEAM_SIZE      = 1            # 1 = greedy; raise for accuracy at a latency cost
+WHISPER_VAD_FILTER     = True         # faster-whisper's Silero VAD trims leading/trailing silence
+STT_LATENCY_BUDGET_MS  = 1500         # auto: Groq only when its expected latency fits this
+STT_LOCAL_MAX_SECONDS  = 3.0          # auto: utterances this short may stay on-device when local is measured faster
+STT_REMOTE_TIMEOUT     = 8.0          # seconds per Groq transcription request
+STT_REMOTE_MAX_MISSES  = 2            # consecutive Groq failures before backing off
+STT_REMOTE_RETRY_AFTER = 30.0         # seconds to stay local after backing off
+
+# ── Streaming / partial transcripts ──────────────────
+STT_STREAMING                 = True
+STT_PARTIAL_INTERVAL          = 0.6     # seconds of new speech between partial transcriptions
+STT_PARTIAL_WINDOW            = 4.0     # partials transcribe (at most) the last N seconds
+STT_EARLY_DISPATCH_MODES      = ("stop_mode",)   # may run before speech ends — later words can't change "stop"
+STT_EARLY_DISPATCH_CONFIDENCE = 0.95    # fast-router confidence a partial needs to dispatch
+STT_EARLY_DISPATCH_MAX_WORDS  = 3       # longer partials are sentences in progress, never dispatched early
+
+# ── Barge-in + echo suppression (modules/stt/barge_in.py) ──
+BARGE_IN_ENABLED         = True
+BARGE_IN_MODE            = "keyword"  # "keyword": only a transcribed stop command ("ruk jao"); "voice": any sustained speech (quiet rooms only)
+BARGE_IN_MIN_SPEECH_MS   = 120      # user speech over playback needed to interrupt
+BARGE_IN_KEYWORD_MAX_S   = 1.5      # keyword mode: audio transcribed to confirm the command
+BARGE_IN_CONFIDENCE      = 0.95     # keyword mode: fast-router stop_mode confidence that confirms it
+ECHO_MAX_DELAY_MS        = 250      # speaker → mic path delay window (device buffers + room)
+ECHO_TAIL_MS             = 300      # reverb after a clip ends still counts as echo
+ECHO_MARGIN_DB           = 6.0      # mic must beat the expected echo by this to be the user
+ECHO_INITIAL_COUPLING_DB = 0.0      # speaker → mic gain before it has been measured (pessimistic)
+MIC_BACKLOG_S            = 2.0      # recent audio kept so listen() can start from a barge-in onset
+
+# ── Voice activity detection (modules/stt/vad.py) ────
+VAD_FRAME_MS        = 20           # analysis frame length
+VAD_START_MS        = 60           # continuous speech needed to open an utterance
+VAD_HANGOVER_MS     = 350          # trailing silence that closes it (end-of-utterance)
+VAD_PREROLL_MS      = 200          # audio kept from before the onset so first syllables survive
+VAD_MIN_SPEECH_MS   = 250          # shorter bursts are clicks / horns — discarded
+VAD_MAX_UTTERANCE_S = 15.0         # hard stop for a stuck-open detector
+VAD_MARGIN_DB       = 9.0          # frame energy over the noise floor that counts as voice
+VAD_NOISE_ADAPT     = 0.05         # noise-floor EMA rate per non-speech frame
+VAD_MIN_VOICE_BAND  = 0.55         # share of spectral energy in 250–4000 Hz
+VAD_MAX_FLATNESS    = 0.45         # spectral flatness above this is noise-like (hiss, traffic)
 
 # ── Agent (Groq LLM for routing) ──────────────────────
 AGENT_MODEL         = "llama-3.1-8b-instant"   
 AGENT_TEMPERATURE   = 0.1
 
+# ── Local fast-path router (ahead of the LLM) ─────────
+FAST_ROUTER_ENABLED        = True
+FAST_ROUTER_MAX_WORDS      = 6      # longer utterances always go to the LLM
+FAST_ROUTER_MIN_CONFIDENCE = 0.85   # below this, fall through to the LLM
+FAST_ROUTER_FUZZY_RATIO    = 0.84   # difflib ratio for misspelt single keywords
+
+# ── Offline intent classifier (primary router, LLM is fallback) ──
+INTENT_CLASSIFIER_ENABLED        = True
+INTENT_CLASSIFIER_MIN_CONFIDENCE = 0.60   # below this, ask the LLM
+INTENT_CLASSIFIER_MIN_MARGIN     = 0.10   # winner's closest example must beat every other label's by this
+INTENT_CLASSIFIER_MIN_SIMILARITY = 0.30   # nearest example must be at least this close
+INTENT_CLASSIFIER_FULL_SIMILARITY = 0.70  # nearest example this close → no confidence penalty
+INTENT_CLASSIFIER_K              = 5      # neighbours that vote
+INTENT_EMBED_DIM                 = 2048   # hashed char n-gram vector size
+
+# ── Routing result cache ──────────────────────────────
+ROUTE_CACHE_ENABLED = True
+ROUTE_CACHE_SIZE    = 256          # distinct normalized utterances kept
+ROUTE_CACHE_TTL     = 6 * 3600     # seconds before a cached route is re-evaluated
+
+# ── Async pipeline ────────────────────────────────────
+MODULE_EXECUTOR_WORKERS = 4      # camera / ONNX / knowledge blocking work
+SPEECH_EXECUTOR_WORKERS = 2      # TTS synthesis + playback
+
 # ── Confidence Thresholds ─────────────────────────────
 CONFIDENCE_HIGH     = 0.75         # act directly
 CONFIDENCE_MEDIUM   = 0.50         # act but confirm with user
@@ -25,10 +94,51 @@ CONFIDENCE_MEDIUM   = 0.50         # act but confirm with user
 # ── Vision / VLM (Groq vision model) ─────────────────
 VLM_MODEL = "meta-llama/llama-4-scout-17b-16e-instruct"  # Groq vision model
 VLM_MAX_TOKENS      = 200
+READING_MAX_TOKENS  = 2048       # reading mode reads the COMPLETE text
+VLM_STREAMING       = True       # speak scene / reading output sentence-by-sentence as it generates
 CAMERA_INDEX        = 0
 CAMERA_WARMUP_MS    = 500
+CAMERA_BUFFER_SIZE  = 30         # frames kept in the shared ring buffer (~1s at 30 FPS)
+CAMERA_FRAME_TIMEOUT = 3.0       # seconds to wait for a frame before giving up
 
 # ── TTS ───────────────────────────────────────────────
 TTS_ENGINE          = "gtts"       # "gtts" or "elevenlabs"
 TTS_LANGUAGE        = "en"
-TTS_SLOW            = False
\ No newline at end of file
+TTS_SLOW            = False
+TTS_PREFETCH        = 2          # sentences synthesized ahead of the one playing
+TTS_CACHE_DIR       = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "tts")
+TTS_CACHE_MAX_MB    = 50         # disk budget for cached speech (LRU eviction)
+TTS_CACHE_MEMORY_ITEMS = 64      # hot in-memory clips
+# ── Currency model (ONNX Runtime) ─────────────────────
+ONNX_INTRA_OP_THREADS = 0        # 0 → ONNX Runtime picks (one per physical core)
+ONNX_INTER_OP_THREADS = 1        # only used by the parallel execution mode
+ONNX_GRAPH_OPT_LEVEL  = "all"    # "disable" | "basic" | "extended" | "all"
+ONNX_EXECUTION_MODE   = "sequential"   # "sequential" | "parallel"
+ONNX_OPTIMIZED_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "onnx")
+ONNX_WARMUP_RUNS      = 2        # dummy inferences at load so the first real frame is fast
+
+# ── Currency loop change gate ─────────────────────────
+CURRENCY_ACTIVE_FPS      = 20     # frame rate while something is moving / a note is in view
+CURRENCY_IDLE_FPS        = 4      # frame rate once the scene has been still for a while
+CURRENCY_IDLE_AFTER      = 2.0    # seconds without change before dropping to the idle rate
+CURRENCY_MOTION_SIZE     = (64, 48)   # (w, h) grayscale thumbnail the diff runs on
+CURRENCY_MOTION_PIXEL_DELTA  = 12     # grey levels a thumbnail pixel must move to count as changed
+CURRENCY_MOTION_MIN_FRACTION = 0.03   # share of changed pixels that counts as a new scene
+CURRENCY_FORCE_INFER_EVERY   = 3.0    # re-run inference this often even on a still scene
+
+# ── Currency announcements (temporal voting) ──────────
+CURRENCY_TRACK_IOU         = 0.3    # IoU to treat a detection as the same note as last time
+CURRENCY_TRACK_MAX_AGE     = 0.5    # seconds a note may go unseen (from its first miss) before its track is dropped
+CURRENCY_VOTE_WINDOW       = 8      # most recent inferences each track votes over
+CURRENCY_MIN_VOTES         = 3      # sightings needed before a label can be announced
+CURRENCY_STABLE_SHARE      = 0.6    # winning label's share of the confidence-weighted votes
+CURRENCY_ANNOUNCE_COOLDOWN = 3.0    # seconds between announcements
+
+# ── Currency inference backend ────────────────────────
+CURRENCY_BACKEND             = os.getenv("CURRENCY_BACKEND", "local")   # "local" | "remote"
+CURRENCY_REMOTE_URL          = os.getenv("CURRENCY_REMOTE_URL", "http://127.0.0.1:8001")
+CURRENCY_REMOTE_BUDGET_MS    = 250     # slower than this → answer from the local ONNX session
+CURRENCY_REMOTE_INFLIGHT     = 2       # concurrent requests over the keep-alive pool
+CURRENCY_REMOTE_JPEG_QUALITY = 80
+CURRENCY_REMOTE_MAX_MISSES   = 3       # consecutive over-budget / failed calls before backing off
+CURRENCY_REMOTE_RETRY_AFTER  = 30.0    # seconds to stay local after backing off
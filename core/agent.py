@@ -5,12 +5,20 @@ from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage
 
 from core.state import AssistantState
+from core.fast_router import fast_router
+from core.intent_classifier import intent_classifier
+from core.route_cache import route_cache
+from core.executors import MODULE_EXECUTOR, SPEECH_EXECUTOR, run_blocking
+from utils.timing import span
 from core.confidence import (
     get_confidence_zone,
     build_clarification_question,
     build_medium_prefix
 )
-from config import AGENT_MODEL, AGENT_TEMPERATURE, GROQ_API_KEY
+from config import (
+    AGENT_MODEL, AGENT_TEMPERATURE, GROQ_API_KEY, VLM_STREAMING, FAST_ROUTER_ENABLED,
+    INTENT_CLASSIFIER_ENABLED, INTENT_CLASSIFIER_MIN_CONFIDENCE, ROUTE_CACHE_ENABLED
+)
 from utils.logger import logger
 
 
@@ -22,6 +30,18 @@ llm = ChatGroq(
 )
 
 
+# ── Shared module / speaker instances ─────────────────
+# Built on first use and reused — each one holds API clients and connection pools
+_instances: dict = {}
+
+
+def _shared(cls):
+    instance = _instances.get(cls)
+    if instance is None:
+        instance = _instances.setdefault(cls, cls())
+    return instance
+
+
 # ── Routing Prompt ────────────────────────────────────
 ROUTING_PROMPT = """
 You are the routing brain of a voice assistant for visually impaired users in India.
@@ -49,6 +69,18 @@ IMPORTANT: Return ONLY a raw JSON object. No markdown. No code fences. No explan
 Example: {{"mode": "navigation_mode", "confidence": 0.92, "cleaned_text": "describe surroundings", "extra_context": ""}}
 """
 
+GREETING_RESPONSE = "I hope everything is alright! How can I help you more?"
+
+# Fixed replies spoken by the graph — pre-warmed into the TTS cache at startup
+STOCK_RESPONSES = [
+    GREETING_RESPONSE,
+    "Currency mode on.",
+    "Stopped.",
+    "I was unable to analyse the scene.",
+    "I could not read the text.",
+    "I could not start currency detection.",
+]
+
 VALID_MODES = {
     "navigation_mode",
     "reading_mode",
@@ -73,7 +105,33 @@ def _parse_llm_json(raw: str) -> dict:
 # ═══════════════════════════════════════════════
 # NODE 1 — Interpret Intent
 # ═══════════════════════════════════════════════
-def interpret_intent_node(state: AssistantState) -> AssistantState:
+def _routed_state(state: AssistantState, result: dict) -> AssistantState:
+    """Apply a {mode, confidence, cleaned_text, extra_context} routing result to the state."""
+    transcript = state["raw_transcript"]
+
+    mode       = str(result.get("mode", "unknown")).strip()
+    confidence = float(result.get("confidence", 0.0))
+    cleaned    = str(result.get("cleaned_text", transcript)).strip()
+    extra      = str(result.get("extra_context", "")).strip()
+
+    if mode not in VALID_MODES:
+        logger.warning(f"Unexpected mode '{mode}' from router — falling back to unknown")
+        mode = "unknown"
+
+    logger.info(f"Agent → mode: {mode} | confidence: {confidence:.2f}")
+
+    return {
+        **state,
+        "mode":                mode,
+        "confidence":          confidence,
+        "cleaned_transcript":  cleaned,
+        "extra_context":       extra,
+        "needs_clarification": False,
+        "final_output":        "",
+    }
+
+
+async def interpret_intent_node(state: AssistantState) -> AssistantState:
     transcript = state["raw_transcript"]
 
     fallback = {
@@ -90,38 +148,51 @@ def interpret_intent_node(state: AssistantState) -> AssistantState:
         logger.warning("Empty transcript — skipping LLM call")
         return fallback
 
+    # ── Fast path — unambiguous short commands never wait on the network ──
+    if FAST_ROUTER_ENABLED:
+        fast = fast_router.route(transcript)
+        if fast:
+            logger.info("Routed locally (fast path)")
+            return _routed_state(state, fast)
+
+    # ── Route cache — repeated utterances skip the classifier and LLM ──
+    if ROUTE_CACHE_ENABLED:
+        cached = route_cache.get(transcript)
+        if cached:
+            logger.info("Routed from cache")
+            return _routed_state(state, cached)
+
+    # ── Offline classifier — primary router; the LLM only sees what it isn't sure about ──
+    local = None
+    if INTENT_CLASSIFIER_ENABLED:
+        local = intent_classifier.classify(transcript)
+        if local["confidence"] >= INTENT_CLASSIFIER_MIN_CONFIDENCE:
+            logger.info("Routed locally (intent classifier)")
+            if ROUTE_CACHE_ENABLED:
+                route_cache.put(transcript, local)
+            return _routed_state(state, local)
+
     prompt = ROUTING_PROMPT.format(transcript=transcript)
 
     try:
-        response = llm.invoke([HumanMessage(content=prompt)])
+        with span("routing_llm"):
+            response = await llm.ainvoke([HumanMessage(content=prompt)])
         raw = response.content.strip()
         logger.debug(f"LLM raw output: {raw!r}")
 
         result = _parse_llm_json(raw)
-
-        mode       = str(result.get("mode", "unknown")).strip()
-        confidence = float(result.get("confidence", 0.0))
-        cleaned    = str(result.get("cleaned_text", transcript)).strip()
-        extra      = str(result.get("extra_context", "")).strip()
-
-        if mode not in VALID_MODES:
-            logger.warning(f"Unexpected mode '{mode}' from LLM — falling back to unknown")
-            mode = "unknown"
-
-        logger.info(f"Agent → mode: {mode} | confidence: {confidence:.2f}")
-
-        return {
-            **state,
-            "mode":                mode,
-            "confidence":          confidence,
-            "cleaned_transcript":  cleaned,
-            "extra_context":       extra,
-            "needs_clarification": False,
-            "final_output":        "",
-        }
+        if ROUTE_CACHE_ENABLED:
+            route_cache.put(transcript, result)
+        return _routed_state(state, result)
 
     except Exception as e:
         logger.error(f"Error in interpret_intent: {e}", exc_info=True)
+
+        # Network down / bad LLM output — a low-confidence local guess still beats "unknown";
+        # confidence_router turns it into a yes/no clarification question.
+        if local and local["mode"] != "unknown":
+            logger.warning("LLM routing failed — using offline classifier result")
+            return _routed_state(state, local)
         return fallback
 
 
@@ -162,12 +233,25 @@ def route_to_module(state: AssistantState) -> str:
 # ═══════════════════════════════════════════════
 # NODE 3a — Scene
 # ═══════════════════════════════════════════════
-def scene_node(state: AssistantState) -> AssistantState:
+async def scene_node(state: AssistantState) -> AssistantState:
     from modules.scene.scene_module import SceneModule
     logger.info("Executing Scene module")
 
+    # Streaming speaks sentence-by-sentence while the VLM is still generating
+    if VLM_STREAMING and state.get("speak_aloud", True):
+        from tts.speaker import Speaker, speech_generation, interrupted_since
+        generation = speech_generation()
+        try:
+            result = await run_blocking(MODULE_EXECUTOR, _shared(SceneModule).run_streaming, _shared(Speaker))
+            return {**state, "final_output": result, "spoken": True}
+        except Exception as e:
+            logger.error(f"Scene module streaming error: {e}", exc_info=True)
+            if interrupted_since(generation):
+                return {**state, "final_output": "", "spoken": True}   # the user said "stop"
+            return {**state, "final_output": "I was unable to analyse the scene."}
+
     try:
-        result = SceneModule().run()
+        result = await _shared(SceneModule).arun()
     except Exception as e:
         logger.error(f"Scene module error: {e}", exc_info=True)
         result = "I was unable to analyse the scene."
@@ -178,12 +262,25 @@ def scene_node(state: AssistantState) -> AssistantState:
 # ═══════════════════════════════════════════════
 # NODE 3b — Reading
 # ═══════════════════════════════════════════════
-def reading_node(state: AssistantState) -> AssistantState:
+async def reading_node(state: AssistantState) -> AssistantState:
     from modules.reading.reading_module import ReadingModule
     logger.info("Executing Reading module")
 
+    # Long labels / receipts start speaking after the first sentence, not the whole completion
+    if VLM_STREAMING and state.get("speak_aloud", True):
+        from tts.speaker import Speaker, speech_generation, interrupted_since
+        generation = speech_generation()
+        try:
+            result = await run_blocking(MODULE_EXECUTOR, _shared(ReadingModule).run_streaming, _shared(Speaker))
+            return {**state, "final_output": result, "spoken": True}
+        except Exception as e:
+            logger.error(f"Reading module streaming error: {e}", exc_info=True)
+            if interrupted_since(generation):
+                return {**state, "final_output": "", "spoken": True}   # the user said "stop"
+            return {**state, "final_output": "I could not read the text."}
+
     try:
-        result = ReadingModule().run()
+        result = await _shared(ReadingModule).arun()
     except Exception as e:
         logger.error(f"Reading module error: {e}", exc_info=True)
         result = "I could not read the text."
@@ -194,7 +291,7 @@ def reading_node(state: AssistantState) -> AssistantState:
 # ═══════════════════════════════════════════════
 # NODE 3c — Currency
 # ═══════════════════════════════════════════════
-def currency_node(state: AssistantState) -> AssistantState:
+async def currency_node(state: AssistantState) -> AssistantState:
     from modules.currency.currency_module import start_currency_mode, currency_active
     logger.info("Starting Currency continuous mode")
 
@@ -202,7 +299,7 @@ def currency_node(state: AssistantState) -> AssistantState:
         if currency_active:
             return {**state, "final_output": ""}
 
-        start_currency_mode()
+        await run_blocking(MODULE_EXECUTOR, start_currency_mode)
         result = "Currency mode on."
 
     except Exception as e:
@@ -215,7 +312,7 @@ def currency_node(state: AssistantState) -> AssistantState:
 # ═══════════════════════════════════════════════
 # NODE 3d — Stop
 # ═══════════════════════════════════════════════
-def stop_node(state: AssistantState) -> AssistantState:
+async def stop_node(state: AssistantState) -> AssistantState:
     from modules.currency.currency_module import stop_currency_mode, currency_active
     logger.info("Stopping active modules")
 
@@ -223,7 +320,7 @@ def stop_node(state: AssistantState) -> AssistantState:
         if not currency_active:
             return {**state, "final_output": ""}
 
-        stop_currency_mode()
+        await run_blocking(MODULE_EXECUTOR, stop_currency_mode)
         result = "Stopped."
 
     except Exception as e:
@@ -236,14 +333,14 @@ def stop_node(state: AssistantState) -> AssistantState:
 # ═══════════════════════════════════════════════
 # NODE 3e — Knowledge
 # ═══════════════════════════════════════════════
-def knowledge_node(state: AssistantState) -> AssistantState:
+async def knowledge_node(state: AssistantState) -> AssistantState:
     from modules.knowledge.knowledge_logic import handle_knowledge_query
     logger.info("Executing Knowledge module")
 
     try:
         query = state.get("cleaned_transcript", "")
-        handle_knowledge_query(query)
-        return {**state, "final_output": ""}
+        answer = await run_blocking(MODULE_EXECUTOR, handle_knowledge_query, query, speak=False)
+        return {**state, "final_output": answer}
 
     except Exception as e:
         logger.error(f"Knowledge module error: {e}", exc_info=True)
@@ -257,22 +354,26 @@ def greeting_node(state: AssistantState) -> AssistantState:
     logger.info("Executing Greeting node")
     return {
         **state,
-        "final_output": "I hope everything is alright! How can I help you more?"
+        "final_output": GREETING_RESPONSE
     }
 
 
 # ═══════════════════════════════════════════════
 # NODE 4 — TTS
 # ═══════════════════════════════════════════════
-def tts_node(state: AssistantState) -> AssistantState:
+async def tts_node(state: AssistantState) -> AssistantState:
     from tts.speaker import Speaker
 
     # ⭐ If module already spoke, skip TTS
     if state.get("spoken"):
         return state
 
+    # Web clients synthesize the response themselves (speak_to_file) — don't play it here too
+    if not state.get("speak_aloud", True):
+        return state
+
     output = state.get("final_output", "").strip()
-    Speaker().speak(output)
+    await run_blocking(SPEECH_EXECUTOR, _shared(Speaker).speak, output)
     return state
 
 
@@ -23,17 +23,27 @@ def get_confidence_zone(confidence: float) -> str:
     return zone
 
 
+# Module-level so the TTS cache can pre-warm every stock phrase at startup
+CLARIFICATION_QUESTIONS = {
+    "navigation_mode": "Did you want me to describe your surroundings? Please say yes or no.",
+    "reading_mode":    "Did you want me to read something for you? Please say yes or no.",
+    "currency_mode":   "Did you want me to identify the currency you are holding? Please say yes or no.",
+    "unknown":         "I did not understand. Do you want a scene description, text reading, or currency check?",
+}
+
+MEDIUM_PREFIXES = {
+    "navigation_mode": "I think you want a scene description.",
+    "reading_mode":    "I think you want me to read something.",
+    "currency_mode":   "I think you want to check your currency.",
+}
+
+
 def build_clarification_question(mode: str) -> str:
     """
     When confidence is low, ask one simple yes/no question.
     Keep it short — blind users just need to say yes or no.
     """
-    questions = {
-        "navigation_mode": "Did you want me to describe your surroundings? Please say yes or no.",
-        "reading_mode":    "Did you want me to read something for you? Please say yes or no.",
-        "currency_mode":   "Did you want me to identify the currency you are holding? Please say yes or no.",
-        "unknown":         "I did not understand. Do you want a scene description, text reading, or currency check?",
-    }
+    questions = CLARIFICATION_QUESTIONS
     q = questions.get(mode, questions["unknown"])
     logger.debug(f"Clarification question → '{q}'")
     return q
@@ -45,9 +55,4 @@ def build_medium_prefix(mode: str) -> str:
     Tells the user what we think they asked — before giving the answer.
     Example: "I think you want a scene description."
     """
-    prefixes = {
-        "navigation_mode": "I think you want a scene description.",
-        "reading_mode":    "I think you want me to read something.",
-        "currency_mode":   "I think you want to check your currency.",
-    }
-    return prefixes.get(mode, "")
\ No newline at end of file
+    return MEDIUM_PREFIXES.get(mode, "")
\ No newline at end of file
@@ -0,0 +1,26 @@
+# core/executors.py — Bounded thread pools for blocking work in the async pipeline.
+# Camera / ONNX / web-search work and audio playback each get their own small pool,
+# so concurrent web + mic requests can't starve the server's threadpool or event loop.
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from config import MODULE_EXECUTOR_WORKERS, SPEECH_EXECUTOR_WORKERS
+
+# Camera capture, frame encoding, currency start/stop, knowledge lookups
+MODULE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=MODULE_EXECUTOR_WORKERS, thread_name_prefix="module"
+)
+
+# Speaker.speak / speak_to_file — playback is serialized by the TTS lock anyway
+SPEECH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=SPEECH_EXECUTOR_WORKERS, thread_name_prefix="speech"
+)
+
+
+async def run_blocking(executor: ThreadPoolExecutor, fn, *args, **kwargs):
+    """Run a blocking call on `executor` without blocking the event loop (context vars are carried over)."""
+    loop = asyncio.get_running_loop()
+    ctx  = contextvars.copy_context()
+    return await loop.run_in_executor(executor, functools.partial(ctx.run, fn, *args, **kwargs))
@@ -0,0 +1,205 @@
+# core/fast_router.py — Local rule-based intent router.
+# Resolves short, unambiguous commands ("stop", "band karo", "padho", "thanks")
+# in microseconds; anything ambiguous returns None and falls through to the LLM.
+
+import difflib
+from typing import Dict, List, Optional
+from utils.logger import logger
+from utils.text_utils import normalize_transcript
+from config import (
+    FAST_ROUTER_MAX_WORDS, FAST_ROUTER_MIN_CONFIDENCE, FAST_ROUTER_FUZZY_RATIO, BARGE_IN_CONFIDENCE
+)
+
+# Same hints as ROUTING_PROMPT, plus common spelling / Devanagari variants.
+# Deliberately leaves out generic openers ("what is") that several modes share.
+INTENT_KEYWORDS: Dict[str, List[str]] = {
+    "currency_mode": [
+        "paisa", "paise", "note", "money", "currency", "kitne ka", "kitne ki",
+        "rupee", "rupees", "rupaye", "rupiya",
+        "पैसा", "पैसे", "नोट", "रुपये", "कितने का",
+    ],
+    "stop_mode": [
+        "stop", "band karo", "band kar do", "ruk jao", "ruko", "bas", "bas karo", "enough",
+        "stop it", "stop talking", "stop speaking", "stop reading", "chup", "chup karo",
+        "रुको", "रुक जाओ", "बंद करो", "बस", "बस करो", "चुप",
+    ],
+    "reading_mode": [
+        "read", "padho", "padh do", "padhke", "kya likha hai", "kya likha",
+        "पढ़ो", "पढ़ दो", "क्या लिखा है",
+    ],
+    "navigation_mode": [
+        "surroundings", "surrounding", "aas paas", "aaspaas", "bata kya hai",
+        "describe", "where am i",
+        "आस पास", "आसपास",
+    ],
+    "knowledge_mode": [
+        "news", "weather", "time", "who is", "information", "update",
+        "mausam", "samay", "khabar",
+        "मौसम", "समय", "खबर",
+    ],
+    "greeting_mode": [
+        "thank you", "thanks", "shukriya", "dhanyawad", "dhanyavad",
+        "great", "awesome", "helpful",
+        "धन्यवाद", "शुक्रिया",
+    ],
+}
+
+# A negation anywhere means the rules can't be trusted ("band mat karo", "don't stop", "I can't stop")
+NEGATIONS = {
+    "dont", "not", "never", "cant", "cannot", "wont", "doesnt", "isnt", "didnt", "shouldnt",
+    "mat", "nahi", "nahin", "मत", "नहीं",
+}
+
+# Said around a command without changing it ("stop please", "ruk jao na")
+POLITE = {"please", "plz", "pls", "now", "just", "ok", "okay", "ji", "na", "yaar", "bhai", "abhi", "जी", "अभी"}
+
+# Words that carry no intent — left out when judging how much of an utterance a keyword explains
+FILLERS = POLITE | {
+    "a", "an", "the", "this", "that", "it", "is", "me", "my", "i", "for", "of", "to",
+    "ye", "yeh", "ka", "ki", "ke", "ko", "hai", "kya",
+}
+
+
+class FastRouter:
+    """
+    Token trie over INTENT_KEYWORDS with a fuzzy fallback for single words.
+    Usage: FastRouter().route("band karo") → {"mode": "stop_mode", ...} or None
+    """
+
+    def __init__(self, keywords: Dict[str, List[str]] = INTENT_KEYWORDS):
+        self._trie: dict = {}
+        self._single_words: Dict[str, str] = {}
+
+        for mode, phrases in keywords.items():
+            for phrase in phrases:
+                tokens = normalize_transcript(phrase).split()
+                if not tokens:
+                    continue
+                node = self._trie
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node["$"] = mode
+                if len(tokens) == 1:
+                    self._single_words[tokens[0]] = mode
+
+    def _match(self, tokens: List[str]) -> Dict[str, dict]:
+        """
+        mode → {"covered": tokens matched, "fuzzy": any fuzzy hit, "exact": any exact hit,
+        "start"/"end": span of its last match} for every mode found.
+        """
+        found: Dict[str, dict] = {}
+        i = 0
+
+        while i < len(tokens):
+            # Longest exact phrase starting at token i
+            node, end, mode = self._trie, i, None
+            for j in range(i, len(tokens)):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                if "$" in node:
+                    mode, end = node["$"], j + 1
+
+            fuzzy = False
+            if mode is None and len(tokens[i]) >= 4:
+                close = difflib.get_close_matches(
+                    tokens[i], self._single_words.keys(), n=1, cutoff=FAST_ROUTER_FUZZY_RATIO
+                )
+                if close:
+                    mode, end, fuzzy = self._single_words[close[0]], i + 1, True
+
+            if mode is None:
+                i += 1
+                continue
+
+            hit = found.setdefault(mode, {"covered": 0, "fuzzy": False, "exact": False, "start": 0, "end": 0})
+            hit["covered"] += end - i
+            hit["fuzzy"] = hit["fuzzy"] or fuzzy
+            hit["exact"] = hit["exact"] or not fuzzy
+            hit["start"] = i
+            hit["end"]   = end
+            i = end
+
+        return found
+
+    def _stop_command(self, tokens: List[str]) -> Optional[dict]:
+        """
+        The stop_mode hit when the utterance is a stop command, else None. Polite words
+        around it don't count ("stop please"). A one-word stop phrase must be all that is
+        left — "the bus stop" / "the next stop" are places — while a verb phrase may close
+        a longer sentence ("currency detection band karo").
+        """
+        start, end = 0, len(tokens)
+        while start < end and tokens[start] in POLITE:
+            start += 1
+        while end > start and tokens[end - 1] in POLITE:
+            end -= 1
+        core = tokens[start:end]
+        if not core:
+            return None
+
+        hit = self._match(core).get("stop_mode")
+        if hit is None or hit["end"] != len(core):
+            return None
+        if hit["covered"] != len(core) and hit["end"] - hit["start"] == 1:
+            return None
+        hit["coverage"] = hit["covered"] / len(core)
+        return hit
+
+    def route(self, transcript: str) -> Optional[dict]:
+        """
+        Returns the same {mode, confidence, cleaned_text, extra_context} dict the
+        LLM router produces, or None when the utterance should go to the LLM.
+        """
+        cleaned = normalize_transcript(transcript)
+        tokens  = cleaned.split()
+
+        if not tokens or len(tokens) > FAST_ROUTER_MAX_WORDS:
+            return None
+        if NEGATIONS.intersection(tokens):
+            return None
+
+        # "stop" is the latency-critical command — it wins over anything else mentioned
+        stop = self._stop_command(tokens)
+        if stop is not None:
+            mode, hit  = "stop_mode", stop
+            confidence = 0.9 + 0.08 * stop["coverage"]
+        else:
+            found = self._match(tokens)
+            found.pop("stop_mode", None)
+            if len(found) != 1:
+                return None
+            mode = next(iter(found))
+            hit  = found[mode]
+
+            # One keyword in a long sentence ("I need money for the bus") is only a hint
+            content    = [t for t in tokens if t not in FILLERS] or tokens
+            coverage   = min(1.0, hit["covered"] / len(content))
+            confidence = 0.7 + 0.28 * coverage
+
+        if not hit["exact"]:
+            return None            # a lone fuzzy guess ("ready" → read, "timer" → time) is the LLM's call
+        if hit["fuzzy"]:
+            confidence *= 0.92
+
+        if confidence < FAST_ROUTER_MIN_CONFIDENCE:
+            return None
+
+        logger.debug(f"Fast route: '{cleaned}' → {mode} ({confidence:.2f})")
+        return {
+            "mode":          mode,
+            "confidence":    round(confidence, 2),
+            "cleaned_text":  cleaned,
+            "extra_context": "",
+        }
+
+
+fast_router = FastRouter()
+
+
+def is_stop_command(text: str) -> bool:
+    """Barge-in confirmation — a confident stop phrase, not a bystander's sentence that mentions "stop"."""
+    route = fast_router.route(text)
+    return (route is not None
+            and route["mode"] == "stop_mode"
+            and route["confidence"] >= BARGE_IN_CONFIDENCE)
@@ -0,0 +1,114 @@
+# core/intent_classifier.py — Offline nearest-neighbour intent classifier.
+# Embeds transcripts as hashed character n-gram vectors (robust to Hinglish
+# spelling drift and Devanagari) and votes over the closest labeled examples.
+# Pure numpy, no model download — routes in well under a millisecond on CPU.
+
+import zlib
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+from core.intent_examples import INTENT_EXAMPLES, COUNTER_EXAMPLES
+from utils.logger import logger
+from utils.text_utils import normalize_transcript
+from config import (
+    INTENT_EMBED_DIM, INTENT_CLASSIFIER_K,
+    INTENT_CLASSIFIER_MIN_SIMILARITY, INTENT_CLASSIFIER_FULL_SIMILARITY, INTENT_CLASSIFIER_MIN_MARGIN
+)
+
+
+class IntentClassifier:
+    """
+    Usage: IntentClassifier().classify("ye kitne ka note hai")
+           → {"mode": "currency_mode", "confidence": 0.83, "cleaned_text": ..., "extra_context": ""}
+    """
+
+    def __init__(self, examples: Dict[str, List[str]] = INTENT_EXAMPLES,
+                 counter_examples: List[str] = COUNTER_EXAMPLES,
+                 dim: int = INTENT_EMBED_DIM, k: int = INTENT_CLASSIFIER_K,
+                 min_margin: float = INTENT_CLASSIFIER_MIN_MARGIN):
+        self.dim        = dim
+        self.k          = k
+        self.min_margin = min_margin
+
+        texts, labels = [], []
+        for mode, phrases in {**examples, "unknown": counter_examples}.items():
+            for phrase in phrases:
+                texts.append(phrase)
+                labels.append(mode)
+
+        self.labels = np.array(labels)
+        self.index  = np.stack([self.embed(t) for t in texts])   # (n, dim), rows L2-normalized
+        logger.debug(f"Intent classifier ready — {len(texts)} examples, {len(examples)} modes")
+
+    # ── embedding ─────────────────────────────────────
+    def _features(self, text: str) -> Counter:
+        """Whole words + character 2–4 grams of each padded word."""
+        feats = Counter()
+        for word in normalize_transcript(text).split():
+            feats[f"w:{word}"] += 2
+            padded = f" {word} "
+            for n in (2, 3, 4):
+                for i in range(len(padded) - n + 1):
+                    feats[padded[i:i + n]] += 1
+        return feats
+
+    def embed(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for feat, count in self._features(text).items():
+            h = zlib.crc32(feat.encode("utf-8"))
+            sign = 1.0 if h & 0x80000000 else -1.0       # signed hashing limits collision bias
+            vec[h % self.dim] += sign * (1.0 + np.log(count))
+
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    # ── classification ────────────────────────────────
+    def classify(self, transcript: str) -> dict:
+        """
+        Same {mode, confidence, cleaned_text, extra_context} contract as _parse_llm_json.
+        confidence = the mode's share of the similarity²-weighted top-k vote, scaled
+        down when even its closest example is only loosely similar — so it lands on
+        the same high / medium / low zones as the LLM's self-reported confidence.
+        A near-miss counter-example winning the vote, or another label whose closest
+        example is within min_margin of the winner's, leaves the decision to the LLM
+        ("unknown", 0.0).
+        """
+        cleaned = normalize_transcript(transcript)
+        result  = {"mode": "unknown", "confidence": 0.0, "cleaned_text": cleaned, "extra_context": ""}
+        if not cleaned:
+            return result
+
+        sims = self.index @ self.embed(cleaned)
+        top  = np.argsort(sims)[::-1][:self.k]
+
+        votes: Dict[str, float] = {}
+        best:  Dict[str, float] = {}
+        for i in top:
+            sim = float(max(sims[i], 0.0))
+            mode = str(self.labels[i])
+            votes[mode] = votes.get(mode, 0.0) + sim * sim
+            best[mode]  = max(best.get(mode, 0.0), sim)
+
+        total = sum(votes.values())
+        if total <= 0:
+            return result
+
+        ranked = sorted(votes, key=votes.get, reverse=True)
+        mode   = ranked[0]
+        if mode == "unknown" or best[mode] < INTENT_CLASSIFIER_MIN_SIMILARITY:
+            return result
+        runner_up = max((best[m] for m in ranked[1:]), default=0.0)
+        if best[mode] - runner_up < self.min_margin:
+            logger.debug(f"Intent classifier: '{cleaned}' — {mode} too close to another label")
+            return result
+
+        result["mode"]       = mode
+        closeness = min(1.0, best[mode] / INTENT_CLASSIFIER_FULL_SIMILARITY)
+        result["confidence"] = round(closeness * votes[mode] / total, 2)
+        logger.debug(f"Intent classifier: '{cleaned}' → {mode} ({result['confidence']:.2f})")
+        return result
+
+
+intent_classifier = IntentClassifier()
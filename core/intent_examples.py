@@ -0,0 +1,66 @@
+# core/intent_examples.py — Labeled utterances for the offline intent classifier.
+# English, Hindi (Devanagari) and Hinglish for every routable mode in VALID_MODES.
+# Add new phrasings here when the classifier falls through to the LLM too often.
+
+INTENT_EXAMPLES = {
+    "navigation_mode": [
+        "describe my surroundings", "what is around me", "where am i",
+        "describe the scene", "what is in front of me", "is there anything in my way",
+        "what am i holding", "what is in my hand", "is the path clear",
+        "tell me what you see", "look around", "is there a chair nearby",
+        "aas paas kya hai", "mere aas paas kya hai", "bata kya hai saamne",
+        "saamne kya hai", "mere haath mein kya hai", "raasta saaf hai kya",
+        "dekho kya hai", "mai kahan hoon",
+        "आस पास क्या है", "सामने क्या है", "मेरे हाथ में क्या है", "मैं कहाँ हूँ",
+    ],
+    "reading_mode": [
+        "read this", "read this for me", "read the label", "what does this say",
+        "read the text", "read this medicine", "read the receipt", "what is written here",
+        "read this document", "read the screen",
+        "padho", "isko padho", "ye padh do", "kya likha hai", "isme kya likha hai",
+        "label padho", "dawai ka naam padho", "bill padh do",
+        "पढ़ो", "इसे पढ़ो", "क्या लिखा है", "यह पढ़ दो", "दवाई का नाम पढ़ो",
+    ],
+    "currency_mode": [
+        "check currency", "which note is this", "how much money is this",
+        "identify the note", "what currency am i holding", "count my money",
+        "is this a 500 rupee note", "check this note", "currency mode",
+        "ye kitne ka note hai", "kitne ka note hai", "paisa check karo",
+        "note pehchano", "kitne rupaye hai", "ye kaunsa note hai",
+        "kitne paise hai", "currency dekho",
+        "यह कितने का नोट है", "पैसे गिनो", "कौन सा नोट है", "कितने रुपये हैं",
+    ],
+    "stop_mode": [
+        "stop", "stop it", "stop currency mode", "please stop", "that's enough",
+        "stop talking", "cancel", "quiet", "be quiet", "turn it off",
+        "band karo", "band kar do", "ruk jao", "ruko", "bas", "bas karo",
+        "chup ho jao", "currency band karo",
+        "रुको", "रुक जाओ", "बंद करो", "बस करो", "चुप हो जाओ",
+    ],
+    "knowledge_mode": [
+        "what time is it", "what is the weather today", "what is today's date",
+        "who is the prime minister of india", "what is the capital of france",
+        "tell me the news", "latest news", "will it rain today",
+        "how far is the moon", "tell me about mahatma gandhi",
+        "kitne baje hai", "aaj mausam kaisa hai", "aaj ki taareekh kya hai",
+        "aaj ki khabar batao", "samay kya hua hai", "barish hogi kya",
+        "kaun hai pradhan mantri",
+        "कितने बजे हैं", "आज मौसम कैसा है", "आज की खबर बताओ", "आज तारीख क्या है",
+    ],
+    "greeting_mode": [
+        "thank you", "thanks", "thanks a lot", "great job", "awesome",
+        "that was helpful", "you are very helpful", "nice", "good work",
+        "hello", "hi", "good morning",
+        "shukriya", "dhanyawad", "bahut badhiya", "bahut accha", "namaste",
+        "धन्यवाद", "शुक्रिया", "बहुत बढ़िया", "नमस्ते",
+    ],
+}
+
+# Near misses — they share words with one mode but mean something else ("read the news"
+# is a knowledge question, "describe the note" a currency one). Indexed as "unknown":
+# when they win the vote, or take a large share of it, the utterance goes to the LLM.
+COUNTER_EXAMPLES = [
+    "read the news", "read me the news", "read the news headlines", "read my messages",
+    "describe the note", "describe this note", "describe the money", "describe the rupee note",
+    "note ke baare mein batao", "khabar padh ke sunao",
+]
@@ -0,0 +1,68 @@
+# core/route_cache.py — LRU + TTL cache of intent routing results.
+# Users repeat the same few commands all day; a hit skips the classifier and LLM entirely.
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from utils.logger import logger
+from utils.text_utils import canonical_transcript
+from config import ROUTE_CACHE_SIZE, ROUTE_CACHE_TTL
+
+
+class RouteCache:
+    """
+    Keyed on canonical_transcript() — case-folded, punctuation-stripped,
+    Devanagari transliterated and Hinglish spelling folded.
+    Stores the parsed {mode, confidence, cleaned_text, extra_context} dict.
+    """
+
+    def __init__(self, max_items: int = ROUTE_CACHE_SIZE, ttl: float = ROUTE_CACHE_TTL):
+        self.max_items = max_items
+        self.ttl       = ttl
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()   # key → (stored_at, result)
+        self._lock     = threading.Lock()
+        self.hits      = 0
+        self.misses    = 0
+
+    def get(self, transcript: str) -> Optional[dict]:
+        key = canonical_transcript(transcript)
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and time.time() - entry[0] <= self.ttl:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return dict(entry[1])
+
+            if entry is not None:
+                del self._items[key]   # expired
+            self.misses += 1
+            return None
+
+    def put(self, transcript: str, result: dict):
+        key = canonical_transcript(transcript)
+        if not key:
+            return
+        with self._lock:
+            self._items[key] = (time.time(), dict(result))
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits":     self.hits,
+                "misses":   self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "size":     len(self._items),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+        logger.debug("Route cache cleared")
+
+
+route_cache = RouteCache()
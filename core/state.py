@@ -27,4 +27,5 @@ class AssistantState(TypedDict):
     retry_count: int
 
     # ── Runtime flags ─────────────────────────────────
-    spoken: bool
\ No newline at end of file
+    spoken: bool
+    speak_aloud: bool       # False for web clients — they play the returned audio themselves
\ No newline at end of file
@@ -2,8 +2,6 @@ import sys
 import os
 import warnings
 import cv2
-camera = None
-camera_running = False
 warnings.filterwarnings("ignore")
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
 os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"
@@ -24,16 +22,30 @@ os.makedirs(os.path.join(BASE_DIR, "logs"), exist_ok=True)
 from utils.logger import logger
 from utils.audio_utils import check_microphone_available
 from tts.speaker import Speaker
+from tts.audio_cache import get_audio_cache
 from modules.stt.listener import listen, listen_from_file
-from core.agent import agent
+from modules.stt.backends import get_stt_router
+from modules.stt.barge_in import BargeInDetector
+from core.agent import agent, STOCK_RESPONSES
+from core.confidence import CLARIFICATION_QUESTIONS, MEDIUM_PREFIXES
+from core.route_cache import route_cache
+from core.fast_router import fast_router, is_stop_command
+from core.executors import MODULE_EXECUTOR, SPEECH_EXECUTOR, run_blocking
+from utils.timing import Trace, tracing, current_trace, span, latency_metrics
 from core.state import AssistantState
+from config import (
+    STT_EARLY_DISPATCH_MODES, STT_EARLY_DISPATCH_CONFIDENCE, STT_EARLY_DISPATCH_MAX_WORDS,
+    BARGE_IN_ENABLED
+)
+from modules.scene.camera import get_camera
 
 # ── FastAPI imports ──
 from fastapi import FastAPI, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
-import tempfile, shutil, uvicorn, threading, webbrowser, time, json, asyncio
+import tempfile, shutil, uvicorn, threading, webbrowser, time, json, asyncio, re
+from typing import Optional
 from collections import deque
 
 # ══════════════════════════════════════════════
@@ -42,12 +54,16 @@ from collections import deque
 app = FastAPI()
 speaker = Speaker()
 memory = {"last_scene": None}
-camera = cv2.VideoCapture(0)
+FALLBACK_REPLY = "Sorry, I had trouble understanding that."
 
 # SSE — keeps last 200 log entries so late-joining browsers get history
 log_queue: deque = deque(maxlen=200)
 sse_clients: list = []
 
+# Server event loop — captured at startup so the mic thread can submit pipeline runs to it
+_server_loop = None
+_server_loop_ready = threading.Event()
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"], allow_methods=["*"], allow_headers=["*"]
@@ -73,15 +89,28 @@ def push_log(level: str, msg: str):
 
     entry = {"type": "log", "level": level, "msg": msg}
     log_queue.append(entry)
-    for q in list(sse_clients):
-        try:
-            q.put_nowait(entry)
-        except Exception:
-            sse_clients.remove(q)
+    _deliver(entry)
 
 
 def push_event(data: dict):
     """Push a non-log SSE event (response / module / status) to all clients."""
+    _deliver(data)
+
+
+def _deliver(data: dict):
+    """asyncio.Queue isn't thread-safe — hop onto the server loop when called from a worker thread."""
+    try:
+        on_loop = asyncio.get_running_loop() is _server_loop
+    except RuntimeError:
+        on_loop = False
+
+    if on_loop or _server_loop is None:
+        _fan_out(data)
+    else:
+        _server_loop.call_soon_threadsafe(_fan_out, data)
+
+
+def _fan_out(data: dict):
     for q in list(sse_clients):
         try:
             q.put_nowait(data)
@@ -92,7 +121,7 @@ def push_event(data: dict):
 # ══════════════════════════════════════════════
 # STATE BUILDER
 # ══════════════════════════════════════════════
-def build_state(transcript: str) -> AssistantState:
+def build_state(transcript: str, speak_aloud: bool = True) -> AssistantState:
     return {
         "raw_transcript":         transcript.strip(),
         "cleaned_transcript":     "",
@@ -106,13 +135,48 @@ def build_state(transcript: str) -> AssistantState:
         "error":                  None,
         "retry_count":            0,
         "spoken":                 False,
+        "speak_aloud":            speak_aloud,
     }
 
 
 # ══════════════════════════════════════════════
 # PIPELINE  (used by both web API and mic loop)
 # ══════════════════════════════════════════════
-def run_pipeline(transcript: str) -> dict:
+async def run_pipeline(transcript: str, speak_aloud: bool = True, trace: Optional[Trace] = None) -> dict:
+    """
+    Run one request through the agent graph.
+    speak_aloud=False → nothing is played on the server (web clients get an audio_url instead).
+    The per-stage latency breakdown is attached as result["timings"]. When the caller
+    passes (or already runs inside) a trace, publishing it is left to the caller,
+    which may still add stages — mic capture before, audio synthesis after.
+    """
+    owner = trace is None and current_trace() is None
+
+    with tracing(trace or current_trace()) as trace:
+        with span("pipeline"):
+            result = await _run_graph(transcript, speak_aloud)
+
+    result["timings"] = trace.breakdown()
+    if owner:
+        _publish_timings(result["timings"])
+    return result
+
+
+def finish_trace(result: dict, trace: Trace) -> dict:
+    """Final breakdown for a request whose trace outlived run_pipeline."""
+    result["timings"] = trace.breakdown()
+    _publish_timings(result["timings"])
+    return result
+
+
+def _publish_timings(timings: dict):
+    latency_metrics.record("request_total", timings["total_ms"])
+    push_event({"type": "timings", **timings})
+    push_log("DEBUG", "Latency: " + ", ".join(f"{k}={v:.0f}ms" for k, v in timings["by_stage"].items())
+                      + f" | total={timings['total_ms']:.0f}ms")
+
+
+async def _run_graph(transcript: str, speak_aloud: bool) -> dict:
     if not transcript.strip():
         push_log("WARN", "Skipping empty transcript")
         return {"response": "", "mode": "unknown", "confidence": 0.0}
@@ -120,10 +184,10 @@ def run_pipeline(transcript: str) -> dict:
     push_log("INFO", f"─── New request: '{transcript}' ───")
     push_event({"type": "status", "status": "processing"})
 
-    state = build_state(transcript)
+    state = build_state(transcript, speak_aloud)
 
     try:
-        result_state = agent.invoke(state)
+        result_state = await agent.ainvoke(state)
 
         mode       = result_state.get("mode", "unknown")
         confidence = result_state.get("confidence", 0.0)
@@ -157,25 +221,28 @@ def run_pipeline(transcript: str) -> dict:
     except KeyError as e:
         msg = f"Pipeline state key error — missing key: {e}"
         push_log("WARN", msg)
-        speaker.speak("Sorry, I had trouble understanding that.")
+        if speak_aloud:
+            await run_blocking(SPEECH_EXECUTOR, speaker.speak, FALLBACK_REPLY)
         push_event({"type": "status", "status": "ready"})
-        return {"response": "Sorry, I had trouble understanding that.",
+        return {"response": FALLBACK_REPLY,
                 "mode": "unknown", "confidence": 0.0}
 
     except ValueError as e:
         msg = f"Pipeline value error: {e}"
         push_log("WARN", msg)
-        speaker.speak("Sorry, I had trouble understanding that.")
+        if speak_aloud:
+            await run_blocking(SPEECH_EXECUTOR, speaker.speak, FALLBACK_REPLY)
         push_event({"type": "status", "status": "ready"})
-        return {"response": "Sorry, I had trouble understanding that.",
+        return {"response": FALLBACK_REPLY,
                 "mode": "unknown", "confidence": 0.0}
 
     except Exception as e:
         msg = f"Pipeline error — type={type(e).__name__} | detail={e}"
         push_log("WARN", msg)
-        speaker.speak("Sorry, I had trouble understanding that.")
+        if speak_aloud:
+            await run_blocking(SPEECH_EXECUTOR, speaker.speak, FALLBACK_REPLY)
         push_event({"type": "status", "status": "ready"})
-        return {"response": "Sorry, I had trouble understanding that.",
+        return {"response": FALLBACK_REPLY,
                 "mode": "unknown", "confidence": 0.0}
 
 
@@ -195,15 +262,12 @@ async def stream_events():
     async def generator():
         try:
             while True:
-                # Poll every 0.1s so we never block the event loop
+                # Wake as soon as an event arrives; heartbeat after 5s of quiet
                 try:
-                    data = client_q.get_nowait()
+                    data = await asyncio.wait_for(client_q.get(), 5)
                     yield f"data: {json.dumps(data)}\n\n"
-                except Exception:
-                    # Nothing in queue — send heartbeat every 5s
+                except asyncio.TimeoutError:
                     yield ": heartbeat\n\n"
-                    await asyncio.sleep(5)
-                    continue
         except asyncio.CancelledError:
             pass
         finally:
@@ -229,11 +293,11 @@ class TextRequest(BaseModel):
     text: str
 
 @app.post("/api/text")
-def process_text(req: TextRequest):
-    result = run_pipeline(req.text)
-    audio_path = _try_speak_to_file(result["response"])
-    result["audio_url"] = f"/api/audio?path={audio_path}" if audio_path else None
-    return JSONResponse(result)
+async def process_text(req: TextRequest):
+    with tracing() as trace:
+        result = await run_pipeline(req.text, speak_aloud=False)
+        result["audio_url"] = await _audio_url(result)
+    return JSONResponse(finish_trace(result, trace))
 
 
 # 2. Voice recording → Whisper STT → pipeline
@@ -245,23 +309,22 @@ async def process_voice(audio: UploadFile = File(...)):
         shutil.copyfileobj(audio.file, tmp)
         tmp_path = tmp.name
     try:
-        push_log("INFO", "🎙 Received audio — transcribing…")
-        transcript = listen_from_file(tmp_path)
-
-        if not transcript:
-            push_log("WARN", "Could not transcribe audio — empty result")
-            return JSONResponse({
-                "response": "Could not transcribe. Please try again.",
-                "mode": "unknown", "confidence": 0.0, "transcript": ""
-            })
-
-        push_log("INFO", f"STT → \"{transcript}\"")
-        result = run_pipeline(transcript)
-        result["transcript"] = transcript
-
-        audio_path = _try_speak_to_file(result["response"])
-        result["audio_url"] = f"/api/audio?path={audio_path}" if audio_path else None
-        return JSONResponse(result)
+        with tracing() as trace:
+            push_log("INFO", "🎙 Received audio — transcribing…")
+            transcript = await run_blocking(MODULE_EXECUTOR, listen_from_file, tmp_path)
+
+            if not transcript:
+                push_log("WARN", "Could not transcribe audio — empty result")
+                return JSONResponse({
+                    "response": "Could not transcribe. Please try again.",
+                    "mode": "unknown", "confidence": 0.0, "transcript": ""
+                })
+
+            push_log("INFO", f"STT → \"{transcript}\"")
+            result = await run_pipeline(transcript, speak_aloud=False)
+            result["transcript"] = transcript
+            result["audio_url"] = await _audio_url(result)
+        return JSONResponse(finish_trace(result, trace))
 
     finally:
         os.unlink(tmp_path)
@@ -274,18 +337,21 @@ def camera_stream():
     )
 
 def generate_camera_stream():
-    global camera_running, camera
+    camera = get_camera()
+    last_seq = 0
 
-    while camera_running:
+    while camera.is_running:
 
-        success, frame = camera.read()
+        latest = camera.wait_next(last_seq, timeout=1.0)
 
-        if not success:
+        if latest is None:
             time.sleep(0.03)
             continue
 
+        last_seq = latest.seq
+
         # encode frame
-        ret, buffer = cv2.imencode(".jpg", frame)
+        ret, buffer = cv2.imencode(".jpg", latest.image)
         frame_bytes = buffer.tobytes()
 
         yield (
@@ -297,11 +363,13 @@ def generate_camera_stream():
         time.sleep(0.03)
 
 
-# 3. Serve TTS audio file
-@app.get("/api/audio")
-def serve_audio(path: str):
-    if os.path.exists(path):
-        return FileResponse(path, media_type="audio/mpeg")
+# 3. Serve TTS audio — only files from the audio cache, addressed by key
+@app.get("/api/audio/{name}")
+def serve_audio(name: str):
+    if re.fullmatch(r"[0-9a-f]{32}\.mp3", name):
+        path = os.path.join(get_audio_cache().directory, name)
+        if os.path.exists(path):
+            return FileResponse(path, media_type="audio/mpeg")
     return JSONResponse({"error": "Audio not found"}, status_code=404)
 
 
@@ -311,41 +379,165 @@ def health():
     return {"status": "ok"}
 
 
+# 5. Routing cache counters — how much routing traffic skips the classifier / LLM
+@app.get("/api/routing/cache")
+def routing_cache_stats():
+    return route_cache.stats()
+
+
+# 6. Latency metrics — rolling p50 / p95 / p99 per pipeline stage (ms)
+@app.get("/api/metrics")
+def latency_stats():
+    return latency_metrics.summary()
+
+
 # ══════════════════════════════════════════════
-# HELPER — speak_to_file (graceful fallback)
+# HELPER — speak_to_file
 # ══════════════════════════════════════════════
-def _try_speak_to_file(text: str):
-    """Call speaker.speak_to_file() if it exists, else fall back to speaker.speak()."""
-    if hasattr(speaker, "speak_to_file"):
-        try:
-            return speaker.speak_to_file(text)
-        except Exception as e:
-            push_log("WARN", f"speak_to_file failed: {e} — falling back to speak()")
-    speaker.speak(text)
-    return None
+async def _audio_url(result: dict):
+    """Synthesize the response once into the audio cache and return its URL for the browser."""
+    text = result.get("response", "")
+    if not text:
+        return None
+    try:
+        path = await run_blocking(SPEECH_EXECUTOR, speaker.speak_to_file, text)
+    except Exception as e:
+        push_log("WARN", f"speak_to_file failed: {e}")
+        return None
+    return f"/api/audio/{os.path.basename(path)}" if path else None
+
+
+# ══════════════════════════════════════════════
+# TTS CACHE PRE-WARM
+# ══════════════════════════════════════════════
+def stock_phrases() -> list:
+    """Everything the assistant says verbatim — cached so it plays instantly and offline."""
+    from modules.currency.detections import CLASS_NAMES
+
+    phrases = [FALLBACK_REPLY, "Goodbye!"]
+    phrases += STOCK_RESPONSES
+    phrases += list(CLARIFICATION_QUESTIONS.values())
+    phrases += list(MEDIUM_PREFIXES.values())
+    phrases += [f"{label.replace('_', ' ')} detected" for label in CLASS_NAMES]
+    return phrases
+
+
+def prewarm_tts():
+    try:
+        speaker.prewarm(stock_phrases())
+    except Exception as e:
+        push_log("WARN", f"TTS pre-warm failed: {type(e).__name__}: {e}")
+
+
+@app.on_event("startup")
+async def capture_server_loop():
+    global _server_loop
+    _server_loop = asyncio.get_running_loop()
+    _server_loop_ready.set()
+
+
+# ══════════════════════════════════════════════
+# CURRENCY MODEL PRE-LOAD
+# ══════════════════════════════════════════════
+def preload_currency_model():
+    """Optimize + warm the ONNX session once so toggling currency mode is instant."""
+    try:
+        from modules.currency.currency_detector import load_session
+        load_session()
+    except Exception as e:
+        push_log("WARN", f"Currency model pre-load failed: {type(e).__name__}: {e}")
+
+
+# ══════════════════════════════════════════════
+# STT MODEL PRE-LOAD
+# ══════════════════════════════════════════════
+def preload_stt():
+    """Load the on-device Whisper model once so offline / short commands never wait on it."""
+    try:
+        get_stt_router().preload()
+    except Exception as e:
+        push_log("WARN", f"STT pre-load failed: {type(e).__name__}: {e}")
 
 
 # ══════════════════════════════════════════════
 # OPTIONAL BACKGROUND MIC LOOP
 # ══════════════════════════════════════════════
+def early_command(text: str) -> Optional[str]:
+    """
+    Mode of a short partial transcript that is already an unambiguous command ("stop",
+    "band karo"), else None. Hindi / Hinglish put the verb last, so only modes that later
+    words can't change are allowed (STT_EARLY_DISPATCH_MODES).
+    """
+    if len(text.split()) > STT_EARLY_DISPATCH_MAX_WORDS:
+        return None
+    route = fast_router.route(text)
+    if (route is None
+            or route["mode"] not in STT_EARLY_DISPATCH_MODES
+            or route["confidence"] < STT_EARLY_DISPATCH_CONFIDENCE):
+        return None
+    return route["mode"]
+
+
+def interrupt_speech():
+    """Barge-in: the user talked over the assistant — cut playback and pending synthesis."""
+    speaker.cancel()
+    push_log("INFO", "✋ Barge-in — speech interrupted")
+
+
 def mic_loop():
     """
     Always-on microphone listener — identical to the original terminal loop.
     Runs in a background thread alongside the web server.
+    Partial transcripts stream to the UI while the user talks; a short stop command seen
+    on two consecutive partials is dispatched before end-of-speech. While the assistant
+    speaks, the barge-in detector can cut it off; the next listen() starts from the
+    moment the user began talking over it.
     """
     if not check_microphone_available():
         push_log("WARN", "Mic loop: no microphone found — skipping")
         return
 
+    # The graph runs on the server's event loop — wait for uvicorn to bring it up
+    _server_loop_ready.wait()
+
+    barge_in = None
+    if BARGE_IN_ENABLED:
+        barge_in = BargeInDetector(on_barge_in=interrupt_speech, confirm=is_stop_command)
+        barge_in.start()
+
     push_log("INFO", "🎙 Background microphone loop started")
     while True:
         try:
-            transcript = listen()
-            if transcript:
+            # One trace per utterance: mic capture + STT here, the graph on the server loop
+            with tracing() as trace:
+                early    = []
+                previous = [None]     # early_command() of the last partial
+
+                def on_partial(text: str) -> bool:
+                    push_event({"type": "partial_transcript", "text": text})
+                    mode = early_command(text)
+                    agreed, previous[0] = mode is not None and mode == previous[0], mode
+                    if not agreed:
+                        return False
+                    push_log("INFO", f"🎙 Early dispatch on partial: \"{text}\"")
+                    push_event({"type": "transcript", "text": text})
+                    early.append(asyncio.run_coroutine_threadsafe(
+                        run_pipeline(text, trace=trace), _server_loop
+                    ))
+                    return True
+
+                transcript = listen(on_partial, since=barge_in.take_onset() if barge_in else None)
+
+            if early:
+                finish_trace(early[0].result(), trace)
+            elif transcript:
                 push_log("INFO", f"🎙 Mic heard: \"{transcript}\"")
                 # Push transcript to UI so "Last heard" chip updates
                 push_event({"type": "transcript", "text": transcript})
-                run_pipeline(transcript)
+                result = asyncio.run_coroutine_threadsafe(
+                    run_pipeline(transcript, trace=trace), _server_loop
+                ).result()
+                finish_trace(result, trace)
         except Exception as e:
             push_log("WARN", f"Mic loop error: {type(e).__name__}: {e}")
             time.sleep(1)
@@ -368,6 +560,12 @@ if __name__ == "__main__":
     push_log("INFO", "Blind Assistant — Starting Up")
     push_log("INFO", "UI available at http://localhost:8000")
 
+    # Warm the shared camera now so the first scene/reading request reuses a live frame
+    get_camera()
+
+    threading.Thread(target=prewarm_tts, daemon=True).start()
+    threading.Thread(target=preload_currency_model, daemon=True).start()
+    threading.Thread(target=preload_stt, daemon=True).start()
     threading.Thread(target=open_browser, daemon=True).start()
     threading.Thread(target=mic_loop, daemon=True).start()
 
@@ -0,0 +1,138 @@
+# modules/currency/batch.py — Offline, throughput-oriented currency detection.
+#
+#   python -m modules.currency.batch photos/ extra.jpg --out results.jsonl --batch-size 16
+#
+# Decoding + letterboxing fan out over a process pool; inference runs N images per
+# session.run when the model's batch dimension is dynamic (one at a time otherwise).
+# One JSON line per image, in input order — for regression-testing models on large
+# folders of labeled note photos without a camera.
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, Iterator, Union
+
+import numpy as np
+
+from .detections import to_dicts
+from .export_model import list_images
+from .postprocess import CONFIDENCE, IOU_THRESHOLD, _decode, _unletterbox
+from .preprocess import prepare_image
+from .session import create_session, input_hw
+
+ImageInput = Union[str, np.ndarray]
+
+
+def _expand(images: Union[ImageInput, Iterable[ImageInput]]) -> list:
+    """Files, directories (non-recursive) and arrays → flat list of (source label, path or array)."""
+    if isinstance(images, (str, np.ndarray)):
+        images = [images]
+
+    items = []
+    for i, item in enumerate(images):
+        if isinstance(item, np.ndarray):
+            items.append((f"array[{i}]", item))
+        elif os.path.isdir(item):
+            items += [(p, p) for p in list_images(item)]
+        else:
+            items.append((item, item))
+    return items
+
+
+def _batches(items: list, size: int) -> Iterator[list]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def detect_currency(images: Union[ImageInput, Iterable[ImageInput]],
+                    session=None,
+                    batch_size: int = 8,
+                    workers: int = None,
+                    conf_thresh: float = CONFIDENCE,
+                    iou_thresh: float = IOU_THRESHOLD) -> Iterator[dict]:
+    """
+    Yields {"source", "width", "height", "detections", "error"} per image, in input order.
+    `detections` is a DETECTION_DTYPE array in original-image pixels.
+    `session` defaults to the shared, warmed-up currency session.
+    """
+    if session is None:
+        # Imported here: the live pipeline pulls in the camera and speaker, and spawned
+        # pool workers re-import this module
+        from .currency_detector import load_session
+        session = load_session()
+    if session is None:
+        raise RuntimeError("Currency model is not available")
+
+    inp        = session.get_inputs()[0]
+    h_in, _    = input_hw(session)
+    dynamic    = not isinstance(inp.shape[0], int)
+    batch_size = batch_size if dynamic else 1
+
+    items = _expand(images)
+    prepare = partial(prepare_image, size=h_in)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in _batches(items, batch_size * 4):
+            # Paths decode in the pool; in-memory arrays are cheaper to letterbox here than to pickle
+            paths    = [src for _, src in batch if isinstance(src, str)]
+            decoded  = iter(pool.map(prepare, paths))
+            prepared = [next(decoded) if isinstance(src, str) else prepare(src) for _, src in batch]
+
+            for chunk in _batches(list(zip(batch, prepared)), batch_size):
+                ready = [p for _, p in chunk if p is not None]
+                if ready:
+                    outputs = session.run(None, {inp.name: np.stack([p[0] for p in ready])})[0]
+
+                i = 0
+                for (label, _), p in chunk:
+                    if p is None:
+                        yield {"source": label, "width": 0, "height": 0,
+                               "detections": None, "error": "unreadable image"}
+                        continue
+
+                    _, scale, pad, shape = p
+                    dets = _decode(outputs[i], conf_thresh, iou_thresh)
+                    _unletterbox(dets, shape, scale, pad)
+                    i += 1
+
+                    yield {"source": label, "width": shape[1], "height": shape[0],
+                           "detections": dets, "error": None}
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Batch currency detection → JSONL")
+    parser.add_argument("inputs", nargs="+", help="image files and/or folders")
+    parser.add_argument("--out",        help="JSONL file (default: stdout)")
+    parser.add_argument("--model",      help="ONNX model (default: the app's currency model)")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--workers",    type=int, default=None)
+    parser.add_argument("--conf",       type=float, default=CONFIDENCE)
+    parser.add_argument("--iou",        type=float, default=IOU_THRESHOLD)
+    args = parser.parse_args()
+
+    session = create_session(args.model) if args.model else None
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+
+    start, count = time.time(), 0
+    try:
+        for record in detect_currency(args.inputs, session, args.batch_size,
+                                      args.workers, args.conf, args.iou):
+            dets = record["detections"]
+            record["detections"] = to_dicts(dets) if dets is not None else []
+            out.write(json.dumps(record) + "\n")
+            count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.time() - start
+    print(f"{count} images in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.1f} img/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# modules/currency/benchmark.py — Latency + agreement benchmark for currency model variants.
+#
+#   python -m modules.currency.benchmark --images path/to/note_photos \
+#          --baseline modules/currency/variants/best_640.onnx \
+#          --models modules/currency/variants/*.onnx
+#
+# Every image goes through the same _letterbox → session → _postprocess path as the
+# live loop. Per variant it prints latency percentiles and, per class, how often it
+# sees the same notes as the FP32 baseline — so a faster model that starts calling
+# 200s 2000s shows up before it ships.
+
+import argparse
+import os
+import time
+from collections import Counter
+
+import cv2
+import numpy as np
+
+from .currency_detector import _postprocess, CONFIDENCE, IOU_THRESHOLD
+from .detections import CLASS_NAMES, class_name
+from .export_model import list_images, to_input
+from .session import create_session, input_hw
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def run_variant(model_path: str, images: list, warmup_runs: int = 3):
+    """→ (per-frame latencies in ms, per-image set of detected class names)."""
+    session = create_session(model_path, cache_dir=None, warmup_runs=warmup_runs)
+    input_name = session.get_inputs()[0].name
+    h_in, _    = input_hw(session)
+
+    latencies, detections = [], []
+    for img in images:
+        start = time.perf_counter()
+
+        tensor, scale, pad = to_input(img, h_in)
+        outputs = session.run(None, {input_name: tensor})
+        result  = _postprocess(outputs, img.shape, scale, pad, CONFIDENCE, IOU_THRESHOLD)
+
+        latencies.append((time.perf_counter() - start) * 1000)
+        detections.append({class_name(c) for c in result["predictions"]["class_id"].tolist()})
+
+    return np.array(latencies), detections
+
+
+def agreement(baseline: list, variant: list) -> dict:
+    """
+    Per class over images: `recall` = baseline sightings the variant also made,
+    `jaccard` = both saw it / either saw it, `confused_with` = what the variant
+    reported instead on images where it missed the baseline's class.
+    """
+    stats = {}
+    for cls in CLASS_NAMES:
+        base_hits = [i for i, b in enumerate(baseline) if cls in b]
+        var_hits  = [i for i, v in enumerate(variant) if cls in v]
+        both      = set(base_hits) & set(var_hits)
+        either    = set(base_hits) | set(var_hits)
+        if not either:
+            continue
+
+        confused = Counter()
+        for i in base_hits:
+            if cls not in variant[i]:
+                confused.update(variant[i] - baseline[i])
+
+        stats[cls] = {
+            "baseline":      len(base_hits),
+            "variant":       len(var_hits),
+            "recall":        len(both) / len(base_hits) if base_hits else 0.0,
+            "jaccard":       len(both) / len(either),
+            "confused_with": dict(confused),
+        }
+    return stats
+
+
+def print_report(name: str, latencies: np.ndarray, stats: dict = None):
+    pct = np.percentile(latencies, PERCENTILES)
+    print(f"\n── {name}")
+    print("  latency ms  " + "  ".join(f"p{p}={v:.1f}" for p, v in zip(PERCENTILES, pct))
+          + f"  mean={latencies.mean():.1f}  fps≈{1000 / latencies.mean():.1f}")
+
+    if stats is None:
+        return
+    for cls, s in stats.items():
+        confused = ", ".join(f"{k}×{v}" for k, v in s["confused_with"].items())
+        print(f"  {cls:<12} base={s['baseline']:<4} var={s['variant']:<4} "
+              f"recall={s['recall']:.2f} jaccard={s['jaccard']:.2f}"
+              + (f"  confused: {confused}" if confused else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark currency model variants against the FP32 baseline")
+    parser.add_argument("--images",   required=True, help="folder of note photos")
+    parser.add_argument("--baseline", required=True, help="FP32 reference model")
+    parser.add_argument("--models",   nargs="+", required=True, help="variants to compare")
+    parser.add_argument("--limit",    type=int, default=0, help="use only the first N images")
+    args = parser.parse_args()
+
+    paths = list_images(args.images)
+    if args.limit:
+        paths = paths[:args.limit]
+    images = [img for img in (cv2.imread(p) for p in paths) if img is not None]
+    if not images:
+        raise SystemExit(f"No readable images in {args.images}")
+    print(f"{len(images)} images")
+
+    base_lat, base_det = run_variant(args.baseline, images)
+    print_report(os.path.basename(args.baseline) + " (baseline)", base_lat)
+
+    for model in args.models:
+        if os.path.abspath(model) == os.path.abspath(args.baseline):
+            continue
+        lat, det = run_variant(model, images)
+        print_report(os.path.basename(model), lat, agreement(base_det, det))
+
+
+if __name__ == "__main__":
+    main()
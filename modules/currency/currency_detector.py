@@ -158,182 +158,195 @@
 
 
 
-import cv2
-import numpy as np
 import onnxruntime as ort
 import threading
 import os
-from .currency_logic import process_predictions
+from .currency_logic import process_predictions, reset_announcements, speak, tracks_settled
+from .preprocess import FramePreprocessor
+from .postprocess import CONFIDENCE, IOU_THRESHOLD, _decode, _unletterbox
+from .session import create_session, input_hw
+from .motion import ChangeGate
+from .currency_gpu_client import RemoteDetector
+from modules.scene.camera import get_camera
 from utils.logger import logger
+from utils.queues import DropOldestQueue
+from config import CURRENCY_BACKEND
 
 # ── config ────────────────────────────────────────────────────────────────────
 MODEL_PATH   = os.path.join(os.path.dirname(__file__), "best.onnx")
-CONFIDENCE   = 0.5
-IOU_THRESHOLD = 0.4
-MAX_FPS      = 20
-
-# ✅ Your dataset labels
-CLASS_NAMES = [
-    "100_rupees",
-    "10_rupees",
-    "2000_rupees",
-    "200_rupees",
-    "20_rupees",
-    "500_rupees",
-    "50_rupees"
-]
 
 # ── state ─────────────────────────────────────────────────────────────────────
 _thread   = None
 _stop_evt = threading.Event()
 
-
-# ── helpers ───────────────────────────────────────────────────────────────────
-def _letterbox(img, new_shape=(640, 640)):
-    """Resize + pad to square while keeping aspect ratio."""
-    h, w = img.shape[:2]
-    scale = min(new_shape[0] / h, new_shape[1] / w)
-    nh, nw = int(h * scale), int(w * scale)
-
-    img = cv2.resize(img, (nw, nh))
-
-    top    = (new_shape[0] - nh) // 2
-    bottom = new_shape[0] - nh - top
-    left   = (new_shape[1] - nw) // 2
-    right  = new_shape[1] - nw - left
-
-    img = cv2.copyMakeBorder(
-        img,
-        top,
-        bottom,
-        left,
-        right,
-        cv2.BORDER_CONSTANT,
-        value=(114, 114, 114)
-    )
-
-    return img, scale, (left, top)
+_session      = None             # created once, reused across start/stop cycles
+_session_lock = threading.Lock()
 
 
+# ── helpers ───────────────────────────────────────────────────────────────────
 def _postprocess(outputs, orig_shape, scale, pad, conf_thresh, iou_thresh):
-    """Decode Ultralytics ONNX with built-in NMS"""
-
-    preds = outputs[0][0]   # (300, 6)
-
-    boxes = preds[:, :4]
-    confidences = preds[:, 4]
-    class_ids = preds[:, 5].astype(int)
+    """Decode the first image of a batch and map its boxes back to the original frame."""
+    dets = _decode(outputs[0][0], conf_thresh, iou_thresh)
+    _unletterbox(dets, orig_shape, scale, pad)
 
-    # Confidence filter
-    mask = confidences >= conf_thresh
-    boxes, confidences, class_ids = boxes[mask], confidences[mask], class_ids[mask]
-
-    if len(boxes) == 0:
-        return {
-            "predictions": [],
-            "image": {"width": orig_shape[1], "height": orig_shape[0]}
-        }
+    return {
+        "predictions": dets,
+        "image": {"width": orig_shape[1], "height": orig_shape[0]}
+    }
 
-    # Undo letterbox
-    pad_x, pad_y = pad
 
-    x1 = (boxes[:, 0] - pad_x) / scale
-    y1 = (boxes[:, 1] - pad_y) / scale
-    x2 = (boxes[:, 2] - pad_x) / scale
-    y2 = (boxes[:, 3] - pad_y) / scale
+def _bind_input(session, input_name, tensor):
+    """
+    IOBinding over the preprocessor's reused tensor — ORT reads the numpy buffer
+    in place instead of copying the feed on every run. None if the build can't bind.
+    """
+    try:
+        binding = session.io_binding()
+        binding.bind_ortvalue_input(input_name, ort.OrtValue.ortvalue_from_numpy(tensor))
+        for out in session.get_outputs():
+            binding.bind_output(out.name)
+        return binding
+    except Exception as e:
+        logger.warning(f"IOBinding unavailable, using session.run: {e}")
+        return None
 
-    predictions = []
 
-    for i in range(len(boxes)):
+def load_session():
+    """Create (first call) or return the shared, warmed-up ONNX session. None if the model is missing."""
+    global _session
 
-        cid = int(class_ids[i])
+    with _session_lock:
+        if _session is None:
+            if not os.path.exists(MODEL_PATH):
+                logger.error(f"Model file not found: {MODEL_PATH}")
+                return None
 
-        label = CLASS_NAMES[cid] if cid < len(CLASS_NAMES) else f"class_{cid}"
+            logger.info(f"Loading ONNX model from {MODEL_PATH}")
+            _session = create_session(MODEL_PATH)
 
-        predictions.append({
-            "x": float((x1[i] + x2[i]) / 2),
-            "y": float((y1[i] + y2[i]) / 2),
-            "width": float(x2[i] - x1[i]),
-            "height": float(y2[i] - y1[i]),
-            "confidence": float(confidences[i]),
-            "class_id": cid,
-            "class": label,
-        })
+        return _session
 
-    return {
-        "predictions": predictions,
-        "image": {"width": orig_shape[1], "height": orig_shape[0]}
-    }
 
+# ── pipeline stages ───────────────────────────────────────────────────────────
+# capture ──frames──▶ inference ──messages──▶ announce
+# Both queues hold one item and drop the oldest, so inference always sees the
+# freshest frame and a long announcement never holds up detection.
 
-# ── main loop ─────────────────────────────────────────────────────────────────
-def _run(stop_evt: threading.Event):
+def _capture_loop(stop_evt: threading.Event, gate: ChangeGate, frames: DropOldestQueue):
+    camera = get_camera()
+    last_seq = 0
 
-    logger.info(f"Loading ONNX model from {MODEL_PATH}")
+    while not stop_evt.is_set():
 
-    # ✅ Check model exists
-    if not os.path.exists(MODEL_PATH):
-        logger.error(f"Model file not found: {MODEL_PATH}")
-        return
+        latest = camera.wait_next(last_seq, timeout=1.0)
 
-    # ✅ Use available providers automatically
-    providers = ort.get_available_providers()
-    session = ort.InferenceSession(MODEL_PATH, providers=providers)
+        if latest is None:
+            logger.warning("No new camera frame — skipping")
+            stop_evt.wait(0.05)   # prevent CPU spinning
+            continue
 
-    input_name  = session.get_inputs()[0].name
-    input_shape = session.get_inputs()[0].shape
+        last_seq = latest.seq
 
-    h_in = input_shape[2] if isinstance(input_shape[2], int) else 640
-    w_in = input_shape[3] if isinstance(input_shape[3], int) else 640
+        # Same note / empty table — nothing new for the model to see
+        thumb = gate.should_infer(latest.image)
+        if thumb is not None:
+            # A view into the camera ring buffer — its slot isn't reused for ~1s
+            frames.put((latest.image, thumb))
 
-    cap = cv2.VideoCapture(0)
+        stop_evt.wait(gate.delay())
 
-    if not cap.isOpened():
-        logger.error("Cannot open camera")
-        return
+    frames.close()
 
-    delay = 1.0 / MAX_FPS
 
-    logger.info("Currency pipeline started ✓ (local ONNX)")
+def _announce_loop(stop_evt: threading.Event, messages: DropOldestQueue):
+    while True:
+        message = messages.get()
+        if message is None or stop_evt.is_set():
+            return              # never announce a note after "Stopped."
+        speak(message)
 
-    while not stop_evt.is_set():
 
-        ret, frame = cap.read()
+# ── main loop ─────────────────────────────────────────────────────────────────
+def _run(stop_evt: threading.Event):
 
-        if not ret:
-            logger.warning("Empty frame — skipping")
-            stop_evt.wait(0.05)   # prevent CPU spinning
-            continue
+    session = load_session()
+    if session is None:
+        return
 
-        orig_shape = frame.shape
+    input_name = session.get_inputs()[0].name
+    h_in, w_in = input_hw(session)
 
-        img, scale, pad = _letterbox(frame, (h_in, w_in))
+    prep    = FramePreprocessor((h_in, w_in))
+    binding = _bind_input(session, input_name, prep.tensor)
 
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    gate     = ChangeGate()
+    frames   = DropOldestQueue(maxsize=1)
+    messages = DropOldestQueue(maxsize=1)
+    reset_announcements()
 
-        img = img.astype(np.float32)
-        img /= 255.0
+    capture  = threading.Thread(target=_capture_loop, args=(stop_evt, gate, frames),
+                                daemon=True, name="currency-capture")
+    announce = threading.Thread(target=_announce_loop, args=(stop_evt, messages),
+                                daemon=True, name="currency-announce")
+    capture.start()
+    announce.start()
 
-        img = np.transpose(img, (2, 0, 1))[np.newaxis]
+    def infer_local(frame):
+        # Writes into prep.tensor in place — the bound input sees the new frame
+        tensor, scale, pad = prep(frame)
 
-        outputs = session.run(None, {input_name: img})
+        if binding is not None:
+            session.run_with_iobinding(binding)
+            outputs = binding.copy_outputs_to_cpu()
+        else:
+            outputs = session.run(None, {input_name: tensor})
 
-        result = _postprocess(
+        return _postprocess(
             outputs,
-            orig_shape,
+            frame.shape,
             scale,
             pad,
             CONFIDENCE,
             IOU_THRESHOLD
         )
 
-        process_predictions(result)
+    # Remote backend answers within its latency budget, local ONNX covers the rest
+    remote = RemoteDetector() if CURRENCY_BACKEND == "remote" else None
+    infer  = (lambda frame: remote.detect(frame, fallback=infer_local)) if remote else infer_local
 
-        stop_evt.wait(delay)
+    logger.info(f"Currency pipeline started ✓ ({'remote + local fallback' if remote else 'local ONNX'})")
 
-    cap.release()
+    # Inference stage runs on this thread
+    while not stop_evt.is_set():
 
-    logger.info("Camera released ✓")
+        # While a remote answer is in flight, wake up often enough to pick it up
+        item = frames.get(timeout=0.02 if remote and remote.waiting else 0.5)
+        if item is None:
+            result = remote.poll() if remote else None
+        else:
+            frame, thumb = item
+            gate.started(thumb)
+            result = infer(frame)
+
+        if result is None:
+            continue            # no frame, or its remote answer is still on the way
+
+        message = process_predictions(result)
+        if message:
+            messages.put(message)
+
+        gate.inferred(len(result["predictions"]) > 0, tracks_settled())
+
+    messages.clear()
+    messages.close()
+    if remote:
+        logger.info(f"Remote currency: {remote.remote_hits} answered, {remote.fallbacks} fell back to local")
+        remote.close()
+    capture.join(timeout=2)
+    announce.join(timeout=0.5)   # may still be mid-sentence — it's a daemon
+
+    logger.info(f"Currency loop exited ✓ ({gate.skipped} unchanged frames skipped, "
+                f"{frames.dropped} stale frames dropped)")
 
 
 # ── public API ────────────────────────────────────────────────────────────────
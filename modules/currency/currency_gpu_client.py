@@ -1,12 +1,182 @@
-import base64
-import requests
+# modules/currency/currency_gpu_client.py — Remote currency inference with a local fallback.
+# Frames go out as raw JPEG bodies over a pooled keep-alive session. detect() never
+# blocks on the network: it sends frame N and hands back whichever answer has landed,
+# so up to `inflight` requests overlap. The local ONNX session only runs once the
+# server has missed its latency budget, and then instead of the remote, not next to it.
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
 import cv2
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.logger import logger
+from .detections import from_dicts
+from config import (
+    CURRENCY_REMOTE_URL, CURRENCY_REMOTE_BUDGET_MS, CURRENCY_REMOTE_INFLIGHT,
+    CURRENCY_REMOTE_JPEG_QUALITY, CURRENCY_REMOTE_MAX_MISSES, CURRENCY_REMOTE_RETRY_AFTER
+)
+
+
+class RemoteDetector:
+    """
+    Usage: remote = RemoteDetector()
+           result = remote.detect(frame, fallback=local_infer)   # same dict shape as _postprocess, or None
+           result = remote.poll()                                # between frames, while remote.waiting
+
+    Answers come back asynchronously: a result may describe a frame one or two frames
+    older than the one passed in — the note tracker matches boxes by IoU, so that is fine.
+    After max_misses consecutive failures / over-budget answers the client stops
+    calling the server for retry_after seconds and goes straight to the fallback.
+    """
+
+    def __init__(self,
+                 url: str = CURRENCY_REMOTE_URL,
+                 budget_ms: float = CURRENCY_REMOTE_BUDGET_MS,
+                 inflight: int = CURRENCY_REMOTE_INFLIGHT,
+                 jpeg_quality: int = CURRENCY_REMOTE_JPEG_QUALITY,
+                 max_misses: int = CURRENCY_REMOTE_MAX_MISSES,
+                 retry_after: float = CURRENCY_REMOTE_RETRY_AFTER):
+        self.url         = url.rstrip("/") + "/detect"
+        self.budget      = budget_ms / 1000.0
+        self.jpeg_params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+        self.max_misses  = max_misses
+        self.retry_after = retry_after
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=inflight)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Content-Type": "image/jpeg", "Connection": "keep-alive"})
+
+        self._pool        = ThreadPoolExecutor(max_workers=inflight, thread_name_prefix="currency-remote")
+        self._inflight    = threading.Semaphore(inflight)
+        self._pending     = deque()     # (future, monotonic send time), oldest first
+        self._misses      = 0
+        self._backoff_end = 0.0
+        self.remote_hits  = 0
+        self.fallbacks    = 0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._backoff_end
+
+    def _post(self, body: bytes):
+        """(result, monotonic time the answer landed)."""
+        try:
+            # A late answer is still read so its connection goes back to the pool
+            resp = self.session.post(self.url, data=body, timeout=(1.0, max(self.budget * 4, 2.0)))
+            resp.raise_for_status()
+            result = resp.json()
+            result["predictions"] = from_dicts(result.get("predictions", []))
+            return result, time.monotonic()
+        finally:
+            self._inflight.release()
+
+    def _miss(self, reason: str):
+        self._misses += 1
+        if self._misses >= self.max_misses:
+            self._backoff_end = time.monotonic() + self.retry_after
+            self._misses = 0
+            logger.warning(f"Remote currency backend {reason} {self.max_misses}× — "
+                           f"using local ONNX for {self.retry_after:.0f}s")
+
+    def submit(self, frame):
+        """Encode + send without waiting. None when every in-flight slot is taken."""
+        if not self._inflight.acquire(blocking=False):
+            return None
+        ok, buf = cv2.imencode(".jpg", frame, self.jpeg_params)
+        if not ok:
+            self._inflight.release()
+            return None
+        return self._pool.submit(self._post, buf.tobytes())
+
+    def _take(self) -> Optional[dict]:
+        """
+        Newest answer that has landed (older ones in front of it are stale), or None.
+        An answer that took longer than the budget is still used but counts as a miss;
+        a request past its deadline with no answer is given up on.
+        """
+        result = None
+        while self._pending:
+            future, sent = self._pending[0]
+            if not future.done():
+                if time.monotonic() > sent + self.budget:
+                    self._pending.popleft()     # its slot frees itself when the answer lands
+                    self._miss("over budget")
+                    continue
+                break
+
+            self._pending.popleft()
+            try:
+                answer, landed = future.result()
+            except Exception as e:
+                self._miss(f"failed ({type(e).__name__})")
+                continue
+
+            if landed - sent > self.budget:
+                self._miss("over budget")
+            else:
+                self._misses = 0
+            self.remote_hits += 1
+            logger.debug(f"Remote currency inference: {(landed - sent) * 1000:.0f} ms")
+            result = answer
+        return result
+
+    @property
+    def waiting(self) -> bool:
+        """A request is still in flight — poll() may soon have an answer."""
+        return bool(self._pending)
+
+    def poll(self) -> Optional[dict]:
+        """An answer that landed since the last call, without sending a frame."""
+        return self._take()
+
+    def detect(self, frame, fallback: Callable[[object], dict]) -> Optional[dict]:
+        """
+        Sends the frame and returns the newest remote answer that has landed. None means
+        answers are still on their way within budget — nothing new for this frame, and
+        the local model is not run. After a miss the client answers from the fallback,
+        keeping a single probe request in flight until the server is back in budget.
+        """
+        if not self.available:
+            self._pending.clear()
+            self.fallbacks += 1
+            return fallback(frame)
+
+        # Healthy: every frame goes out and round trips overlap. Degraded: one probe at a time.
+        if self._misses == 0 or not self._pending:
+            future = self.submit(frame)
+            if future is not None:
+                self._pending.append((future, time.monotonic()))
+
+        result = self._take()
+        if result is not None:
+            return result
+        if self._misses == 0 and self._pending:
+            return None
+
+        self.fallbacks += 1
+        return fallback(frame)
 
-GPU_URL = "https://9069663790960.notebooks.jarvislabs.net/proxy/8000/"   # ← change this
+    def close(self):
+        self._pending.clear()
+        self._pool.shutdown(wait=False)
+        self.session.close()
 
-def detect_currency_gpu(frame):
-    _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 70])
-    img_base64 = base64.b64encode(buffer).decode()
 
-    response = requests.post(GPU_URL, json={"image": img_base64}, timeout=10)
-    return response.json()["result"]
\ No newline at end of file
+def detect_currency_gpu(frame) -> Optional[dict]:
+    """One-off remote call without a fallback — None if the server doesn't answer in budget."""
+    remote = RemoteDetector(inflight=1)
+    try:
+        future = remote.submit(frame)
+        return future.result(timeout=remote.budget)[0] if future is not None else None
+    except Exception as e:
+        logger.warning(f"Remote currency inference failed: {e}")
+        return None
+    finally:
+        remote.close()
@@ -70,8 +70,15 @@
 #         logger.error(f"Error processing currency predictions: {e}", exc_info=True)
 
 
-from utils.logger import logger
+from collections import Counter
+from typing import Optional
+import threading
+import numpy as np
 import time
+from utils.logger import logger
+from config import CURRENCY_ANNOUNCE_COOLDOWN
+from .tracker import NoteTracker
+from .detections import DETECTION_DTYPE, CLASS_NAMES, from_dicts, class_name
 
 try:
     from tts.speaker import Speaker
@@ -79,6 +86,8 @@ try:
 except Exception:
     speaker = None
 
+NUMBER_WORDS = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
 
 def speak(text: str):
     try:
@@ -88,63 +97,128 @@ def speak(text: str):
         logger.error(f"TTS error in currency_logic: {e}")
 
 
-def process_predictions(result):
+def describe_counts(counts: Counter) -> str:
+    """
+    {"500_rupees": 1}                    → "500 rupees detected"
+    {"500_rupees": 2, "100_rupees": 1}   → "Two 500 rupee notes and one 100 rupee note"
+    """
+    if len(counts) == 1 and sum(counts.values()) == 1:
+        label = next(iter(counts))
+        return f"{label.replace('_', ' ')} detected"
 
-    # -------- Persistent memory --------
-    if not hasattr(process_predictions, "last_spoken"):
-        process_predictions.last_spoken = ""
-        process_predictions.last_time = 0
+    def value(label: str) -> int:
+        digits = label.split("_")[0]
+        return int(digits) if digits.isdigit() else 0
 
-    last_spoken = process_predictions.last_spoken
-    last_time = process_predictions.last_time
+    parts = []
+    for label in sorted(counts, key=value, reverse=True):
+        n = counts[label]
+        amount = label.split("_")[0]
+        word = NUMBER_WORDS[n] if n < len(NUMBER_WORDS) else str(n)
+        parts.append(f"{word} {amount} rupee note{'s' if n > 1 else ''}")
 
-    cooldown = 3  # seconds
+    text = parts[0] if len(parts) == 1 else ", ".join(parts[:-1]) + " and " + parts[-1]
+    return text[0].upper() + text[1:]
 
-    try:
-        predictions = None
 
-        if isinstance(result, dict):
-            predictions = result.get("predictions") or result.get("output") or result.get("detections")
+class CurrencyAnnouncer:
+    """
+    Turns per-inference detections into announcements.
+    Speaks only when the set of stable notes in view changes, at most once per cooldown;
+    once the view is empty, the same note shown again is announced again.
+    """
 
-        elif isinstance(result, list) and len(result) > 0:
-            first = result[0]
-            predictions = first.get("predictions") or first.get("output") or first.get("detections")
+    def __init__(self, cooldown: float = CURRENCY_ANNOUNCE_COOLDOWN):
+        self.cooldown    = cooldown
+        self.tracker     = NoteTracker()
+        self.last_counts = Counter()
+        self.last_time   = 0.0
+        self._lock       = threading.Lock()
 
-        if predictions is None:
-            return
+    def reset(self):
+        with self._lock:
+            self.tracker.reset()
+            self.last_counts = Counter()
+            self.last_time   = 0.0
 
-        # -------- Extract label --------
-        class_names = []
+    def settled(self) -> bool:
+        with self._lock:
+            return self.tracker.settled()
 
-        if hasattr(predictions, "data"):
-            class_names = list(predictions.data.get("class_name", []))
+    def update(self, dets: np.ndarray) -> Optional[str]:
+        # A class id outside the label set (model / labels mismatch) can't be named — drop it
+        known = (dets["class_id"] >= 0) & (dets["class_id"] < len(CLASS_NAMES))
+        if not known.all():
+            logger.debug(f"Dropping {int((~known).sum())} detection(s) with unknown class ids")
+            dets = dets[known]
 
-        elif isinstance(predictions, dict):
-            class_names = predictions.get("class_name", []) or predictions.get("classes", [])
+        with self._lock:
+            self.tracker.update(dets)
+            counts = Counter({class_name(cid): n for cid, n in self.tracker.stable_counts().items()})
 
-        elif isinstance(predictions, list):
-            class_names = [p.get("class") or p.get("class_name") for p in predictions if p]
+            if not counts:
+                if not self.tracker.tracks:
+                    self.last_counts = Counter()
+                return None
 
-        class_names = [str(c) for c in class_names if c]
+            now = time.time()
+            if counts == self.last_counts or now - self.last_time < self.cooldown:
+                return None
 
-        if not class_names:
-            return
+            self.last_counts = counts
+            self.last_time   = now
+            return describe_counts(counts)
 
-        label = class_names[0]
 
-        # -------- Speak logic --------
-        now = time.time()
+_announcer = CurrencyAnnouncer()
 
-        if label != last_spoken and (now - last_time > cooldown):
 
-            message = f"{label.replace('_', ' ')} detected"
+def reset_announcements():
+    """Forget tracked notes — called whenever currency mode starts."""
+    _announcer.reset()
+
+
+def tracks_settled() -> bool:
+    """False while a note in view is still collecting votes — the change gate must not skip then."""
+    return _announcer.settled()
 
-            logger.info(f"Currency detected: {message}")
 
-            speak(message)
+def _extract_predictions(result):
+    """DETECTION_DTYPE array from a local or remote result — None if it isn't one."""
+    predictions = None
 
-            process_predictions.last_spoken = label
-            process_predictions.last_time = now
+    if isinstance(result, dict):
+        predictions = result.get("predictions")
+        if predictions is None:
+            predictions = result.get("output") or result.get("detections")
+
+    elif isinstance(result, list) and len(result) > 0:
+        first = result[0]
+        predictions = first.get("predictions") or first.get("output") or first.get("detections")
+
+    if isinstance(predictions, np.ndarray) and predictions.dtype == DETECTION_DTYPE:
+        return predictions
+    if isinstance(predictions, list):
+        return from_dicts(predictions)   # JSON from a remote server
+    return None
+
+
+def process_predictions(result) -> Optional[str]:
+    """
+    Feed one inference result to the announcer.
+    Returns the sentence to speak, or None — speaking is left to the caller
+    so a long announcement never blocks the detection loop.
+    """
+    try:
+        dets = _extract_predictions(result)
+        if dets is None:
+            return None
+
+        message = _announcer.update(dets)
+        if message:
+            logger.info(f"Currency detected: {message}")
+        return message
 
     except Exception as e:
-        logger.error(f"Error processing currency predictions: {e}", exc_info=True)
\ No newline at end of file
+        logger.error(f"Error processing currency predictions: {e}", exc_info=True)
+        return None
@@ -0,0 +1,63 @@
+# modules/currency/detections.py — Compact detection records shared by the currency pipeline.
+# One structured numpy array per frame instead of a list of per-box dicts:
+# decoding, tracking and announcing all work on whole columns at once.
+
+import numpy as np
+
+# ✅ Your dataset labels
+CLASS_NAMES = [
+    "100_rupees",
+    "10_rupees",
+    "2000_rupees",
+    "200_rupees",
+    "20_rupees",
+    "500_rupees",
+    "50_rupees"
+]
+
+# Boxes are xyxy in original-frame pixels
+DETECTION_DTYPE = np.dtype([
+    ("x1", np.float32), ("y1", np.float32), ("x2", np.float32), ("y2", np.float32),
+    ("confidence", np.float32), ("class_id", np.int32),
+])
+
+
+def class_name(class_id: int) -> str:
+    return CLASS_NAMES[class_id] if 0 <= class_id < len(CLASS_NAMES) else f"class_{class_id}"
+
+
+def boxes(dets: np.ndarray) -> np.ndarray:
+    """(n, 4) float32 xyxy boxes of a detection array."""
+    return np.stack([dets["x1"], dets["y1"], dets["x2"], dets["y2"]], axis=1)
+
+
+def to_dicts(dets: np.ndarray) -> list:
+    """Centre-xywh dicts — the JSON shape the old pipeline / remote server used."""
+    return [
+        {
+            "x":          float((d["x1"] + d["x2"]) / 2),
+            "y":          float((d["y1"] + d["y2"]) / 2),
+            "width":      float(d["x2"] - d["x1"]),
+            "height":     float(d["y2"] - d["y1"]),
+            "confidence": float(d["confidence"]),
+            "class_id":   int(d["class_id"]),
+            "class":      class_name(int(d["class_id"])),
+        }
+        for d in dets
+    ]
+
+
+def from_dicts(predictions: list) -> np.ndarray:
+    """Inverse of to_dicts — accepts class names or class ids; entries without a box are dropped."""
+    rows = []
+    for p in predictions:
+        if not p or not all(k in p for k in ("x", "y", "width", "height")):
+            continue
+        cid = p.get("class_id")
+        if cid is None:
+            name = p.get("class") or p.get("class_name")
+            cid = CLASS_NAMES.index(name) if name in CLASS_NAMES else -1
+        hw, hh = p["width"] / 2, p["height"] / 2
+        rows.append((p["x"] - hw, p["y"] - hh, p["x"] + hw, p["y"] + hh,
+                     p.get("confidence", 0.0), cid))
+    return np.array(rows, dtype=DETECTION_DTYPE)
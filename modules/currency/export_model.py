@@ -1,9 +1,154 @@
-# run this once as a standalone script — save it as export_model.py
-# place it next to your best.onnx (which is actually best.pt)
-from ultralytics import YOLO
+# modules/currency/export_model.py — Export + quantize the currency model into benchmarkable variants.
+#
+# Run from the project root (needs ultralytics, onnx, onnxruntime):
+#   python -m modules.currency.export_model --weights modules/currency/best.pt \
+#          --calib path/to/note_photos --sizes 640 416 320
+#
+# For every input size this writes to --out (batch axis dynamic unless --static-batch,
+# so modules.currency.batch can run several images per session.run):
+#   best_<size>.onnx              FP32
+#   best_<size>_int8_dyn.onnx     dynamic INT8 (weights only, activations quantized at run time)
+#   best_<size>_int8_static.onnx  static INT8 QDQ, calibrated on --calib images
+# Then compare them with:  python -m modules.currency.benchmark --images ... --models ...
 
-# load it as pt (even though it's named .onnx, it's actually pytorch)
-model = YOLO("best.pt")
+import argparse
+import glob
+import os
+import shutil
+import tempfile
 
-# export as real ONNX
-model.export(format="onnx", imgsz=640, opset=12)
\ No newline at end of file
+import cv2
+import numpy as np
+
+from .preprocess import letterbox
+
+HERE        = os.path.dirname(os.path.abspath(__file__))
+IMAGE_EXTS  = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+def list_images(folder: str) -> list:
+    paths = []
+    for ext in IMAGE_EXTS:
+        paths += glob.glob(os.path.join(folder, f"*{ext}"))
+        paths += glob.glob(os.path.join(folder, f"*{ext.upper()}"))
+    return sorted(set(paths))
+
+
+def to_input(img: np.ndarray, size: int):
+    """Same preprocessing as the live loop: letterbox → RGB → /255 → NCHW. → (tensor, scale, pad)"""
+    img, scale, pad = letterbox(img, (size, size))
+    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB).astype(np.float32) / 255.0
+    return np.ascontiguousarray(np.transpose(img, (2, 0, 1))[np.newaxis]), scale, pad
+
+
+# ── FP32 export ───────────────────────────────────────────────────────────────
+def _pin_image_size(path: str, size: int):
+    """Ultralytics' dynamic=True frees batch, height and width — keep only the batch axis free."""
+    import onnx
+
+    model = onnx.load(path)
+    dims  = model.graph.input[0].type.tensor_type.shape.dim
+    dims[0].dim_param = "batch"
+    for dim in dims[2:]:
+        dim.dim_value = size
+    onnx.save(model, path)
+
+
+def export_fp32(weights: str, size: int, out_dir: str, opset: int = 12, dynamic_batch: bool = True) -> str:
+    from ultralytics import YOLO
+
+    # Ultralytics writes <weights>.onnx next to the weights — for the default best.pt that is
+    # the live best.onnx. Export from a private copy instead and copy the result out.
+    target = os.path.join(out_dir, f"best_{size}.onnx")
+    with tempfile.TemporaryDirectory() as tmp:
+        local = shutil.copy2(weights, os.path.join(tmp, os.path.basename(weights)))
+        exported = YOLO(local).export(format="onnx", imgsz=size, opset=opset, simplify=True,
+                                      dynamic=dynamic_batch)
+        shutil.copyfile(exported, target)
+    if dynamic_batch:
+        _pin_image_size(target, size)
+    print(f"FP32      {target}{' (dynamic batch)' if dynamic_batch else ''}")
+    return target
+
+
+# ── INT8 quantization ─────────────────────────────────────────────────────────
+def quantize_dynamic_int8(fp32_path: str) -> str:
+    """Weights-only INT8 — no calibration data needed, smallest accuracy risk on CPU."""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    target = fp32_path.replace(".onnx", "_int8_dyn.onnx")
+    quantize_dynamic(fp32_path, target, weight_type=QuantType.QUInt8)
+    print(f"INT8 dyn  {target}")
+    return target
+
+
+def _calibration_reader(input_name: str, images: list, size: int):
+    from onnxruntime.quantization import CalibrationDataReader
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self):
+            self._paths = iter(images)
+
+        def get_next(self):
+            for path in self._paths:
+                img = cv2.imread(path)
+                if img is not None:
+                    return {input_name: to_input(img, size)[0]}
+            return None
+
+    return _Reader()
+
+
+def quantize_static_int8(fp32_path: str, size: int, calib_images: list) -> str:
+    """Weights + activations INT8 (QDQ), calibrated on real note photos — fastest on CPU."""
+    import onnxruntime as ort
+    from onnxruntime.quantization import quantize_static, QuantType, QuantFormat
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    prepped = fp32_path.replace(".onnx", "_prep.onnx")
+    quant_pre_process(fp32_path, prepped)
+
+    input_name = ort.InferenceSession(prepped, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+    target     = fp32_path.replace(".onnx", "_int8_static.onnx")
+
+    quantize_static(
+        prepped, target,
+        _calibration_reader(input_name, calib_images, size),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+    )
+    os.remove(prepped)
+    print(f"INT8 stat {target}")
+    return target
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Export FP32 / INT8 variants of the currency model")
+    parser.add_argument("--weights", default=os.path.join(HERE, "best.pt"))
+    parser.add_argument("--sizes",   type=int, nargs="+", default=[640, 416, 320])
+    parser.add_argument("--out",     default=os.path.join(HERE, "variants"))
+    parser.add_argument("--calib",   help="folder of note photos for static INT8 calibration")
+    parser.add_argument("--calib-limit", type=int, default=200)
+    parser.add_argument("--opset",   type=int, default=12)
+    parser.add_argument("--static-batch", action="store_true",
+                        help="fix the batch axis at 1 (the live loop only ever runs one frame)")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+
+    calib_images = list_images(args.calib)[:args.calib_limit] if args.calib else []
+    if not calib_images:
+        print("No --calib images — skipping static INT8")
+
+    for size in args.sizes:
+        fp32 = export_fp32(args.weights, size, args.out, args.opset, not args.static_batch)
+        quantize_dynamic_int8(fp32)
+        if calib_images:
+            quantize_static_int8(fp32, size, calib_images)
+
+
+if __name__ == "__main__":
+    main()
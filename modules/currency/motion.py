@@ -0,0 +1,107 @@
+# modules/currency/motion.py — Cheap change gate for the currency loop.
+# Compares a tiny grayscale thumbnail of each frame with the one last sent to the model,
+# so a note held still (or an empty table) costs a resize instead of a full ONNX run.
+
+import threading
+import time
+from typing import Optional
+import cv2
+import numpy as np
+from config import (
+    CURRENCY_ACTIVE_FPS, CURRENCY_IDLE_FPS, CURRENCY_IDLE_AFTER, CURRENCY_MOTION_SIZE,
+    CURRENCY_MOTION_PIXEL_DELTA, CURRENCY_MOTION_MIN_FRACTION, CURRENCY_FORCE_INFER_EVERY
+)
+
+
+class ChangeGate:
+    """
+    Usage:  capture thread:    thumb = gate.should_infer(frame)
+                               if thumb is not None: queue (frame, thumb)
+                               stop_evt.wait(gate.delay())
+            inference thread:  gate.started(thumb); ...run model...; gate.inferred(found, settled)
+
+    A frame is "changed" when more than min_fraction of thumbnail pixels moved by
+    more than pixel_delta grey levels — global flicker / sensor noise stays under that.
+    The loop runs at active_fps while things change or notes are in view and falls
+    back to idle_fps after idle_after seconds of stillness. While a note is still
+    collecting votes (not settled) every frame is inferred at active_fps — a still
+    note is announced after min_votes frames, not min_votes forced re-checks.
+
+    The reference only moves when the model actually picks a frame up (started()),
+    so a queued frame that gets dropped never hides the change it carried.
+    Thread-safe between one capture thread and one inference thread.
+    """
+
+    def __init__(self,
+                 active_fps: float = CURRENCY_ACTIVE_FPS,
+                 idle_fps: float = CURRENCY_IDLE_FPS,
+                 idle_after: float = CURRENCY_IDLE_AFTER,
+                 size=CURRENCY_MOTION_SIZE,
+                 pixel_delta: int = CURRENCY_MOTION_PIXEL_DELTA,
+                 min_fraction: float = CURRENCY_MOTION_MIN_FRACTION,
+                 force_every: float = CURRENCY_FORCE_INFER_EVERY):
+        self.active_delay = 1.0 / active_fps
+        self.idle_delay   = 1.0 / idle_fps
+        self.idle_after   = idle_after
+        self.pixel_delta  = pixel_delta
+        self.min_changed  = int(min_fraction * size[0] * size[1])
+        self.force_every  = force_every
+
+        w, h = size
+        self._small = np.empty((h, w, 3), dtype=np.uint8)
+        self._gray  = np.empty((h, w), dtype=np.uint8)
+        self._ref   = np.empty((h, w), dtype=np.uint8)   # thumbnail of the last inferred frame
+        self._diff  = np.empty((h, w), dtype=np.uint8)
+        self._has_ref = False
+        self._lock    = threading.Lock()
+
+        self._last_infer  = 0.0
+        self._last_active = 0.0
+        self._settled     = True
+        self.skipped      = 0
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        cv2.resize(frame, (self._gray.shape[1], self._gray.shape[0]),
+                   dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        return self._gray
+
+    def _changed(self, gray: np.ndarray) -> bool:
+        if not self._has_ref:
+            return True
+        cv2.absdiff(gray, self._ref, dst=self._diff)
+        return np.count_nonzero(self._diff > self.pixel_delta) > self.min_changed
+
+    def should_infer(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """Thumbnail to hand to started() if the frame is worth a model run, else None."""
+        gray = self._thumbnail(frame)
+        now  = time.monotonic()
+        with self._lock:
+            if self._changed(gray) or not self._settled:
+                self._last_active = now
+            elif now - self._last_infer < self.force_every:
+                self.skipped += 1
+                return None
+        return gray.copy()
+
+    def started(self, thumb: np.ndarray):
+        """The model picked this frame up — later frames are compared with it."""
+        with self._lock:
+            self._ref[...]   = thumb
+            self._has_ref    = True
+            self._last_infer = time.monotonic()
+
+    def inferred(self, found: bool, settled: bool = True):
+        """
+        Report whether the model saw anything — notes in view keep the loop at the active rate.
+        settled=False (a track still voting) disables skipping until the tracks settle.
+        """
+        with self._lock:
+            self._settled = settled
+            if found or not settled:
+                self._last_active = time.monotonic()
+
+    def delay(self) -> float:
+        with self._lock:
+            idle = time.monotonic() - self._last_active > self.idle_after
+        return self.idle_delay if idle else self.active_delay
@@ -0,0 +1,79 @@
+# modules/currency/postprocess.py — Raw currency-model output → detections in frame pixels.
+# Shared by the live loop, the batch CLI and the stand-in server; kept free of the camera,
+# speaker and ONNX session imports so offline tools and pool workers load it cheaply.
+
+import numpy as np
+
+from .detections import CLASS_NAMES, DETECTION_DTYPE
+
+CONFIDENCE    = 0.5
+IOU_THRESHOLD = 0.4
+
+MAX_DETECTIONS = 300   # same cap as the end-to-end export
+
+
+def _nms(boxes, scores, iou_thresh, max_det=MAX_DETECTIONS):
+    """Greedy NMS over (n, 4) xyxy boxes → kept indices, highest score first."""
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    order = scores.argsort()[::-1]
+
+    keep = []
+    while order.size and len(keep) < max_det:
+        i, rest = order[0], order[1:]
+        keep.append(i)
+
+        w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        inter = w * h
+        iou = inter / np.maximum(areas[i] + areas[rest] - inter, 1e-9)
+
+        order = rest[iou <= iou_thresh]
+
+    return np.array(keep, dtype=np.intp)
+
+
+def _decode(preds, conf_thresh, iou_thresh, num_classes=len(CLASS_NAMES)):
+    """
+    One image's raw model output → DETECTION_DTYPE array in letterbox pixels.
+
+    Accepts both export styles:
+      (N, 6)        end-to-end (NMS baked in): x1, y1, x2, y2, score, class
+      (4 + nc, N)   raw YOLO head: cx, cy, w, h, then one score row per class
+    Class-aware NMS at iou_thresh runs in both cases (near no-op on already-suppressed output).
+    """
+    if preds.shape[0] == 4 + num_classes and preds.shape[1] != 6:
+        class_ids = preds[4:].argmax(axis=0)
+        scores    = preds[4:].max(axis=0)
+
+        mask = scores >= conf_thresh
+        cx, cy, w, h = preds[:4, mask]
+        xyxy = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+        scores, class_ids = scores[mask], class_ids[mask].astype(np.int32)
+    else:
+        mask = preds[:, 4] >= conf_thresh
+        xyxy      = preds[mask, :4]
+        scores    = preds[mask, 4]
+        class_ids = preds[mask, 5].astype(np.int32)
+
+    if len(scores) == 0:
+        return np.empty(0, dtype=DETECTION_DTYPE)
+
+    # Class-aware: shift each class into its own coordinate range so boxes of
+    # different denominations never suppress each other
+    offsets = class_ids[:, None] * (float(xyxy.max()) + 1.0)
+    keep = _nms(xyxy + offsets, scores, iou_thresh)
+
+    dets = np.empty(len(keep), dtype=DETECTION_DTYPE)
+    dets["x1"], dets["y1"], dets["x2"], dets["y2"] = xyxy[keep].T
+    dets["confidence"] = scores[keep]
+    dets["class_id"]   = class_ids[keep]
+    return dets
+
+
+def _unletterbox(dets, orig_shape, scale, pad):
+    """Map letterbox-pixel boxes back to the original frame, in place."""
+    pad_x, pad_y = pad
+    h, w = orig_shape[:2]
+    for col, offset, limit in (("x1", pad_x, w), ("x2", pad_x, w), ("y1", pad_y, h), ("y2", pad_y, h)):
+        dets[col] = np.clip((dets[col] - offset) / scale, 0, limit)
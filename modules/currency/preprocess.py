@@ -0,0 +1,111 @@
+# modules/currency/preprocess.py — Allocation-free frame preprocessing for the currency model.
+# Letterbox, BGR→RGB, /255 and HWC→NCHW are written straight into one preallocated
+# float32 tensor, so the 20 FPS loop doesn't churn through five temporaries per frame.
+
+import cv2
+import numpy as np
+
+PAD_VALUE = 114
+_INV_255  = np.float32(1.0 / 255.0)
+
+
+def letterbox(img, new_shape=(640, 640)):
+    """Resize + pad to square while keeping aspect ratio."""
+    h, w = img.shape[:2]
+    scale = min(new_shape[0] / h, new_shape[1] / w)
+    nh, nw = int(h * scale), int(w * scale)
+
+    img = cv2.resize(img, (nw, nh))
+
+    top    = (new_shape[0] - nh) // 2
+    bottom = new_shape[0] - nh - top
+    left   = (new_shape[1] - nw) // 2
+    right  = new_shape[1] - nw - left
+
+    img = cv2.copyMakeBorder(
+        img,
+        top,
+        bottom,
+        left,
+        right,
+        cv2.BORDER_CONSTANT,
+        value=(PAD_VALUE, PAD_VALUE, PAD_VALUE)
+    )
+
+    return img, scale, (left, top)
+
+
+class FramePreprocessor:
+    """
+    Usage: prep = FramePreprocessor((640, 640))
+           tensor, scale, pad = prep(frame)   # tensor is prep.tensor — same buffer every call
+
+    Produces exactly what letterbox() + cvtColor + astype + /255 + transpose does,
+    but the (1, 3, H, W) tensor is owned by the preprocessor and overwritten in place.
+    Padding is filled once and only recomputed when the source frame size changes.
+    """
+
+    def __init__(self, input_shape=(640, 640)):
+        self.h, self.w = input_shape
+
+        self.canvas = np.full((self.h, self.w, 3), PAD_VALUE, dtype=np.uint8)   # letterboxed BGR
+        self.tensor = np.empty((1, 3, self.h, self.w), dtype=np.float32)        # C-contiguous NCHW
+
+        self._src_shape = None
+        self._scale     = 1.0
+        self._pad       = (0, 0)
+        self._roi       = None    # canvas view the resized frame lands in
+        self._planes    = None    # (tensor plane view, canvas channel view) per RGB channel
+
+    def _layout(self, src_h: int, src_w: int):
+        """Recompute letterbox geometry and views for a new source size (same maths as letterbox())."""
+        scale = min(self.h / src_h, self.w / src_w)
+        nh, nw = int(src_h * scale), int(src_w * scale)
+        top  = (self.h - nh) // 2
+        left = (self.w - nw) // 2
+
+        self.canvas.fill(PAD_VALUE)
+        self.tensor.fill(PAD_VALUE * _INV_255)
+
+        rows, cols = slice(top, top + nh), slice(left, left + nw)
+        self._roi = self.canvas[rows, cols]
+
+        # Tensor channel c is RGB, canvas channel 2 - c is BGR — the colour swap is just a view
+        self._planes = [
+            (self.tensor[0, c, rows, cols], self._roi[..., 2 - c]) for c in range(3)
+        ]
+
+        self._src_shape = (src_h, src_w)
+        self._scale     = scale
+        self._pad       = (left, top)
+
+    def __call__(self, frame: np.ndarray):
+        src_h, src_w = frame.shape[:2]
+        if self._src_shape != (src_h, src_w):
+            self._layout(src_h, src_w)
+
+        roi = self._roi
+        out = cv2.resize(frame, (roi.shape[1], roi.shape[0]), dst=roi)
+        if not np.shares_memory(out, roi):
+            roi[...] = out    # OpenCV build refused the strided dst — one copy instead of four
+
+        # uint8 × float32 scalar → float32, written straight into the tensor plane
+        for plane, channel in self._planes:
+            np.multiply(channel, _INV_255, out=plane)
+
+        return self.tensor, self._scale, self._pad
+
+
+def prepare_image(image, size: int):
+    """
+    One-shot letterbox for offline / batch use — path or BGR array in,
+    (CHW float32 tensor, scale, pad, original shape) out. None if the file can't be read.
+    Kept free of project imports so process-pool workers start fast.
+    """
+    img = cv2.imread(image) if isinstance(image, str) else image
+    if img is None:
+        return None
+
+    prep = FramePreprocessor((size, size))
+    tensor, scale, pad = prep(img)
+    return tensor[0], scale, pad, img.shape
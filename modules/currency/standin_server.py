@@ -0,0 +1,93 @@
+# modules/currency/standin_server.py — Local stand-in for the remote currency GPU server.
+# Wraps the same ONNX model behind the wire format RemoteDetector speaks, so the remote
+# path (pooling, budget, fallback) can be load-tested offline.
+#
+#   python -m modules.currency.standin_server --port 8001 [--delay-ms 80]
+#   CURRENCY_BACKEND=remote CURRENCY_REMOTE_URL=http://127.0.0.1:8001 python main.py
+#
+# POST /detect   body: raw JPEG (Content-Type: image/jpeg) or multipart field "image"
+#   → {"predictions": [{x, y, width, height, confidence, class_id, class}], "image": {...}, "inference_ms"}
+
+import argparse
+import asyncio
+import threading
+import time
+
+import cv2
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from .currency_detector import load_session
+from .detections import to_dicts
+from .postprocess import CONFIDENCE, IOU_THRESHOLD, _decode, _unletterbox
+from .preprocess import FramePreprocessor
+from .session import input_hw
+
+app = FastAPI()
+
+_state = {"delay": 0.0}
+_lock  = threading.Lock()      # one ONNX run at a time on the shared preprocessor buffer
+_prep  = None
+
+
+def _infer(img: np.ndarray) -> dict:
+    global _prep
+    session = load_session()
+    inp = session.get_inputs()[0]
+
+    with _lock:
+        if _prep is None:
+            _prep = FramePreprocessor(input_hw(session))
+        start = time.perf_counter()
+        tensor, scale, pad = _prep(img)
+        outputs = session.run(None, {inp.name: tensor})
+        elapsed = (time.perf_counter() - start) * 1000
+
+    dets = _decode(outputs[0][0], CONFIDENCE, IOU_THRESHOLD)
+    _unletterbox(dets, img.shape, scale, pad)
+    return {
+        "predictions":  to_dicts(dets),
+        "image":        {"width": img.shape[1], "height": img.shape[0]},
+        "inference_ms": round(elapsed, 1),
+    }
+
+
+@app.post("/detect")
+async def detect(request: Request):
+    if request.headers.get("content-type", "").startswith("multipart/"):
+        form = await request.form()
+        body = await form["image"].read()
+    else:
+        body = await request.body()
+
+    img = cv2.imdecode(np.frombuffer(body, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        return JSONResponse({"error": "body is not a decodable image"}, status_code=400)
+
+    if _state["delay"]:
+        await asyncio.sleep(_state["delay"])     # simulated network latency
+
+    return JSONResponse(await asyncio.to_thread(_infer, img))
+
+
+@app.get("/health")
+def health():
+    return {"status": "ok"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in remote currency inference server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="extra latency per request")
+    args = parser.parse_args()
+
+    _state["delay"] = args.delay_ms / 1000.0
+    load_session()     # optimize + warm before the first request
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# modules/currency/tracker.py — Temporal aggregation of currency detections.
+# Follows each note across inferences with IoU association and keeps a sliding
+# window of confidence-weighted label votes, so one misread frame can't be announced
+# and several notes in view can be counted ("two 500 rupee notes and one 100").
+
+import time
+from collections import Counter, deque
+from typing import List, Optional
+
+import numpy as np
+
+from .detections import boxes as det_boxes
+from config import (
+    CURRENCY_TRACK_IOU, CURRENCY_TRACK_MAX_AGE,
+    CURRENCY_VOTE_WINDOW, CURRENCY_MIN_VOTES, CURRENCY_STABLE_SHARE
+)
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of (n, 4) and (m, 4) xyxy boxes → (n, m)."""
+    tl = np.maximum(a[:, None, :2], b[None, :, :2])
+    br = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter  = np.prod(np.clip(br - tl, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:] - b[:, :2], axis=1)
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+class Track:
+    """One physical note. `votes` holds (class_id, confidence) per inference, None when missed."""
+
+    def __init__(self, track_id: int, box: np.ndarray, window: int):
+        self.id           = track_id
+        self.box          = box
+        self.votes        = deque(maxlen=window)
+        self.missed_since = None    # monotonic time of the first miss in the current run of misses
+
+    def observe(self, box: np.ndarray, class_id: int, confidence: float):
+        self.box          = box
+        self.missed_since = None
+        self.votes.append((class_id, confidence))
+
+    def miss(self, now: float):
+        if self.missed_since is None:
+            self.missed_since = now
+        self.votes.append(None)
+
+    def stable_class(self, min_votes: int, min_share: float) -> Optional[int]:
+        """Winning class id if it was seen often enough and holds most of the confidence mass."""
+        weights: Counter = Counter()
+        seen = 0
+        for vote in self.votes:
+            if vote is not None:
+                weights[vote[0]] += vote[1]
+                seen += 1
+        if seen < min_votes:
+            return None
+
+        class_id, weight = weights.most_common(1)[0]
+        return class_id if weight / sum(weights.values()) >= min_share else None
+
+
+class NoteTracker:
+    """
+    Usage: tracker.update(predictions)  # once per inference, [] when nothing was found
+           tracker.stable_counts()      # → Counter({class_id: notes in view, ...})
+           tracker.settled()            # → False while a note is still collecting votes
+
+    A track expires max_age seconds after its first miss, however few inferences ran
+    in between. Frames skipped by the change gate never count as misses, so a note held
+    still isn't expired, and a missing note keeps the tracker unsettled — the gate then
+    infers at the active rate until the track is confirmed or dropped.
+    """
+
+    def __init__(self,
+                 iou_threshold: float = CURRENCY_TRACK_IOU,
+                 max_age: float = CURRENCY_TRACK_MAX_AGE,
+                 window: int = CURRENCY_VOTE_WINDOW,
+                 min_votes: int = CURRENCY_MIN_VOTES,
+                 min_share: float = CURRENCY_STABLE_SHARE):
+        self.iou_threshold = iou_threshold
+        self.max_age       = max_age
+        self.window        = window
+        self.min_votes     = min_votes
+        self.min_share     = min_share
+
+        self.tracks: List[Track] = []
+        self._next_id = 0
+
+    def reset(self):
+        self.tracks = []
+
+    def update(self, dets: np.ndarray):
+        """dets: DETECTION_DTYPE array from one inference."""
+        boxes       = det_boxes(dets)
+        class_ids   = dets["class_id"].tolist()
+        confidences = dets["confidence"].tolist()
+
+        unmatched_tracks = set(range(len(self.tracks)))
+        unmatched_dets   = set(range(len(dets)))
+
+        # Greedy association — highest IoU pairs first, class-agnostic so a flipped label
+        # becomes a vote against it rather than a brand-new note
+        if self.tracks and len(dets):
+            ious = iou_matrix(np.stack([t.box for t in self.tracks]), boxes)
+            for flat in np.argsort(ious, axis=None)[::-1]:
+                ti, di = np.unravel_index(flat, ious.shape)
+                if ious[ti, di] < self.iou_threshold:
+                    break
+                if ti in unmatched_tracks and di in unmatched_dets:
+                    self.tracks[ti].observe(boxes[di], class_ids[di], confidences[di])
+                    unmatched_tracks.discard(ti)
+                    unmatched_dets.discard(di)
+
+        now = time.monotonic()
+        for ti in unmatched_tracks:
+            self.tracks[ti].miss(now)
+        self.tracks = [t for t in self.tracks
+                       if t.missed_since is None or now - t.missed_since <= self.max_age]
+
+        for di in sorted(unmatched_dets):
+            track = Track(self._next_id, boxes[di], self.window)
+            track.observe(boxes[di], class_ids[di], confidences[di])
+            self.tracks.append(track)
+            self._next_id += 1
+
+    def settled(self) -> bool:
+        """True when every note in view is seen and has a stable class (or none is in view)."""
+        return all(t.missed_since is None and t.stable_class(self.min_votes, self.min_share) is not None
+                   for t in self.tracks)
+
+    def stable_counts(self) -> Counter:
+        counts: Counter = Counter()
+        for track in self.tracks:
+            class_id = track.stable_class(self.min_votes, self.min_share)
+            if class_id is not None:
+                counts[class_id] += 1
+        return counts
@@ -241,7 +241,8 @@ Question: {query}
 # ─────────────────────────────────────────────
 # Main Handler
 # ─────────────────────────────────────────────
-def handle_knowledge_query(query: str):
+def handle_knowledge_query(query: str, speak: bool = True) -> str:
+    """Answer a knowledge query. Speaks it unless speak=False; always returns the answer text."""
     try:
         logger.info(f"Knowledge query: {query}")
 
@@ -264,11 +265,16 @@ def handle_knowledge_query(query: str):
                 logger.warning(f"Web search skipped: {e}")
 
         answer = _ask_llm(query, lang_code, web_context, weather)
-        Speaker().speak(answer)
+        if speak:
+            Speaker().speak(answer)
+        return answer
 
     except Exception as e:
         logger.error(f"Knowledge logic error: {e}", exc_info=True)
-        try:
-            Speaker().speak("Sorry, I couldn't process that.")
-        except Exception:
-            pass
\ No newline at end of file
+        answer = "Sorry, I couldn't process that."
+        if speak:
+            try:
+                Speaker().speak(answer)
+            except Exception:
+                pass
+        return answer
\ No newline at end of file
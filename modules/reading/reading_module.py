@@ -139,57 +139,60 @@
 
 # modules/reading/reading_module.py
 
-import base64
 import cv2
 import numpy as np
-import time
+from modules.scene.camera import get_camera
+from modules.scene.vlm_client import get_vlm_client
+from core.executors import MODULE_EXECUTOR, run_blocking
 from utils.logger import logger
 from utils.image_utils import frame_to_base64, resize_frame
-from config import GROQ_API_KEY, VLM_MODEL, CAMERA_INDEX
+from utils.timing import span
+from utils.text_utils import iter_sentences
+from tts.speaker import speech_generation, interrupted_since
+from config import VLM_MODEL, READING_MAX_TOKENS
+
+READING_PROMPT = """
+You are a reading assistant for visually impaired users.
+
+Read ALL visible text in this image completely. Do not skip or truncate anything.
+
+Instructions:
+- Read every single word exactly as written
+- Read from top to bottom, left to right
+- For medicine labels: name, dosage, instructions, warnings
+- For receipts: every item, price, and total
+- For documents: full text top to bottom
+- For screens/phones: read all visible text
+- Add brief context first e.g. "This is a medicine label" or "This is a receipt"
+- If no text visible: say "I could not find any text. Please hold the document closer."
+- Do NOT summarize — read the COMPLETE text
+"""
 
 
 class ReadingModule:
 
-    def _sharpness_score(self, b64_image: str) -> float:
+    def __init__(self):
+        self.vlm = get_vlm_client()
+
+    def _sharpness_score(self, frame: np.ndarray) -> float:
         try:
-            img_bytes = base64.b64decode(b64_image)
-            np_arr = np.frombuffer(img_bytes, np.uint8)
-            img = cv2.imdecode(np_arr, cv2.IMREAD_GRAYSCALE)
-            return cv2.Laplacian(img, cv2.CV_64F).var()
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            return cv2.Laplacian(gray, cv2.CV_64F).var()
         except Exception as e:
             logger.warning(f"Sharpness calculation failed: {e}")
             return 0.0
 
     def _capture_frames(self, count: int = 3) -> list:
-        frames = []
-        cam = cv2.VideoCapture(CAMERA_INDEX)
-
-        if not cam.isOpened():
-            cam.release()
-            raise RuntimeError("Camera not found.")
-
-        time.sleep(0.5)
-
-        for _ in range(3):
-            cam.read()
-
-        for i in range(count):
-            ret, frame = cam.read()
-
-            if ret and frame is not None:
-                frame = resize_frame(frame, max_width=1024)  # smaller payload
-                b64 = frame_to_base64(frame, quality=85)     # smaller JPEG
-                frames.append(b64)
+        """Raw frames straight from the camera ring buffer — nothing is encoded here."""
+        with span("camera_capture"):
+            frames = [f.image for f in get_camera().recent(count, spacing=0.2)]
 
-                logger.debug(f"Frame {i + 1}/{count} captured ✓")
-
-            time.sleep(0.2)
-
-        cam.release()
+        logger.debug(f"{len(frames)}/{count} frames captured ✓")
 
         return frames
 
     def _pick_sharpest(self, frames: list) -> str:
+        """Score the raw frames and JPEG/base64-encode only the winner."""
         scores = [self._sharpness_score(f) for f in frames]
 
         best_index = scores.index(max(scores))
@@ -198,71 +201,60 @@ class ReadingModule:
             f"Sharpness scores: {[round(s, 1) for s in scores]} — using frame {best_index}"
         )
 
-        return frames[best_index]
-
-    def run(self) -> str:
+        best = resize_frame(frames[best_index], max_width=1024)  # smaller payload
+        return frame_to_base64(best, quality=85)                 # smaller JPEG
 
-        logger.info("ReadingModule.run() | capturing 3 frames")
+    def _best_frame(self):
+        """Capture and pick the sharpest frame. Returns (b64, None) or (None, error message)."""
+        logger.info("ReadingModule | capturing 3 frames")
 
         try:
             frames = self._capture_frames(3)
 
         except RuntimeError as e:
             logger.error(f"Camera error: {e}")
-            return "I could not access the camera. Please check it is connected."
+            return None, "I could not access the camera. Please check it is connected."
 
         if not frames:
-            return "I could not capture any frames from the camera."
+            return None, "I could not capture any frames from the camera."
 
         best_frame = self._pick_sharpest(frames)
 
         logger.info("Best frame selected for reading ✓")
 
-        reading_prompt = """
-You are a reading assistant for visually impaired users.
+        return best_frame, None
 
-Read ALL visible text in this image completely. Do not skip or truncate anything.
+    def run(self) -> str:
 
-Instructions:
-- Read every single word exactly as written
-- Read from top to bottom, left to right
-- For medicine labels: name, dosage, instructions, warnings
-- For receipts: every item, price, and total
-- For documents: full text top to bottom
-- For screens/phones: read all visible text
-- Add brief context first e.g. "This is a medicine label" or "This is a receipt"
-- If no text visible: say "I could not find any text. Please hold the document closer."
-- Do NOT summarize — read the COMPLETE text
-"""
+        best_frame, error = self._best_frame()
+        if error:
+            return error
 
         logger.info("Sending frame to Groq Vision...")
 
         try:
-            from groq import Groq
-
-            client = Groq(api_key=GROQ_API_KEY)
-
-            response = client.chat.completions.create(
-                model=VLM_MODEL,
-                max_tokens=2048,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{best_frame}"
+            with span("vlm"):
+                response = self.vlm.client.chat.completions.create(
+                    model=VLM_MODEL,
+                    max_tokens=READING_MAX_TOKENS,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": [
+                                {
+                                    "type": "image_url",
+                                    "image_url": {
+                                        "url": f"data:image/jpeg;base64,{best_frame}"
+                                    }
+                                },
+                                {
+                                    "type": "text",
+                                    "text": READING_PROMPT
                                 }
-                            },
-                            {
-                                "type": "text",
-                                "text": reading_prompt
-                            }
-                        ]
-                    }
-                ]
-            )
+                            ]
+                        }
+                    ]
+                )
 
             result = response.choices[0].message.content.strip()
 
@@ -275,4 +267,50 @@ Instructions:
 
         logger.info(f"Reading result: {result[:100]}...")
 
-        return result.strip()
\ No newline at end of file
+        return result.strip()
+
+    async def arun(self) -> str:
+        """Async run(): capture + sharpness on the module executor, VLM call awaited."""
+        best_frame, error = await run_blocking(MODULE_EXECUTOR, self._best_frame)
+        if error:
+            return error
+
+        logger.info("Sending frame to Groq Vision (async)...")
+
+        result = await self.vlm.adescribe(best_frame, READING_PROMPT, max_tokens=READING_MAX_TOKENS)
+
+        if not result:
+            return "I could not read any text from the image. Please try again."
+
+        logger.info(f"Reading result: {result[:100]}...")
+
+        return result
+
+    def run_streaming(self, speaker) -> str:
+        """
+        Like run(), but speaks each sentence as soon as the VLM has generated it.
+        Everything returned has already been spoken.
+        """
+        best_frame, error = self._best_frame()
+        if error:
+            speaker.speak(error)
+            return error
+
+        logger.info("Streaming frame to Groq Vision...")
+
+        deltas = self.vlm.describe_stream(
+            best_frame, READING_PROMPT, max_tokens=READING_MAX_TOKENS
+        )
+        generation = speech_generation()
+        result = speaker.speak_stream(iter_sentences(deltas))
+
+        if interrupted_since(generation):
+            logger.info("Reading interrupted — no fallback message")
+            return result
+        if not result:
+            result = "I could not read any text from the image. Please try again."
+            speaker.speak(result)
+
+        logger.info(f"Reading result: {result[:100]}...")
+
+        return result
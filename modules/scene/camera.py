@@ -1,48 +1,241 @@
-# modules/scene/camera.py — Camera frame capture using OpenCV.
-# Used by all three modules (scene, reading, currency).
+# modules/scene/camera.py — Shared always-on camera frame service.
+# Used by all three modules (scene, reading, currency) and the /api/camera stream.
+#
+# One background thread owns the device and keeps a ring buffer of recent
+# timestamped frames, so callers never pay the open + warmup cost themselves.
+# Frames live in a preallocated, fixed-size block of numpy buffers and are
+# handed out as views — encoding happens only for the frame sent to the VLM.
 
-import cv2
+import threading
 import time
+from collections import deque
+from typing import List, NamedTuple, Optional
+
+import cv2
+import numpy as np
+
 from utils.logger import logger
+from utils.timing import span
 from utils.image_utils import frame_to_base64, resize_frame
-from config import CAMERA_INDEX, CAMERA_WARMUP_MS
+from config import (
+    CAMERA_INDEX, CAMERA_WARMUP_MS, CAMERA_BUFFER_SIZE, CAMERA_FRAME_TIMEOUT
+)
 
 
-def capture_frame_as_base64() -> str:
+class Frame(NamedTuple):
+    """
+    One captured frame plus its capture sequence number and timestamp.
+    `image` is a view into the ring buffer — it stays valid for roughly
+    CAMERA_BUFFER_SIZE newer frames. Call .copy() to keep it longer.
     """
-    Open camera → wait for warmup → capture one frame → encode to base64.
+    seq:       int
+    timestamp: float
+    image:     np.ndarray
 
-    Returns:
-        base64 JPEG string ready for GPT-4o Vision API.
+    def copy(self) -> "Frame":
+        return self._replace(image=self.image.copy())
 
-    Raises:
-        RuntimeError: if camera cannot be opened or frame capture fails.
+
+class CameraService:
     """
-    logger.debug(f"Opening camera (index {CAMERA_INDEX})...")
-    cam = cv2.VideoCapture(CAMERA_INDEX)
+    Owns the camera in a background thread and keeps the last
+    CAMERA_BUFFER_SIZE frames in a ring buffer.
+    Usage: get_camera().latest().image
+    """
+
+    def __init__(self, index: int = CAMERA_INDEX, buffer_size: int = CAMERA_BUFFER_SIZE):
+        self.index     = index
+        self.size      = buffer_size
+        self._buffers: Optional[np.ndarray] = None   # (size, h, w, 3) uint8, allocated on first frame
+        self._frames   = deque(maxlen=buffer_size)
+        self._cond     = threading.Condition()
+        self._stop_evt = threading.Event()
+        self._thread   = None
+        self._seq      = 0
+        self._error: Optional[str] = None
+
+    # ── lifecycle ─────────────────────────────────────
+    def start(self):
+        """Start the capture thread (no-op if already running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_evt.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="camera")
+        self._thread.start()
+
+    def stop(self):
+        """Stop the capture thread and release the device."""
+        self._stop_evt.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _open(self):
+        with span("camera_open"):
+            cam = cv2.VideoCapture(self.index)
+            if not cam.isOpened():
+                cam.release()
+                return None
+
+            # Warm up once — first frames from webcams are often dark or blurry
+            time.sleep(CAMERA_WARMUP_MS / 1000.0)
+            for _ in range(3):
+                cam.read()
+            return cam
+
+    def _run(self):
+        logger.debug(f"Opening camera (index {self.index})...")
+
+        while not self._stop_evt.is_set():
+            cam = self._open()
+            if cam is None:
+                self._error = (
+                    "Camera not found. Please check your camera is connected "
+                    "and not used by another app."
+                )
+                logger.error(self._error)
+                with self._cond:
+                    self._cond.notify_all()
+                self._stop_evt.wait(2.0)
+                continue
+
+            self._error = None
+            logger.info("Camera service started ✓")
+
+            while not self._stop_evt.is_set():
+                seq  = self._seq + 1
+                slot = self._claim_slot(seq)
+                ret, frame = cam.read(slot) if slot is not None else cam.read()
+                if not ret or frame is None:
+                    logger.warning("Camera returned empty frame — reopening")
+                    break
+
+                image = self._store(seq, frame)
+
+                with self._cond:
+                    self._seq = seq
+                    self._frames.append(Frame(seq, time.time(), image))
+                    self._cond.notify_all()
 
-    if not cam.isOpened():
-        cam.release()
-        raise RuntimeError(
-            "Camera not found. Please check your camera is connected and not used by another app."
-        )
+            cam.release()
 
-    # Warm up — first frames from webcams are often dark or blurry
-    time.sleep(CAMERA_WARMUP_MS / 1000.0)
+        logger.info("Camera released ✓")
 
-    # Discard a few frames to let auto-exposure settle
-    for _ in range(3):
-        cam.read()
+    # ── ring buffer ───────────────────────────────────
+    def _claim_slot(self, seq: int) -> Optional[np.ndarray]:
+        """
+        Retire the frame that currently occupies this sequence's slot and
+        return the slot so the camera can decode straight into it.
+        """
+        if self._buffers is None:
+            return None
 
-    ret, frame = cam.read()
-    cam.release()
+        with self._cond:
+            if len(self._frames) == self.size:
+                self._frames.popleft()
+        return self._buffers[seq % self.size]
 
-    if not ret or frame is None:
-        raise RuntimeError("Camera opened but could not capture a frame. Please try again.")
+    def _store(self, seq: int, frame: np.ndarray) -> np.ndarray:
+        """Make sure `frame` lives in its ring slot; (re)allocate on first frame or resolution change."""
+        if self._buffers is None or self._buffers.shape[1:] != frame.shape:
+            with self._cond:
+                self._frames.clear()
+                self._buffers = np.empty((self.size,) + frame.shape, dtype=np.uint8)
+            logger.debug(f"Camera ring buffer allocated: {self.size} x {frame.shape}")
+
+        slot = self._buffers[seq % self.size]
+        if frame.__array_interface__["data"][0] != slot.__array_interface__["data"][0]:
+            np.copyto(slot, frame)
+        return slot
+
+    # ── consumers ─────────────────────────────────────
+    def wait_next(self, after_seq: int = 0, timeout: float = CAMERA_FRAME_TIMEOUT) -> Optional[Frame]:
+        """
+        Block until a frame newer than `after_seq` is available.
+        Returns None on timeout.
+        """
+        self.start()
+        deadline = time.time() + timeout
+
+        with self._cond:
+            while not self._frames or self._frames[-1].seq <= after_seq:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return self._frames[-1]
+
+    def latest(self, timeout: float = CAMERA_FRAME_TIMEOUT) -> Frame:
+        """
+        Most recent frame. Waits for the first frame if the camera is still warming up.
+
+        Raises:
+            RuntimeError: if no frame arrives within `timeout`.
+        """
+        frame = self.wait_next(0, timeout)
+        if frame is None:
+            raise RuntimeError(self._error or "Camera opened but could not capture a frame. Please try again.")
+        return frame
+
+    def recent(self, count: int = 3, spacing: float = 0.0,
+               timeout: float = CAMERA_FRAME_TIMEOUT) -> List[Frame]:
+        """
+        Up to `count` recent frames, newest first, at least `spacing` seconds apart.
+
+        Raises:
+            RuntimeError: if no frame arrives within `timeout`.
+        """
+        self.latest(timeout)
+
+        with self._cond:
+            frames = list(self._frames)
+
+        picked = []
+        for frame in reversed(frames):
+            if picked and picked[-1].timestamp - frame.timestamp < spacing:
+                continue
+            picked.append(frame)
+            if len(picked) == count:
+                break
+        return picked
+
+
+# ── shared instance ───────────────────────────────────
+_camera: Optional[CameraService] = None
+_camera_lock = threading.Lock()
+
+
+def get_camera() -> CameraService:
+    """Return the process-wide camera service, starting it on first use."""
+    global _camera
+
+    with _camera_lock:
+        if _camera is None:
+            _camera = CameraService()
+        _camera.start()
+        return _camera
+
+
+def capture_frame_as_base64() -> str:
+    """
+    Grab the latest frame from the shared camera → encode to base64.
+
+    Returns:
+        base64 JPEG string ready for the Vision API.
+
+    Raises:
+        RuntimeError: if the camera is unavailable or no frame arrives in time.
+    """
+    frame = get_camera().latest().image
 
     # Resize if too large (keeps API cost low, speeds up upload)
     frame = resize_frame(frame, max_width=1024)
     b64   = frame_to_base64(frame, quality=85)
 
     logger.debug("Frame captured successfully ✓")
-    return b64
\ No newline at end of file
+    return b64
@@ -1,46 +1,62 @@
 # modules/scene/scene_module.py
 # Scene tool → returns structured awareness (NOT narration)
 
-import cv2
 import json
 import re
-import time
-from modules.scene.vlm_client import VLMClient
+from modules.scene.camera import get_camera
+from modules.scene.vlm_client import get_vlm_client
+from core.executors import MODULE_EXECUTOR, run_blocking
 from utils.logger import logger
 from utils.image_utils import frame_to_base64, resize_frame
-from config import CAMERA_INDEX
+from utils.timing import span
+from utils.text_utils import split_sentences
+
+# "context" comes first so streaming can start speaking before the lists are generated
+PERCEPTION_PROMPT = """
+Analyze the scene carefully and return rich, descriptive structured awareness.
+
+Instructions:
+- "context": write 1-2 full sentences describing the overall environment — lighting, room type, mood, and notable features
+- "obstacles": list anything that could block movement (e.g. "a step", "a bag on the floor")
+- "near": list objects/people close to the camera with brief descriptors (e.g. "a wooden chair", "a person in a red shirt")
+- "in_hand": list items visibly held or gripped by the person
+- "confidence": float 0.0 to 1.0
+
+Be specific and descriptive. Avoid vague terms like "object" or "thing".
+If unsure about lists, leave them empty — but always fill "context" with your best observation.
+
+Respond strictly in this JSON format with no extra text:
+{"context": "", "obstacles": [], "near": [], "in_hand": [], "confidence": 0.0}
+"""
+
+# A fully closed "context": "..." value inside a partial JSON stream
+_CONTEXT_RE = re.compile(r'"context"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def _json_string(body: str) -> str:
+    """Unescape a streamed JSON string body; raw control characters or bad escapes fall back to the text."""
+    try:
+        return json.loads(f'"{body}"', strict=False)
+    except ValueError:
+        return body
 
 
 class SceneModule:
 
     def __init__(self):
-        self.vlm = VLMClient()
+        self.vlm = get_vlm_client()
 
     def _capture_frames(self, count: int = 3) -> list:
-        """Open camera ONCE and capture all frames — avoids 6s warmup per frame."""
-        frames = []
-        cam = cv2.VideoCapture(CAMERA_INDEX)
-
-        if not cam.isOpened():
-            cam.release()
-            raise RuntimeError("Camera not found.")
-
-        # Warmup once only
-        time.sleep(0.5)
-        for _ in range(3):
-            cam.read()  # discard first few dark frames
-
-        for i in range(count):
-            ret, frame = cam.read()
-            if ret and frame is not None:
-                frame = resize_frame(frame, max_width=1024)
-                frames.append(frame_to_base64(frame, quality=85))
-                logger.debug(f"Frame {i + 1}/{count} captured ✓")
-            time.sleep(0.2)  # small gap between frames
-
-        cam.release()
+        """Raw recent frames from the shared camera — no per-request open/warmup."""
+        with span("camera_capture"):
+            frames = [f.image for f in get_camera().recent(count, spacing=0.2)]
+        logger.debug(f"{len(frames)}/{count} frames captured ✓")
         return frames
 
+    def _encode(self, frame) -> str:
+        """Only the frame that goes to the VLM is resized and encoded."""
+        return frame_to_base64(resize_frame(frame, max_width=1024), quality=85)
+
     def _parse_scene_json(self, raw: str) -> dict:
         """Robustly extract JSON from VLM output, handling markdown fences."""
         text = re.sub(r"```(?:json)?", "", raw).strip().rstrip("`").strip()
@@ -49,46 +65,24 @@ class SceneModule:
             return json.loads(match.group())
         raise ValueError("No JSON found in VLM output")
 
-    def run(self) -> str:
-        """
-        Scene perception tool.
-        Returns a spoken string describing the scene.
-        """
-        logger.info("SceneModule.run() | capturing multiple frames")
+    def _first_frame(self):
+        """Encode the freshest frame. Returns (b64, None) or (None, error message)."""
+        logger.info("SceneModule | capturing multiple frames")
 
-        # ── Step 1 — Capture all frames with ONE camera open ──
+        # ── Step 1 — Take frames from the shared camera ──
         try:
             frames = self._capture_frames(3)
         except RuntimeError as e:
             logger.error(f"Camera error: {e}")
-            return "I could not access the camera."
+            return None, "I could not access the camera."
 
         if not frames:
-            return "I could not capture any frames from the camera."
+            return None, "I could not capture any frames from the camera."
 
-        # ── Step 2 — Perception prompt ──
-        perception_prompt = """
-Analyze the scene carefully and return rich, descriptive structured awareness.
-
-Instructions:
-- "near": list objects/people close to the camera with brief descriptors (e.g. "a wooden chair", "a person in a red shirt")
-- "in_hand": list items visibly held or gripped by the person
-- "obstacles": list anything that could block movement (e.g. "a step", "a bag on the floor")
-- "context": write 1-2 full sentences describing the overall environment — lighting, room type, mood, and notable features
-- "confidence": float 0.0 to 1.0
+        return self._encode(frames[0]), None
 
-Be specific and descriptive. Avoid vague terms like "object" or "thing".
-If unsure about lists, leave them empty — but always fill "context" with your best observation.
-
-Respond strictly in this JSON format with no extra text:
-{"near": [], "in_hand": [], "obstacles": [], "context": "", "confidence": 0.0}
-"""
-
-        # ── Step 3 — Call VLM with first frame ──
-        raw_output = self.vlm.describe(frames[0], perception_prompt)
-        logger.debug(f"Raw perception output: {raw_output[:200]}")
-
-        # ── Step 4 — Parse JSON ──
+    def _to_scene_data(self, raw_output: str) -> dict:
+        """Parse VLM JSON, falling back to treating the raw text as context."""
         try:
             scene_data = self._parse_scene_json(raw_output)
             scene_data.setdefault("near", [])
@@ -108,12 +102,71 @@ Respond strictly in this JSON format with no extra text:
             }
 
         logger.info(f"Scene awareness: {scene_data}")
+        return scene_data
 
-        # ── Step 5 — Convert dict → spoken string ──
-        return self._to_speech(scene_data)
+    def run(self) -> str:
+        """
+        Scene perception tool.
+        Returns a spoken string describing the scene.
+        """
+        frame, error = self._first_frame()
+        if error:
+            return error
 
-    def _to_speech(self, data: dict) -> str:
-        """Convert structured scene dict into a natural spoken sentence."""
+        # ── Step 2 — Call VLM with first frame ──
+        raw_output = self.vlm.describe(frame, PERCEPTION_PROMPT)
+        logger.debug(f"Raw perception output: {raw_output[:200]}")
+
+        # ── Step 3 — Parse JSON → spoken string ──
+        return self._to_speech(self._to_scene_data(raw_output))
+
+    async def arun(self) -> str:
+        """Async run(): frame grab + encode on the module executor, VLM call awaited."""
+        frame, error = await run_blocking(MODULE_EXECUTOR, self._first_frame)
+        if error:
+            return error
+
+        raw_output = await self.vlm.adescribe(frame, PERCEPTION_PROMPT)
+        logger.debug(f"Raw perception output: {raw_output[:200]}")
+
+        return self._to_speech(self._to_scene_data(raw_output))
+
+    def run_streaming(self, speaker) -> str:
+        """
+        Like run(), but starts speaking "context" the moment its JSON string
+        closes in the token stream; the remaining fields follow once parsed.
+        Everything returned has already been spoken.
+        """
+        frame, error = self._first_frame()
+        if error:
+            speaker.speak(error)
+            return error
+
+        def sentences():
+            raw = ""
+            context_spoken = False
+
+            for delta in self.vlm.describe_stream(frame, PERCEPTION_PROMPT):
+                raw += delta
+                if not context_spoken:
+                    match = _CONTEXT_RE.search(raw)
+                    if match:
+                        context_spoken = True
+                        yield from split_sentences(_json_string(match.group(1)))
+
+            logger.debug(f"Raw perception output: {raw[:200]}")
+            scene_data = self._to_scene_data(raw)
+
+            if context_spoken:
+                scene_data["context"] = ""
+                yield from self._speech_parts(scene_data)
+            else:
+                yield from split_sentences(self._to_speech(scene_data))
+
+        return speaker.speak_stream(sentences())
+
+    def _speech_parts(self, data: dict) -> list:
+        """Structured scene dict → list of natural spoken sentences."""
         parts = []
 
         context = data.get("context", "").strip()
@@ -135,7 +188,13 @@ Respond strictly in this JSON format with no extra text:
         if obstacles:
             parts.append(f"Please be careful — I notice {', '.join(obstacles)} that could be in your way.")
 
+        return parts
+
+    def _to_speech(self, data: dict) -> str:
+        """Convert structured scene dict into a natural spoken sentence."""
+        parts = self._speech_parts(data)
+
         if not parts:
             return "I can see the scene but could not make out anything clearly right now."
 
-        return " ".join(parts)
\ No newline at end of file
+        return " ".join(parts)
@@ -63,11 +63,16 @@
 
 # modules/scene/vlm_client.py
 
-from groq import Groq
+import threading
+from typing import Iterator, Optional
+from groq import Groq, AsyncGroq
 from utils.logger import logger
+from utils.timing import span, record_span
 from config import GROQ_API_KEY, VLM_MODEL, VLM_MAX_TOKENS
 import time
 
+VLM_ERROR_MESSAGE = "I was unable to analyse the image right now. Please try again."
+
 
 class VLMClient:
     """
@@ -76,39 +81,44 @@ class VLMClient:
     """
 
     def __init__(self):
-        self.client = Groq(api_key=GROQ_API_KEY)
-        self.model  = VLM_MODEL
+        self.client  = Groq(api_key=GROQ_API_KEY)
+        self.aclient = AsyncGroq(api_key=GROQ_API_KEY)
+        self.model   = VLM_MODEL
         logger.debug(f"VLMClient ready — model: {self.model}")
 
-    def describe(self, image_b64: str, prompt: str) -> str:
+    def _messages(self, image_b64: str, prompt: str) -> list:
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:image/jpeg;base64,{image_b64}"
+                        }
+                    },
+                    {
+                        "type": "text",
+                        "text": prompt
+                    }
+                ]
+            }
+        ]
+
+    def describe(self, image_b64: str, prompt: str, max_tokens: Optional[int] = None) -> str:
 
         logger.debug(f"Calling Groq Vision ({self.model})...")
 
         start = time.time()
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                max_tokens=VLM_MAX_TOKENS,
-                timeout=30,   # prevents long blocking
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{image_b64}"
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": prompt
-                            }
-                        ]
-                    }
-                ]
-            )
+            with span("vlm"):
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    max_tokens=max_tokens or VLM_MAX_TOKENS,
+                    timeout=30,   # prevents long blocking
+                    messages=self._messages(image_b64, prompt)
+                )
 
             latency = time.time() - start
             logger.debug(f"VLM latency: {latency:.2f}s")
@@ -122,4 +132,85 @@ class VLMClient:
 
         except Exception as e:
             logger.error(f"Groq Vision API call failed: {e}")
-            return "I was unable to analyse the image right now. Please try again."
\ No newline at end of file
+            return VLM_ERROR_MESSAGE
+
+    async def adescribe(self, image_b64: str, prompt: str, max_tokens: Optional[int] = None) -> str:
+        """Async describe() — awaits Groq without tying up a thread."""
+        logger.debug(f"Calling Groq Vision async ({self.model})...")
+
+        start = time.time()
+
+        try:
+            with span("vlm"):
+                response = await self.aclient.chat.completions.create(
+                    model=self.model,
+                    max_tokens=max_tokens or VLM_MAX_TOKENS,
+                    timeout=30,
+                    messages=self._messages(image_b64, prompt)
+                )
+
+            logger.debug(f"VLM latency: {time.time() - start:.2f}s")
+
+            result = response.choices[0].message.content if response.choices else ""
+            result = (result or "").strip()
+
+            logger.debug(f"VLM response: '{result[:100]}'")
+
+            return result
+
+        except Exception as e:
+            logger.error(f"Groq Vision async call failed: {e}")
+            return VLM_ERROR_MESSAGE
+
+    def describe_stream(self, image_b64: str, prompt: str,
+                        max_tokens: Optional[int] = None) -> Iterator[str]:
+        """
+        Same as describe(), but yields text deltas as the model generates them.
+        On failure yields the spoken error message (once, if nothing was produced yet).
+        """
+        logger.debug(f"Streaming Groq Vision ({self.model})...")
+
+        start    = time.time()
+        started  = time.perf_counter()
+        produced = False
+
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                max_tokens=max_tokens or VLM_MAX_TOKENS,
+                timeout=30,
+                stream=True,
+                messages=self._messages(image_b64, prompt)
+            )
+
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                if not produced:
+                    logger.debug(f"VLM first token: {time.time() - start:.2f}s")
+                    record_span("vlm_first_token", started)
+                    produced = True
+                yield delta
+
+            logger.debug(f"VLM latency: {time.time() - start:.2f}s")
+            # Includes time the consumer spent between chunks — the stream is pulled lazily
+            record_span("vlm_stream", started)
+
+        except Exception as e:
+            logger.error(f"Groq Vision streaming call failed: {e}")
+            if not produced:
+                yield VLM_ERROR_MESSAGE
+
+
+_shared      = None
+_shared_lock = threading.Lock()
+
+
+def get_vlm_client() -> VLMClient:
+    """Process-wide VLMClient — the Groq / AsyncGroq clients and their connection pools are reused."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = VLMClient()
+    return _shared
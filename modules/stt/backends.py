@@ -0,0 +1,303 @@
+# modules/stt/backends.py — Pluggable speech-to-text engines + latency/health-aware routing.
+#
+#   router = get_stt_router()
+#   text = router.transcribe(audio_16k)       # float32 mono at STT_RATE
+#   text = router.transcribe_file(path)       # browser upload (webm / ogg / wav …)
+#   text = router.transcribe_partial(audio_16k, cancelled)   # speech still in progress
+#
+# GroqBackend uploads to hosted whisper-large-v3 (best Hindi / Hinglish accuracy).
+# LocalWhisperBackend runs faster-whisper on-device (WHISPER_MODEL, int8) — no network.
+# In "auto" mode Groq is preferred for accuracy; a clip goes local first only when the
+# measured local speed (real-time factor × length) beats Groq's recent average — for short
+# commands when that also fits STT_LATENCY_BUDGET_MS, for longer ones when Groq is over it.
+# Repeated Groq failures switch everything to the local engine for STT_REMOTE_RETRY_AFTER seconds.
+
+import io
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional
+
+import numpy as np
+import soundfile as sf
+from groq import Groq
+
+from utils.logger import logger
+from utils.timing import span
+from config import (
+    GROQ_API_KEY, STT_RATE, STT_UPLOAD_FORMAT,
+    WHISPER_MODEL, WHISPER_DEVICE, WHISPER_COMPUTE_TYPE, WHISPER_BEAM_SIZE, WHISPER_VAD_FILTER,
+    STT_BACKEND, STT_LATENCY_BUDGET_MS, STT_LOCAL_MAX_SECONDS, STT_REMOTE_TIMEOUT,
+    STT_REMOTE_MAX_MISSES, STT_REMOTE_RETRY_AFTER
+)
+
+# soundfile (format, subtype), upload filename, mime
+_UPLOAD_FORMATS = {
+    "flac": ("FLAC", "PCM_16", "audio.flac", "audio/flac"),
+    "opus": ("OGG",  "OPUS",   "audio.ogg",  "audio/ogg"),
+}
+
+# Browser recording extension → Groq-accepted mime type
+_FILE_MIME = {
+    'webm': 'audio/webm',
+    'ogg':  'audio/ogg',
+    'mp4':  'audio/mp4',
+    'wav':  'audio/wav',
+    'mp3':  'audio/mpeg',
+    'flac': 'audio/flac',
+}
+
+
+class STTBackend(ABC):
+    """Interface — raise on engine / network failure, return "" when nothing was said."""
+
+    name = "base"
+
+    @property
+    def ready(self) -> bool:
+        return True
+
+    @abstractmethod
+    def transcribe(self, audio: np.ndarray) -> str:
+        ...
+
+    @abstractmethod
+    def transcribe_file(self, path: str) -> str:
+        ...
+
+
+class GroqBackend(STTBackend):
+    name = "groq"
+
+    def __init__(self, model: str = "whisper-large-v3"):
+        self.model  = model
+        # Retries are the router's job — a dead network must fail fast, not back off 3×
+        self.client = Groq(api_key=GROQ_API_KEY, timeout=STT_REMOTE_TIMEOUT, max_retries=0)
+
+    def _create(self, file) -> str:
+        with span("stt_upload"):
+            transcription = self.client.audio.transcriptions.create(
+                file=file,
+                model=self.model,
+                language=None,          # auto-detect Hindi / English / Hinglish
+                response_format="text"
+            )
+        return transcription.strip() if transcription else ""
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        fmt, subtype, filename, mime = _UPLOAD_FORMATS.get(STT_UPLOAD_FORMAT, _UPLOAD_FORMATS["flac"])
+        with span("resample_encode"):
+            buffer = io.BytesIO()
+            sf.write(buffer, audio, STT_RATE, format=fmt, subtype=subtype)
+            buffer.seek(0)
+
+        logger.debug(f"Sending {buffer.getbuffer().nbytes // 1024} KB mic audio ({fmt}) to Groq Whisper…")
+        return self._create((filename, buffer, mime))
+
+    def transcribe_file(self, path: str) -> str:
+        ext  = path.rsplit('.', 1)[-1].lower() if '.' in path else 'webm'
+        mime = _FILE_MIME.get(ext, 'audio/webm')
+        with open(path, 'rb') as f:
+            raw_bytes = f.read()
+
+        logger.debug(f"Sending {len(raw_bytes)//1024} KB ({mime}) to Groq Whisper…")
+        return self._create((f"recording.{ext}", raw_bytes, mime))
+
+
+class LocalWhisperBackend(STTBackend):
+    """faster-whisper on-device. load() once at startup; not ready until it has succeeded."""
+
+    name = "local"
+
+    def __init__(self,
+                 model_size: str = WHISPER_MODEL,
+                 device: str = WHISPER_DEVICE,
+                 compute_type: str = WHISPER_COMPUTE_TYPE,
+                 beam_size: int = WHISPER_BEAM_SIZE,
+                 vad_filter: bool = WHISPER_VAD_FILTER):
+        self.model_size   = model_size
+        self.device       = device
+        self.compute_type = compute_type
+        self.beam_size    = beam_size
+        self.vad_filter   = vad_filter
+        self._model       = None
+        self._load_lock   = threading.Lock()
+        self._run_lock    = threading.Lock()     # one decode at a time — CPU-bound anyway
+
+    @property
+    def ready(self) -> bool:
+        return self._model is not None
+
+    @property
+    def busy(self) -> bool:
+        return self._run_lock.locked()
+
+    def load(self) -> bool:
+        with self._load_lock:
+            if self._model is None:
+                start = time.time()
+                try:
+                    from faster_whisper import WhisperModel
+                    self._model = WhisperModel(self.model_size, device=self.device,
+                                               compute_type=self.compute_type)
+                    logger.info(f"Local Whisper '{self.model_size}' ({self.compute_type}) ready ✓ "
+                                f"in {time.time() - start:.1f}s")
+                except Exception as e:
+                    logger.warning(f"Local Whisper unavailable: {type(e).__name__}: {e}")
+        return self.ready
+
+    def _run(self, source, cancelled: Optional[Callable[[], bool]] = None) -> str:
+        """
+        With `cancelled` the call is best-effort: it returns "" instead of waiting for
+        another decode, and stops between segments once cancelled() is True.
+        """
+        if not self.ready:
+            raise RuntimeError("local Whisper model is not loaded")
+        if not self._run_lock.acquire(blocking=cancelled is None):
+            return ""
+        try:
+            with span("stt_local"):
+                segments, _ = self._model.transcribe(
+                    source,
+                    beam_size=self.beam_size,
+                    vad_filter=self.vad_filter,
+                    language=None,
+                )
+                texts = []
+                for s in segments:             # decoding is lazy — runs as segments are read
+                    if cancelled is not None and cancelled():
+                        return ""
+                    texts.append(s.text.strip())
+                return " ".join(texts).strip()
+        finally:
+            self._run_lock.release()
+
+    def transcribe(self, audio: np.ndarray, cancelled: Optional[Callable[[], bool]] = None) -> str:
+        return self._run(np.asarray(audio, dtype=np.float32), cancelled)
+
+    def transcribe_file(self, path: str) -> str:
+        return self._run(path)
+
+
+class STTRouter:
+    """
+    Picks an engine per utterance and falls back to the other one on failure.
+    Expected latency: Groq = rolling average of recent requests; local = measured
+    real-time factor × utterance length.
+    """
+
+    def __init__(self,
+                 mode: str = STT_BACKEND,
+                 budget_ms: float = STT_LATENCY_BUDGET_MS,
+                 local_max_seconds: float = STT_LOCAL_MAX_SECONDS,
+                 max_misses: int = STT_REMOTE_MAX_MISSES,
+                 retry_after: float = STT_REMOTE_RETRY_AFTER):
+        self.mode              = mode
+        self.budget_ms         = budget_ms
+        self.local_max_seconds = local_max_seconds
+        self.max_misses        = max_misses
+        self.retry_after       = retry_after
+
+        self.remote = GroqBackend()
+        self.local  = LocalWhisperBackend()
+
+        self._misses      = 0
+        self._backoff_end = 0.0
+        self._remote_ms   = None     # EMA of Groq wall time
+        self._local_rtf   = 0.5      # EMA of local seconds per audio second
+
+    @property
+    def remote_available(self) -> bool:
+        return time.monotonic() >= self._backoff_end
+
+    def preload(self):
+        if self.mode in ("auto", "local"):
+            self.local.load()
+
+    def _order(self, duration: Optional[float]) -> List[STTBackend]:
+        local_ok = self.local.ready
+        if self.mode == "local":
+            return [self.local]
+        if self.mode == "groq" or not local_ok:
+            return [self.remote] + ([self.local] if local_ok else [])
+        if not self.remote_available:
+            return [self.local]
+
+        if duration is not None:
+            short    = duration <= self.local_max_seconds
+            local_ms = self._local_rtf * duration * 1000
+            if self._remote_ms is None:
+                local_first = short and local_ms <= self.budget_ms
+            else:
+                # Groq is the more accurate engine on Hinglish — local must also be faster
+                local_first = local_ms < self._remote_ms and (
+                    self._remote_ms > self.budget_ms or (short and local_ms <= self.budget_ms))
+            # A partial still decoding holds the local engine — don't queue behind it
+            if local_first and not self.local.busy:
+                return [self.local, self.remote]
+        return [self.remote, self.local]
+
+    def _record(self, backend: STTBackend, elapsed: float, duration: Optional[float]):
+        if backend is self.remote:
+            self._misses = 0
+            ms = elapsed * 1000
+            self._remote_ms = ms if self._remote_ms is None else 0.7 * self._remote_ms + 0.3 * ms
+        elif duration:
+            self._local_rtf = 0.7 * self._local_rtf + 0.3 * (elapsed / duration)
+
+    def _miss(self, reason: str):
+        self._misses += 1
+        if self._misses >= self.max_misses:
+            self._backoff_end = time.monotonic() + self.retry_after
+            self._misses = 0
+            logger.warning(f"Groq Whisper {reason} {self.max_misses}× — "
+                           f"using local STT for {self.retry_after:.0f}s")
+
+    def _dispatch(self, call, duration: Optional[float]) -> str:
+        for backend in self._order(duration):
+            start = time.perf_counter()
+            try:
+                text = call(backend)
+            except Exception as e:
+                logger.error(f"STT backend '{backend.name}' failed: {type(e).__name__}: {e}")
+                if backend is self.remote:
+                    self._miss(f"failed ({type(e).__name__})")
+                continue
+
+            self._record(backend, time.perf_counter() - start, duration)
+            logger.debug(f"STT via {backend.name}: {(time.perf_counter() - start) * 1000:.0f} ms")
+            return text
+        return ""
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        """audio: float32 mono at STT_RATE."""
+        return self._dispatch(lambda b: b.transcribe(audio), len(audio) / STT_RATE)
+
+    def transcribe_file(self, path: str) -> str:
+        return self._dispatch(lambda b: b.transcribe_file(path), None)
+
+    def transcribe_partial(self, audio: np.ndarray, cancelled: Callable[[], bool]) -> str:
+        """
+        Best-effort transcript of speech still in progress: one engine, no fallback, and
+        no health / latency bookkeeping — a failed or rate-limited partial must never push
+        the final transcription onto the local engine. Skipped once cancelled() is True.
+        """
+        if cancelled():
+            return ""
+        backend = self._order(len(audio) / STT_RATE)[0]
+        if backend is self.local:
+            return self.local.transcribe(audio, cancelled=cancelled)
+        return backend.transcribe(audio)
+
+
+_router      = None
+_router_lock = threading.Lock()
+
+
+def get_stt_router() -> STTRouter:
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = STTRouter()
+            logger.info(f"STT router ready ✓ (mode: {_router.mode})")
+    return _router
@@ -0,0 +1,139 @@
+# modules/stt/barge_in.py — Interrupt the assistant while it is talking.
+#
+#   detector = BargeInDetector(on_barge_in=speaker.cancel, confirm=is_stop_command)
+#   detector.start()
+#   ...
+#   listen(since=detector.take_onset())   # pick up what the user said while interrupting
+#
+# Runs on the shared mic stream next to listen(). While nothing is playing it only feeds
+# the VAD (one 320-point FFT per 20 ms) so the noise floor stays current. During playback,
+# blocks the echo gate attributes to the user count towards BARGE_IN_MIN_SPEECH_MS:
+#   "keyword" — (default) up to BARGE_IN_KEYWORD_MAX_S of it is transcribed and on_barge_in()
+#               fires only when confirm(text) agrees, so a bystander talking over playback
+#               neither cuts it off nor has their words taken as the next command. Latency
+#               is then that of the STT engine, not 200 ms.
+#   "voice"   — on_barge_in() fires as soon as that much user speech is heard (~150 ms);
+#               only sensible in a quiet room.
+# The onset handed to listen() is only set once the barge-in has fired.
+
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+
+from utils.logger import logger
+from tts.speaker import is_speaking
+from config import (
+    STT_RATE, BARGE_IN_MODE, BARGE_IN_MIN_SPEECH_MS, BARGE_IN_KEYWORD_MAX_S, VAD_HANGOVER_MS
+)
+from .backends import get_stt_router
+from .mic import get_mic
+from .vad import VoiceActivityDetector
+
+MAX_GAP_FRAMES = 1     # one non-speech frame inside a barge-in run is tolerated
+
+
+class BargeInDetector:
+    def __init__(self,
+                 on_barge_in: Callable[[], None],
+                 confirm: Optional[Callable[[str], bool]] = None,
+                 mode: str = BARGE_IN_MODE,
+                 min_speech_ms: float = BARGE_IN_MIN_SPEECH_MS,
+                 keyword_max_s: float = BARGE_IN_KEYWORD_MAX_S):
+        self.on_barge_in = on_barge_in
+        self.confirm     = confirm
+        self.keyword     = mode == "keyword" and confirm is not None
+        self.vad         = VoiceActivityDetector(STT_RATE)
+        self.min_frames  = max(1, int(min_speech_ms / 1000 * STT_RATE / self.vad.frame_samples))
+        self.max_samples = int(keyword_max_s * STT_RATE)
+        self.end_frames  = max(1, int(VAD_HANGOVER_MS / 1000 * STT_RATE / self.vad.frame_samples))
+        self._onset      = None
+        self._thread     = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name="barge-in")
+            self._thread.start()
+
+    def take_onset(self) -> Optional[float]:
+        """Monotonic time the last barge-in started (once) — for listen(since=...)."""
+        onset, self._onset = self._onset, None
+        return onset
+
+    def _frame(self, chunk: np.ndarray) -> np.ndarray:
+        """Resampled blocks can be a sample off the VAD frame size — trim / pad to fit."""
+        n = self.vad.frame_samples
+        if len(chunk) == n:
+            return chunk
+        return chunk[:n] if len(chunk) > n else np.pad(chunk, (0, n - len(chunk)))
+
+    def _run(self):
+        run, gap, started, heard = 0, 0, None, []
+        collected, silence = [], 0
+        fired = False            # already handled this utterance of the assistant
+
+        with get_mic().subscribe() as frames:
+            while True:
+                item = frames.get(timeout=1.0)
+                if item is None:
+                    continue
+
+                chunk, echo, captured = item
+                speaking = is_speaking()
+                if not speaking:
+                    fired = False
+                if echo:
+                    continue
+                speech = self.vad.is_speech(self._frame(chunk))
+
+                if not speaking or fired:
+                    run, gap, started, heard, collected, silence = 0, 0, None, [], [], 0
+                    continue
+
+                # Keyword mode, already triggered: gather the command until a pause or the cap
+                if collected:
+                    collected.append(chunk)
+                    silence = 0 if speech else silence + 1
+                    if silence >= self.end_frames or sum(map(len, collected)) >= self.max_samples:
+                        fired = self._confirm(np.concatenate(collected), started)
+                        frames.clear()           # audio queued while transcribing is stale
+                        run, gap, started, heard, collected, silence = 0, 0, None, [], [], 0
+                    continue
+
+                if speech:
+                    started = started or captured
+                    run, gap = run + 1, 0
+                elif started is not None:
+                    gap += 1
+                    if gap > MAX_GAP_FRAMES:
+                        run, gap, started, heard = 0, 0, None, []
+                if started is not None:
+                    heard.append(chunk)
+                if run < self.min_frames:
+                    continue
+
+                if self.keyword:
+                    collected = heard
+                else:
+                    fired = True
+                    self._fire(started, "speech over playback")
+
+    def _fire(self, started: float, reason: str):
+        self._onset = started
+        logger.debug(f"Barge-in ({reason}) — interrupting speech")
+        try:
+            self.on_barge_in()
+        except Exception as e:
+            logger.error(f"Barge-in handler failed: {e}")
+
+    def _confirm(self, audio: np.ndarray, started: float) -> bool:
+        try:
+            text = get_stt_router().transcribe(audio)
+        except Exception as e:
+            logger.debug(f"Barge-in transcription failed: {e}")
+            return False
+        if not text or not self.confirm(text):
+            logger.debug(f"Barge-in ignored: '{text}'")
+            return False
+        self._fire(started, f"'{text}'")
+        return True
@@ -0,0 +1,80 @@
+# modules/stt/echo.py — Tell the assistant's own voice apart from the user's.
+#
+# Not a full acoustic echo canceller: the playback signal is known (Speaker publishes
+# the clip on the speaker via playback_reference()), so each mic frame is compared with
+# the loudest reference energy in the last ECHO_MAX_DELAY_MS. The speaker → mic gain
+# ("coupling") is learned while the assistant talks alone; a frame is the user only when
+# it beats the expected echo by ECHO_MARGIN_DB (double-talk). Cheap enough to run on
+# every 20 ms frame.
+
+import numpy as np
+
+from tts.speaker import playback_reference
+from config import (
+    STT_RATE, ECHO_MAX_DELAY_MS, ECHO_TAIL_MS, ECHO_MARGIN_DB, ECHO_INITIAL_COUPLING_DB
+)
+
+SILENT_REF_DB  = -50.0          # quieter reference than this can't be heard — nothing to learn
+COUPLING_RANGE = (-40.0, 10.0)  # dB — clamp for the learned speaker → mic gain
+COUPLING_RATE  = 0.05           # EMA rate per echo-only frame
+_EPS           = 1e-10
+
+
+def _db(power: float) -> float:
+    return 10.0 * np.log10(power + _EPS)
+
+
+class EchoGate:
+    """
+    Usage: gate = EchoGate()
+           if gate.is_echo(frame, captured_at):   # monotonic time the frame was read
+               ...                                # assistant's own voice (or its room tail)
+    """
+
+    def __init__(self,
+                 max_delay_ms: float = ECHO_MAX_DELAY_MS,
+                 tail_ms: float = ECHO_TAIL_MS,
+                 margin_db: float = ECHO_MARGIN_DB,
+                 coupling_db: float = ECHO_INITIAL_COUPLING_DB):
+        self.max_delay    = max_delay_ms / 1000.0
+        self.tail         = tail_ms / 1000.0
+        self.margin_db    = margin_db
+        self.coupling_db  = coupling_db
+        self._last_ref_db = SILENT_REF_DB
+
+    def _reference_db(self, clip, t: float, frame_s: float) -> float:
+        """Loudest 20 ms block of the reference that could be reaching the mic at time t."""
+        samples, rate, started = clip
+        end   = int((t - started) * rate)
+        start = end - int((self.max_delay + frame_s) * rate)
+        seg   = samples[max(start, 0):max(end, 0)]
+
+        block = max(1, int(rate * 0.02))
+        usable = len(seg) - len(seg) % block
+        if usable == 0:
+            return SILENT_REF_DB - 1          # clip hasn't reached the speaker yet
+        blocks = seg[:usable].reshape(-1, block)
+        return _db(float((blocks * blocks).mean(axis=1).max()))
+
+    def is_echo(self, frame: np.ndarray, t: float) -> bool:
+        clip, last_end = playback_reference()
+        if clip is None:
+            if t - last_end > self.tail:
+                return False
+            ref_db = self._last_ref_db                  # reverb of the clip that just ended
+        else:
+            ref_db = self._reference_db(clip, t, len(frame) / STT_RATE)
+            self._last_ref_db = ref_db
+
+        if ref_db < SILENT_REF_DB:
+            return False
+
+        mic_db = _db(float(np.mean(frame * frame)))
+        if mic_db > ref_db + self.coupling_db + self.margin_db:
+            return False                                # louder than any echo could be — the user
+
+        if clip is not None:
+            measured = mic_db - ref_db
+            self.coupling_db += COUPLING_RATE * (measured - self.coupling_db)
+            self.coupling_db = float(np.clip(self.coupling_db, *COUPLING_RANGE))
+        return True
@@ -113,94 +113,113 @@
 #         return ""
 
 
+# modules/stt/listener.py — Mic capture + VAD; transcription via the STT router
+# (Groq's hosted Whisper, or faster-whisper on-device — see backends.py).
 
-# modules/stt/listener.py — Mic capture + Groq Whisper API (no local model needed)
-# Uses Groq's hosted Whisper — no PyTorch, no DLL issues, faster than local.
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 
-# modules/stt/listener.py — Mic capture + Groq Whisper API (no local model needed)
-# Uses Groq's hosted Whisper — no PyTorch, no DLL issues, faster than local.
-
-import io
 import numpy as np
-import sounddevice as sd
-import soundfile as sf
-from groq import Groq
 
 from utils.logger import logger
-from config import GROQ_API_KEY, SILENCE_THRESHOLD
+from utils.timing import span
+from config import STT_RATE, STT_STREAMING, STT_PARTIAL_INTERVAL, STT_PARTIAL_WINDOW
+from .backends import get_stt_router
+from .mic import get_mic
+from .resample import resample
+from .vad import UtteranceSegmenter
+
+# Partial transcriptions run here so the capture loop never waits on STT
+_partial_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt-partial")
 
-# Force correct sample rate matching AMD mic's native rate
-SAMPLE_RATE = 44100
-MIC_DEVICE  = 1   # Microphone Array (AMD Audio Device)
 
-# Groq client — loads instantly, no heavy model download
-_client = Groq(api_key=GROQ_API_KEY)
-logger.info("Groq Whisper STT client ready ✓")
+def _transcribe_partial(audio: np.ndarray, cancelled: Callable[[], bool]) -> str:
+    try:
+        return get_stt_router().transcribe_partial(audio, cancelled)
+    except Exception as e:
+        logger.debug(f"Partial transcription failed: {e}")
+        return ""
 
 
-def listen() -> str:
+def listen(on_partial: Optional[Callable[[str], bool]] = None, since: Optional[float] = None) -> str:
     """
-    Record from microphone until silence detected.
-    Send audio to Groq Whisper API for transcription.
+    Record from microphone until the VAD sees end-of-utterance.
+    Transcribe via the STT router (Groq Whisper or on-device faster-whisper).
     Handles Hindi / English / Hinglish automatically.
+
+    With on_partial (and STT_STREAMING), the last STT_PARTIAL_WINDOW seconds are
+    transcribed every STT_PARTIAL_INTERVAL seconds while the user is still talking and
+    each partial is passed to on_partial. If it returns True the caller has acted on
+    that partial — the rest of the utterance is drained without a final transcription
+    and "" is returned.
+
+    Audio comes from the shared mic stream; blocks the echo gate marks as the
+    assistant's own voice are skipped. `since` (monotonic time, e.g. a barge-in onset)
+    starts from recently captured audio instead of from now.
     """
     logger.info("🎙️  Listening... (speak now)")
 
-    audio_chunks     = []
-    silence_chunks   = 0
-    chunk_duration   = 0.5
-    chunk_samples    = int(SAMPLE_RATE * chunk_duration)
-    max_silence      = max(int(SILENCE_THRESHOLD / chunk_duration), 3)
-    started_speaking = False
+    segmenter = UtteranceSegmenter(STT_RATE)
+    utterance = None
+    streaming = STT_STREAMING and on_partial is not None
+    step      = int(STT_PARTIAL_INTERVAL * STT_RATE)
+    window    = int(STT_PARTIAL_WINDOW * STT_RATE)
+    pending   = None      # in-flight partial transcription
+    ended     = threading.Event()   # end-of-speech seen — partials still queued or decoding give up
+    next_at   = step      # utterance length (samples) that triggers the next partial
+    consumed  = False
+
+    mic = get_mic()
 
     try:
-        with sd.InputStream(
-            device=MIC_DEVICE,
-            samplerate=SAMPLE_RATE,
-            channels=1,
-            dtype='float32'
-        ) as stream:
-            while True:
-                chunk, _ = stream.read(chunk_samples)
-                chunk    = chunk.flatten()
-                volume   = float(np.sqrt(np.mean(chunk ** 2)))
-
-                is_speech = volume > 0.003
-
-                if is_speech:
-                    started_speaking = True
-                    silence_chunks   = 0
-                    audio_chunks.append(chunk)
+        with span("mic_capture"), mic.subscribe(since) as frames:
+            while utterance is None:
+                item = frames.get(timeout=1.0)
+                if item is None:
+                    if mic.error is not None:
+                        raise RuntimeError(f"microphone unavailable ({mic.error})")
+                    continue
+
+                chunk, echo, _ = item
+                if echo:
+                    continue                  # the assistant's own voice
+                utterance = segmenter.push(chunk)
+
+                if not streaming or consumed or utterance is not None:
+                    continue
+                if pending is not None:
+                    if pending.done():
+                        text, pending = pending.result(), None
+                        consumed = bool(text) and on_partial(text)
+                elif segmenter.in_speech:
+                    audio = segmenter.current_audio()
+                    if len(audio) >= next_at:
+                        next_at = len(audio) + step
+                        pending = _partial_pool.submit(_transcribe_partial, audio[-window:], ended.is_set)
                 else:
-                    if started_speaking:
-                        silence_chunks += 1
-                        audio_chunks.append(chunk)
-                        if silence_chunks >= max_silence:
-                            logger.debug("Silence detected — recording complete")
-                            break
+                    next_at = step        # a dropped blip — start over with the next utterance
+            logger.debug("End of utterance detected — recording complete")
 
     except Exception as e:
         logger.error(f"Microphone stream error: {e}")
         return ""
+    finally:
+        ended.set()
+        if pending is not None:
+            pending.cancel()
 
-    if not audio_chunks:
-        logger.warning("No audio captured — you may not have spoken")
-        return ""
-
-    full_audio = np.concatenate(audio_chunks)
-
-    if len(full_audio) < SAMPLE_RATE * 0.5:
-        logger.warning("Recording too short — skipping")
+    if consumed:
         return ""
-
-    return _transcribe_numpy(full_audio, SAMPLE_RATE)
+    return _transcribe_numpy(utterance, STT_RATE)
 
 
 def listen_from_file(path: str) -> str:
     """
     Transcribe a browser-recorded audio file (WebM/Opus or any format).
-    Sends the raw file bytes directly to Groq Whisper —
-    no soundfile needed, so WebM/Opus/MP4 all work fine.
+    The STT router sends the raw file bytes to Groq Whisper, or decodes
+    it on-device with faster-whisper when the network is down.
 
     Args:
         path: Absolute path to the temp audio file saved by FastAPI.
@@ -210,81 +229,36 @@ def listen_from_file(path: str) -> str:
     """
     logger.info(f"🎙️  Transcribing file: {path}")
     try:
-        # Detect a sensible filename for Groq based on extension
-        ext = path.rsplit('.', 1)[-1].lower() if '.' in path else 'webm'
-        # Map common browser formats → Groq-accepted mime types
-        mime_map = {
-            'webm': 'audio/webm',
-            'ogg':  'audio/ogg',
-            'mp4':  'audio/mp4',
-            'wav':  'audio/wav',
-            'mp3':  'audio/mpeg',
-        }
-        mime = mime_map.get(ext, 'audio/webm')
-        filename = f"recording.{ext}"
-
-        with open(path, 'rb') as f:
-            raw_bytes = f.read()
-
-        if len(raw_bytes) < 1000:
+        if os.path.getsize(path) < 1000:
             logger.warning("Audio file too small — likely empty recording")
             return ""
 
-        logger.debug(f"Sending {len(raw_bytes)//1024} KB ({mime}) to Groq Whisper…")
-
-        transcription = _client.audio.transcriptions.create(
-            file=(filename, raw_bytes, mime),
-            model="whisper-large-v3",
-            language=None,          # auto-detect Hindi / English / Hinglish
-            response_format="text"
-        )
-
-        transcript = transcription.strip() if transcription else ""
-        if transcript:
-            logger.info(f"Heard: '{transcript}'")
-        else:
-            logger.warning("Whisper returned empty transcript")
-        return transcript
+        return _log_transcript(get_stt_router().transcribe_file(path))
 
     except Exception as e:
         logger.error(f"listen_from_file error: {e}")
         return ""
 
 
+def _log_transcript(transcript: str) -> str:
+    if transcript:
+        logger.info(f"Heard: '{transcript}'")
+    else:
+        logger.warning("Whisper returned empty transcript")
+    return transcript
+
+
 # ══════════════════════════════════════════════════
-# SHARED HELPER — resample numpy audio + send to Groq
+# SHARED HELPER — resample numpy audio + hand to the STT router
 # Used only by listen() (mic recording path)
 # ══════════════════════════════════════════════════
 def _transcribe_numpy(audio: np.ndarray, source_rate: int) -> str:
-    target_rate = 16000
-
-    if source_rate != target_rate:
-        target_length = int(len(audio) * target_rate / source_rate)
-        audio = np.interp(
-            np.linspace(0, len(audio) - 1, target_length),
-            np.arange(len(audio)),
-            audio
-        )
-
-    wav_buffer = io.BytesIO()
-    sf.write(wav_buffer, audio, target_rate, format='WAV', subtype='PCM_16')
-    wav_buffer.seek(0)
+    if source_rate != STT_RATE:
+        with span("resample_encode"):
+            audio = resample(audio, source_rate, STT_RATE)
 
-    logger.debug("Sending mic audio to Groq Whisper…")
     try:
-        transcription = _client.audio.transcriptions.create(
-            file=("audio.wav", wav_buffer, "audio/wav"),
-            model="whisper-large-v3",
-            language=None,
-            response_format="text"
-        )
-        transcript = transcription.strip() if transcription else ""
-        if transcript:
-            logger.info(f"Heard: '{transcript}'")
-        else:
-            logger.warning("Whisper returned empty transcript")
-        return transcript
-
+        return _log_transcript(get_stt_router().transcribe(audio))
     except Exception as e:
-        logger.error(f"Groq Whisper API failed: {e}")
-        return ""
\ No newline at end of file
+        logger.error(f"Speech-to-text failed: {e}")
+        return ""
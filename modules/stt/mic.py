@@ -0,0 +1,126 @@
+# modules/stt/mic.py — One always-open microphone stream shared by every listener.
+#
+#   with get_mic().subscribe() as frames:
+#       item = frames.get(timeout=1.0)     # (float32 chunk at STT_RATE, is_echo, captured_at) or None
+#
+# A single capture thread reads 20 ms blocks (16 kHz int16 natively, or resampled from
+# the device rate), tags each one with the echo gate's verdict and fans it out to the
+# subscribers — listen() and the barge-in detector read the same audio without
+# fighting over the device. The last MIC_BACKLOG_S seconds are kept so a subscriber
+# can start from a moment in the past (the onset of a barge-in).
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional
+
+import numpy as np
+import sounddevice as sd
+
+from utils.logger import logger
+from utils.queues import DropOldestQueue
+from config import STT_RATE, MIC_BACKLOG_S
+from .echo import EchoGate
+from .resample import StreamingResampler
+
+# Fallback rate matching AMD mic's native rate — used only when it refuses STT_RATE int16
+SAMPLE_RATE = 44100
+MIC_DEVICE  = 1   # Microphone Array (AMD Audio Device)
+
+BLOCK_SECONDS = 0.02
+QUEUE_SECONDS = 5.0    # a subscriber may fall this far behind before old audio is dropped
+
+_INT16_SCALE = np.float32(1.0 / 32768.0)
+
+
+def _open_mic():
+    """
+    (stream, resampler) — the mic opened at STT_RATE int16 when the device supports it,
+    otherwise at its native SAMPLE_RATE float32 with a streaming resampler to STT_RATE.
+    """
+    try:
+        sd.check_input_settings(device=MIC_DEVICE, samplerate=STT_RATE, channels=1, dtype='int16')
+        stream = sd.InputStream(device=MIC_DEVICE, samplerate=STT_RATE, channels=1,
+                                dtype='int16', blocksize=int(STT_RATE * BLOCK_SECONDS))
+        return stream, None
+    except Exception:
+        logger.debug(f"Mic refuses {STT_RATE} Hz int16 — capturing at {SAMPLE_RATE} Hz and resampling")
+
+    stream = sd.InputStream(device=MIC_DEVICE, samplerate=SAMPLE_RATE, channels=1,
+                            dtype='float32', blocksize=int(SAMPLE_RATE * BLOCK_SECONDS))
+    return stream, StreamingResampler(SAMPLE_RATE, STT_RATE)
+
+
+class MicHub:
+    def __init__(self, backlog_s: float = MIC_BACKLOG_S):
+        self.echo    = EchoGate()
+        self.error   = None      # last stream failure; cleared once the device reopens
+        self._subs   = []
+        self._recent = deque(maxlen=max(1, int(backlog_s / BLOCK_SECONDS)))
+        self._lock   = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="mic-capture")
+                self._thread.start()
+
+    @contextmanager
+    def subscribe(self, since: Optional[float] = None):
+        """Queue of every block captured from now on — preceded by the backlog from `since`."""
+        self.start()
+        frames = DropOldestQueue(maxsize=int(QUEUE_SECONDS / BLOCK_SECONDS))
+        with self._lock:
+            if since is not None:
+                for item in self._recent:
+                    if item[2] >= since:
+                        frames.put(item)
+            self._subs.append(frames)
+        try:
+            yield frames
+        finally:
+            with self._lock:
+                self._subs.remove(frames)
+            frames.close()
+
+    def _run(self):
+        while True:
+            try:
+                stream, resampler = _open_mic()
+                with stream:
+                    self.error = None
+                    while True:
+                        chunk, _ = stream.read(stream.blocksize)
+                        captured = time.monotonic()
+                        if resampler is None:
+                            chunk = chunk[:, 0] * _INT16_SCALE
+                        else:
+                            chunk = resampler.process(chunk[:, 0])
+                        if not chunk.size:
+                            continue
+
+                        item = (chunk, self.echo.is_echo(chunk, captured), captured)
+                        with self._lock:
+                            self._recent.append(item)
+                            subscribers = list(self._subs)
+                        for frames in subscribers:
+                            frames.put(item)
+
+            except Exception as e:
+                self.error = e
+                logger.error(f"Microphone stream error: {e} — reopening in 1s")
+                time.sleep(1.0)
+
+
+_mic      = None
+_mic_lock = threading.Lock()
+
+
+def get_mic() -> MicHub:
+    global _mic
+    with _mic_lock:
+        if _mic is None:
+            _mic = MicHub()
+    return _mic
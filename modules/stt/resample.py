@@ -0,0 +1,85 @@
+# modules/stt/resample.py — Chunk-by-chunk polyphase resampling for mic capture.
+#
+#   rs = StreamingResampler(44100, 16000)
+#   out = rs.process(chunk)      # float32 in, float32 out — call per capture block
+#   tail = rs.flush()            # end of stream
+#
+# Rational L/M resampling with a Kaiser-windowed sinc low-pass (anti-aliasing, unlike
+# np.interp). Only the taps that land on real output samples are evaluated, and the
+# filter state carries across calls, so the capture thread resamples as it records
+# and nothing full-length has to be allocated once speech ends.
+
+from math import gcd
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+TAPS_PER_PHASE = 24      # filter length per output sample (in input samples)
+KAISER_BETA    = 8.0     # ~80 dB stop-band
+ROLLOFF        = 0.9     # cutoff as a fraction of the lower Nyquist
+
+
+class StreamingResampler:
+    def __init__(self, src_rate: int, dst_rate: int, taps_per_phase: int = TAPS_PER_PHASE):
+        g = gcd(int(src_rate), int(dst_rate))
+        self.up, self.down = int(dst_rate) // g, int(src_rate) // g
+        self.src_rate, self.dst_rate = src_rate, dst_rate
+        self.taps = taps_per_phase
+
+        # Prototype low-pass at the upsampled rate, split into `up` phases of `taps` each.
+        # Row p holds the taps for phase p, reversed so it lines up with a forward window.
+        n = self.taps * self.up
+        cutoff = ROLLOFF * 0.5 / max(self.up, self.down)
+        t = np.arange(n) - (n - 1) / 2.0
+        h = 2 * cutoff * np.sinc(2 * cutoff * t) * np.kaiser(n, KAISER_BETA) * self.up
+        self._bank = h.reshape(self.taps, self.up).T[:, ::-1].astype(np.float32).copy()
+
+        self.reset()
+
+    def reset(self):
+        self._buf       = np.zeros(self.taps - 1, dtype=np.float32)   # history (zero-padded start)
+        self._buf_start = -(self.taps - 1)                            # global index of _buf[0]
+        self._consumed  = 0                                           # input samples seen
+        self._produced  = 0                                           # output samples emitted
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        chunk = np.asarray(chunk, dtype=np.float32).reshape(-1)
+        if self.up == self.down:
+            return chunk
+
+        self._buf = np.concatenate([self._buf, chunk])
+        self._consumed += len(chunk)
+
+        # Output n uses input samples up to floor(n * down / up); emit every n that is covered
+        end = -(-self._consumed * self.up // self.down)
+        n = np.arange(self._produced, end, dtype=np.int64)
+        if n.size == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        pos     = n * self.down
+        newest  = pos // self.up - self._buf_start
+        windows = sliding_window_view(self._buf, self.taps)[newest - self.taps + 1]
+        out = np.einsum("ij,ij->i", windows, self._bank[pos % self.up])
+
+        self._produced = int(end)
+
+        # Keep only what the next output still needs
+        next_newest = (end * self.down) // self.up
+        keep_from = min(max(next_newest - self.taps + 1 - self._buf_start, 0), len(self._buf))
+        self._buf = self._buf[keep_from:]
+        self._buf_start += keep_from
+        return out.astype(np.float32, copy=False)
+
+    def flush(self) -> np.ndarray:
+        """Push the filter's tail out with silence; the resampler is reset afterwards."""
+        tail = self.process(np.zeros(self.taps, dtype=np.float32))
+        self.reset()
+        return tail
+
+
+def resample(audio: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """One-shot helper for whole buffers (uploads, files)."""
+    if src_rate == dst_rate:
+        return np.asarray(audio, dtype=np.float32)
+    rs = StreamingResampler(src_rate, dst_rate)
+    return np.concatenate([rs.process(audio), rs.flush()])
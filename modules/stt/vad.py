@@ -0,0 +1,175 @@
+# modules/stt/vad.py — Frame-level voice activity detection + end-of-utterance.
+#
+#   seg = UtteranceSegmenter(sample_rate=44100)
+#   while True:
+#       utterance = seg.push(chunk)        # any chunk size; float32 mono in [-1, 1]
+#       if utterance is not None:
+#           break                          # speech + VAD_HANGOVER_MS of trailing silence
+#
+# Each 20 ms frame is voice when it is loud relative to an adaptive noise floor AND
+# its spectrum looks like speech (energy concentrated in 250–4000 Hz, not flat like
+# hiss or broadband traffic rumble). The floor tracks the ambient level on non-speech
+# frames, so a noisy street raises the bar instead of keeping the detector stuck open.
+
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from config import (
+    VAD_FRAME_MS, VAD_START_MS, VAD_HANGOVER_MS, VAD_PREROLL_MS, VAD_MIN_SPEECH_MS,
+    VAD_MAX_UTTERANCE_S, VAD_MARGIN_DB, VAD_NOISE_ADAPT, VAD_MIN_VOICE_BAND, VAD_MAX_FLATNESS
+)
+
+ABS_FLOOR_DB = -65.0          # never call anything quieter than this speech (dead-silent mics)
+VOICE_BAND   = (250, 4000)    # Hz
+SPECTRUM_MAX = 8000           # Hz — flatness ignores the empty top of a 44.1 kHz spectrum
+_EPS         = 1e-10
+
+
+def _ms_to_frames(ms: float, frame_ms: float) -> int:
+    return max(1, int(round(ms / frame_ms)))
+
+
+class VoiceActivityDetector:
+    """Per-frame speech / non-speech decision with an adaptive noise floor."""
+
+    def __init__(self,
+                 sample_rate: int,
+                 frame_ms: float = VAD_FRAME_MS,
+                 margin_db: float = VAD_MARGIN_DB,
+                 noise_adapt: float = VAD_NOISE_ADAPT,
+                 min_voice_band: float = VAD_MIN_VOICE_BAND,
+                 max_flatness: float = VAD_MAX_FLATNESS):
+        self.sample_rate    = sample_rate
+        self.frame_samples  = int(sample_rate * frame_ms / 1000)
+        self.margin_db      = margin_db
+        self.noise_adapt    = noise_adapt
+        self.min_voice_band = min_voice_band
+        self.max_flatness   = max_flatness
+        self.noise_db       = None     # set from the first frame
+
+        freqs = np.fft.rfftfreq(self.frame_samples, 1.0 / sample_rate)
+        self._window   = np.hanning(self.frame_samples).astype(np.float32)
+        self._band     = (freqs >= VOICE_BAND[0]) & (freqs <= VOICE_BAND[1])
+        self._analysed = (freqs >= 100) & (freqs <= SPECTRUM_MAX)
+
+    def features(self, frame: np.ndarray):
+        """(energy dB, share of power in the voice band, spectral flatness) for one frame."""
+        energy_db = 10.0 * np.log10(float(np.mean(frame * frame)) + _EPS)
+
+        power = np.abs(np.fft.rfft(frame * self._window)) ** 2 + _EPS
+        band_share = float(power[self._band].sum() / power.sum())
+
+        p = power[self._analysed]
+        flatness = float(np.exp(np.mean(np.log(p))) / np.mean(p))
+        return energy_db, band_share, flatness
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        energy_db, band_share, flatness = self.features(frame)
+        if self.noise_db is None:
+            self.noise_db = energy_db
+
+        loud   = energy_db > max(self.noise_db + self.margin_db, ABS_FLOOR_DB)
+        voiced = band_share >= self.min_voice_band and flatness <= self.max_flatness
+        speech = loud and voiced
+
+        if energy_db < self.noise_db:
+            self.noise_db = energy_db                        # ambient dropped — follow at once
+        else:
+            # Rise slowly; much slower while someone is talking so speech doesn't become "noise"
+            rate = self.noise_adapt if not speech else self.noise_adapt * 0.05
+            self.noise_db += rate * (energy_db - self.noise_db)
+
+        return speech
+
+
+class UtteranceSegmenter:
+    """
+    Turns a stream of audio into complete utterances.
+    Opens after VAD_START_MS of continuous speech (with VAD_PREROLL_MS of lead-in kept),
+    closes after VAD_HANGOVER_MS of non-speech. Bursts shorter than VAD_MIN_SPEECH_MS
+    are dropped; VAD_MAX_UTTERANCE_S caps a detector that never sees silence.
+    """
+
+    def __init__(self,
+                 sample_rate: int,
+                 vad: Optional[VoiceActivityDetector] = None,
+                 start_ms: float = VAD_START_MS,
+                 hangover_ms: float = VAD_HANGOVER_MS,
+                 preroll_ms: float = VAD_PREROLL_MS,
+                 min_speech_ms: float = VAD_MIN_SPEECH_MS,
+                 max_utterance_s: float = VAD_MAX_UTTERANCE_S):
+        self.vad = vad or VoiceActivityDetector(sample_rate)
+        frame_ms = 1000.0 * self.vad.frame_samples / sample_rate
+
+        self.frame_samples   = self.vad.frame_samples
+        self.start_frames    = _ms_to_frames(start_ms, frame_ms)
+        self.hangover_frames = _ms_to_frames(hangover_ms, frame_ms)
+        self.min_frames      = _ms_to_frames(min_speech_ms, frame_ms)
+        self.max_frames      = _ms_to_frames(max_utterance_s * 1000, frame_ms)
+        self._preroll        = deque(maxlen=_ms_to_frames(preroll_ms, frame_ms) + self.start_frames)
+        self._pending        = np.zeros(0, dtype=np.float32)
+        self.reset()
+
+    @property
+    def in_speech(self) -> bool:
+        return self._frames is not None
+
+    def current_audio(self) -> Optional[np.ndarray]:
+        """Audio of the utterance still being spoken (lead-in included), or None."""
+        if self._frames is None:
+            return None
+        return np.concatenate(self._frames)
+
+    def reset(self):
+        """Drop any partial utterance — the noise floor is kept."""
+        self._preroll.clear()
+        self._frames        = None     # list of frames while an utterance is open
+        self._onset_run     = 0
+        self._silence_run   = 0
+        self._speech_frames = 0
+
+    def push(self, chunk: np.ndarray) -> Optional[np.ndarray]:
+        """Feed audio; returns the finished utterance (float32) once end-of-speech is seen."""
+        chunk = np.asarray(chunk, dtype=np.float32).reshape(-1)
+        if self._pending.size:
+            chunk = np.concatenate([self._pending, chunk])
+
+        n = self.frame_samples
+        usable = len(chunk) - len(chunk) % n
+        self._pending = chunk[usable:].copy()
+
+        for start in range(0, usable, n):
+            utterance = self._step(chunk[start:start + n])
+            if utterance is not None:
+                self._pending = np.zeros(0, dtype=np.float32)
+                return utterance
+        return None
+
+    def _step(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        speech = self.vad.is_speech(frame)
+
+        if self._frames is None:
+            self._preroll.append(frame)
+            self._onset_run = self._onset_run + 1 if speech else 0
+            if self._onset_run >= self.start_frames:
+                self._frames        = list(self._preroll)
+                self._speech_frames = self._onset_run
+                self._silence_run   = 0
+            return None
+
+        self._frames.append(frame)
+        if speech:
+            self._speech_frames += 1
+            self._silence_run    = 0
+        else:
+            self._silence_run += 1
+
+        if self._silence_run >= self.hangover_frames or len(self._frames) >= self.max_frames:
+            frames, voiced = self._frames, self._speech_frames
+            self.reset()
+            if voiced < self.min_frames:
+                return None                 # click / horn blip — keep listening
+            return np.concatenate(frames)
+        return None
@@ -0,0 +1,67 @@
+# tests/test_fast_router.py — Regression cases for the rule-based router.
+
+import pytest
+
+from core.fast_router import fast_router, is_stop_command
+
+
+@pytest.mark.parametrize("text", [
+    "where is the bus stop",
+    "how far is the next stop",
+    "bus stop kahan hai",
+    "I cant stop",
+    "I can't stop",
+    "I won't stop",
+    "I need money for the bus",
+    "read the news",
+    "note padho",
+    "ready",
+    "timer",
+])
+def test_falls_through_to_llm(text):
+    assert fast_router.route(text) is None
+
+
+@pytest.mark.parametrize("text", [
+    "stop",
+    "please stop",
+    "stop please",
+    "stop it",
+    "bas karo",
+    "band karo",
+    "ruk jao",
+    "ruk jao please",
+    "बस करो",
+])
+def test_stop_commands(text):
+    route = fast_router.route(text)
+    assert route is not None
+    assert route["mode"] == "stop_mode"
+    assert route["confidence"] >= 0.95
+
+
+def test_stop_verb_phrase_may_close_a_sentence():
+    route = fast_router.route("currency detection band karo")
+    assert route["mode"] == "stop_mode"
+
+
+@pytest.mark.parametrize("text, mode", [
+    ("paisa", "currency_mode"),
+    ("kitne ka note hai", "currency_mode"),
+    ("read this", "reading_mode"),
+    ("thank you", "greeting_mode"),
+])
+def test_short_commands(text, mode):
+    assert fast_router.route(text)["mode"] == mode
+
+
+@pytest.mark.parametrize("text", [
+    "stop", "please stop", "stop please", "bas karo", "ruk jao", "ruk jao please", "band karo",
+])
+def test_polite_stop_confirms_barge_in(text):
+    assert is_stop_command(text)
+
+
+@pytest.mark.parametrize("text", ["where is the bus stop", "I can't stop", "kitna paisa hai"])
+def test_bystander_speech_does_not_confirm_barge_in(text):
+    assert not is_stop_command(text)
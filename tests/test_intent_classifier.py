@@ -0,0 +1,34 @@
+# tests/test_intent_classifier.py — Near misses must reach the LLM; plain commands must not.
+
+import pytest
+
+from core.intent_classifier import intent_classifier
+from config import INTENT_CLASSIFIER_MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize("text", [
+    "read the news",
+    "read out the news",
+    "read my messages",
+    "describe the note",
+    "describe that note",
+    "describe the money",
+])
+def test_near_misses_fall_through_to_llm(text):
+    assert intent_classifier.classify(text)["confidence"] < INTENT_CLASSIFIER_MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize("text, mode", [
+    ("read this", "reading_mode"),
+    ("padho", "reading_mode"),
+    ("ye kitne ka note hai", "currency_mode"),
+    ("which note is this", "currency_mode"),
+    ("tell me what is around", "navigation_mode"),
+    ("aaj mausam kaisa hai", "knowledge_mode"),
+    ("stop talking", "stop_mode"),
+    ("hello", "greeting_mode"),
+])
+def test_plain_commands_route_locally(text, mode):
+    result = intent_classifier.classify(text)
+    assert result["mode"] == mode
+    assert result["confidence"] >= INTENT_CLASSIFIER_MIN_CONFIDENCE
@@ -0,0 +1,150 @@
+# tts/audio_cache.py — Persistent, content-addressed cache of synthesized speech.
+# Stock phrases ("Stopped.", clarification questions, "500 rupees detected") are
+# synthesized once, then replayed from memory or disk — fast and offline.
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+from utils.logger import logger
+from config import TTS_CACHE_DIR, TTS_CACHE_MAX_MB, TTS_CACHE_MEMORY_ITEMS
+
+
+class AudioCache:
+    """
+    Two-tier LRU cache of MP3 bytes:
+      - hot tier:  OrderedDict in memory, TTS_CACHE_MEMORY_ITEMS entries
+      - disk tier: <key>.mp3 files in TTS_CACHE_DIR, bounded to TTS_CACHE_MAX_MB,
+                   recency tracked through file mtime so it survives restarts
+    """
+
+    def __init__(self, directory: str = TTS_CACHE_DIR,
+                 max_bytes: int = TTS_CACHE_MAX_MB * 1024 * 1024,
+                 memory_items: int = TTS_CACHE_MEMORY_ITEMS):
+        self.directory    = directory
+        self.max_bytes    = max_bytes
+        self.memory_items = memory_items
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock        = threading.Lock()
+        self.hits         = 0
+        self.misses       = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._disk_bytes = sum(
+            os.path.getsize(os.path.join(self.directory, f))
+            for f in os.listdir(self.directory) if f.endswith(".mp3")
+        )
+        logger.debug(f"TTS cache ready — {self._disk_bytes // 1024} KB on disk")
+
+    @staticmethod
+    def key(engine: str, voice: str, language: str, slow: bool, text: str) -> str:
+        """Content address for one synthesized utterance."""
+        text_hash = hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+        raw = f"{engine}|{voice}|{language}|{int(bool(slow))}|{text_hash}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.mp3")
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return audio
+
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)   # bump recency for disk LRU
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self._remember(key, audio)
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        if not audio:
+            return
+
+        path = self.path(key)
+        tmp  = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            existed = os.path.exists(path)
+            with open(tmp, "wb") as f:
+                f.write(audio)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"TTS cache write failed: {e}")
+            return
+
+        with self._lock:
+            if not existed:
+                self._disk_bytes += len(audio)
+            self._remember(key, audio)
+            if self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits":         self.hits,
+                "misses":       self.misses,
+                "memory_items": len(self._memory),
+                "disk_kb":      self._disk_bytes // 1024,
+            }
+
+    # ── internals (call with self._lock held) ─────────
+    def _remember(self, key: str, audio: bytes):
+        self._memory[key] = audio
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        """Drop least-recently-used files until the disk tier is ~90% of its budget."""
+        target = int(self.max_bytes * 0.9)
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".mp3"):
+                continue
+            full = os.path.join(self.directory, name)
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, full))
+
+        entries.sort()
+        removed = 0
+        for _, size, full in entries:
+            if self._disk_bytes <= target:
+                break
+            try:
+                os.unlink(full)
+            except OSError:
+                continue
+            self._disk_bytes -= size
+            removed += 1
+
+        logger.debug(f"TTS cache evicted {removed} file(s) — {self._disk_bytes // 1024} KB left")
+
+
+# ── shared instance ───────────────────────────────────
+_cache: Optional[AudioCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_audio_cache() -> AudioCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AudioCache()
+        return _cache
@@ -1,18 +1,92 @@
 # tts/speaker.py — Text-to-Speech wrapper.
 # Supports gTTS (prototype, free) and ElevenLabs (production, best voice quality).
+#
+# Speech runs as a small producer/consumer pipeline: a worker thread splits the
+# text into sentences and synthesizes sentence N+1 while sentence N is playing.
+# Audio stays in memory — no temp files unless the in-memory decoder is missing.
+#
+# Speaker.cancel() (barge-in) stops the clip on the speaker and drops every sentence
+# not yet played, from any thread. The clip being played is published through
+# playback_reference() so the mic side can tell the assistant's own voice from the user.
 
+import io
 import os
+import contextvars
+import queue
 import threading
 import tempfile
+import time
+from typing import Iterable, Optional
 from utils.logger import logger
+from utils.timing import span
+from utils.text_utils import split_sentences
+from tts.audio_cache import get_audio_cache
 from config import (
-    TTS_ENGINE, TTS_LANGUAGE, TTS_SLOW,
+    TTS_ENGINE, TTS_LANGUAGE, TTS_SLOW, TTS_PREFETCH,
     ELEVENLABS_API_KEY, ELEVENLABS_VOICE_ID
 )
 
-# ── Global lock — only ONE speak() runs at a time across ALL threads ──
+# ── Global lock — only ONE utterance plays at a time across ALL threads ──
+# Held for playback only; synthesis of the next utterance may start while waiting.
 _tts_lock = threading.Lock()
 
+_elevenlabs_client = None
+
+# cancel() bumps the generation — every pipeline started under an older one stops
+_generation  = 0
+_state_lock  = threading.Lock()
+_now_playing = None    # (mono float32 samples, sample rate, monotonic start) of the current clip
+_last_played = 0.0     # monotonic time the last clip stopped
+
+
+def is_speaking() -> bool:
+    """True from the first clip of an utterance until its last one has finished."""
+    return _tts_lock.locked()
+
+
+def speech_generation() -> int:
+    """Bumped by every cancel() — compare before / after speaking to tell a barge-in from silence."""
+    return _generation
+
+
+def interrupted_since(generation: int) -> bool:
+    return _generation != generation
+
+
+def playback_reference():
+    """(current clip or None, monotonic time the previous clip ended) — for echo suppression."""
+    with _state_lock:
+        return _now_playing, _last_played
+
+
+def _set_now_playing(clip):
+    global _now_playing, _last_played
+    with _state_lock:
+        if clip is None and _now_playing is not None:
+            _last_played = time.monotonic()
+        _now_playing = clip
+
+
+def _offer(q: queue.Queue, item, cancelled) -> bool:
+    """put() that gives up once the pipeline is cancelled (nobody is reading any more)."""
+    while True:
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            if cancelled():
+                return False
+
+
+def _take(q: queue.Queue, cancelled):
+    """get() that returns None as soon as the pipeline is cancelled."""
+    while True:
+        try:
+            return q.get(timeout=0.05)
+        except queue.Empty:
+            if cancelled():
+                return None
+
 
 class Speaker:
     """
@@ -23,7 +97,7 @@ class Speaker:
     """
 
     def speak(self, text: str):
-        """Convert text to speech and play it immediately."""
+        """Convert text to speech and play it, starting after the first sentence is ready."""
         if not text or not text.strip():
             logger.warning("Speaker received empty text — skipping")
             return
@@ -31,51 +105,218 @@ class Speaker:
         preview = text[:70] + "..." if len(text) > 70 else text
         logger.info(f"🔊 Speaking: '{preview}'")
 
-        # ✅ Acquire lock — if another thread is speaking, wait for it to finish
+        self._run_pipeline(split_sentences(text))
+
+    def speak_stream(self, sentences: Iterable[str]) -> str:
+        """
+        Speak sentences as they arrive (e.g. from a streaming VLM response).
+        The generator is drained by the synthesis worker, so later sentences keep
+        generating and synthesizing while earlier ones play.
+        Returns the full text that was spoken.
+        """
+        spoken = self._run_pipeline(sentences)
+        if not spoken:
+            logger.warning("Speaker received empty stream — skipping")
+        return " ".join(spoken)
+
+    def speak_to_file(self, text: str) -> Optional[str]:
+        """
+        Synthesize without playing — for web clients that play audio themselves.
+        The MP3 is stored in the audio cache; returns its path (None if any sentence fails —
+        only complete audio is ever cached).
+        Sentences reuse the same cached clips as speak().
+        """
+        if not text or not text.strip():
+            return None
+
+        voice = ELEVENLABS_VOICE_ID if TTS_ENGINE == "elevenlabs" else "default"
+        cache = get_audio_cache()
+        key   = cache.key(f"file:{TTS_ENGINE}", voice, TTS_LANGUAGE, TTS_SLOW, text)
+
+        if cache.get(key) is None:
+            # MP3 frames concatenate cleanly, so per-sentence clips join into one playable file
+            clips = []
+            for sentence in split_sentences(text):
+                clip = self._synthesize(sentence)
+                if not clip:
+                    # A file missing a sentence would be served from the cache for good
+                    logger.error(f"speak_to_file: synthesis failed for '{sentence[:40]}' — not caching")
+                    return None
+                clips.append(clip)
+            if not clips:
+                return None
+            cache.put(key, b"".join(clips))
+
+        return cache.path(key)
+
+    def cancel(self):
+        """
+        Barge-in: stop playback now and drop every queued or still-generating sentence.
+        A sentence already being synthesized finishes in the background but is never played.
+        The playsound fallback (no in-memory decoder) can't be interrupted mid-clip.
+        """
+        global _generation
+        with _state_lock:
+            _generation += 1
+        try:
+            import sounddevice as sd
+            sd.stop()
+        except Exception as e:
+            logger.debug(f"sd.stop() failed: {e}")
+
+    # ── Pipeline ──────────────────────────────────────
+    def _run_pipeline(self, sentences: Iterable[str]) -> list:
+        """
+        Worker: sentence → audio bytes → bounded queue (TTS_PREFETCH deep).
+        Caller: takes the playback lock and plays clips in order.
+        """
+        ready = queue.Queue(maxsize=max(1, TTS_PREFETCH))
+        generation = _generation
+        cancelled  = lambda: _generation != generation
+
+        def synthesize_all():
+            try:
+                for sentence in sentences:
+                    if cancelled():
+                        break
+                    sentence = (sentence or "").strip()
+                    if sentence:
+                        if not _offer(ready, (sentence, self._synthesize(sentence)), cancelled):
+                            break
+            except Exception as e:
+                logger.error(f"Speech synthesis worker failed: {e}")
+            finally:
+                _offer(ready, None, cancelled)
+
+        # Carry the caller's context so synthesis spans land in the active request trace
+        ctx = contextvars.copy_context()
+        threading.Thread(target=ctx.run, args=(synthesize_all,), daemon=True, name="tts-synth").start()
+
+        spoken = []
+        item = _take(ready, cancelled)
+        if item is None:
+            return spoken
+
         with _tts_lock:
+            while item is not None and not cancelled():
+                sentence, audio = item
+                if audio:
+                    with span("tts_playback"):
+                        self._play(audio)
+                else:
+                    print(f"\n[SPEECH OUTPUT]: {sentence}\n")
+                if not cancelled():
+                    spoken.append(sentence)
+                item = _take(ready, cancelled)
+
+        if cancelled():
+            logger.info(f"🔇 Speech interrupted after {len(spoken)} sentence(s)")
+        return spoken
+
+    def _synthesize(self, text: str) -> Optional[bytes]:
+        """Text → MP3 bytes with the configured engine. None if every engine fails."""
+        with span("tts_synth"):
             if TTS_ENGINE == "elevenlabs":
-                self._speak_elevenlabs(text)
-            else:
-                self._speak_gtts(text)
+                audio = self._cached("elevenlabs", ELEVENLABS_VOICE_ID, text, self._synthesize_elevenlabs)
+                if audio:
+                    return audio
+            return self._cached("gtts", "default", text, self._synthesize_gtts)
+
+    def _cached(self, engine: str, voice: str, text: str, synthesize) -> Optional[bytes]:
+        """Serve from the audio cache, synthesizing (and storing) only on a miss."""
+        cache = get_audio_cache()
+        key   = cache.key(engine, voice, TTS_LANGUAGE, TTS_SLOW, text)
+
+        audio = cache.get(key)
+        if audio is not None:
+            return audio
+
+        audio = synthesize(text)
+        if audio:
+            cache.put(key, audio)
+        return audio
+
+    def prewarm(self, phrases: Iterable[str]):
+        """Synthesize stock phrases into the cache ahead of time (sentence by sentence, like speak())."""
+        count = 0
+        for phrase in phrases:
+            for sentence in split_sentences(phrase or ""):
+                if self._synthesize(sentence):
+                    count += 1
+        logger.info(f"TTS cache pre-warmed — {count} clip(s) ready ✓")
 
     # ── gTTS (prototype) ──────────────────────────────
-    def _speak_gtts(self, text: str):
+    def _synthesize_gtts(self, text: str) -> Optional[bytes]:
         try:
             from gtts import gTTS
-            import playsound
-
-            tts = gTTS(text=text, lang=TTS_LANGUAGE, slow=TTS_SLOW)
-
-            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
-                temp_path = f.name
 
-            tts.save(temp_path)
-            playsound.playsound(temp_path)
+            buffer = io.BytesIO()
+            gTTS(text=text, lang=TTS_LANGUAGE, slow=TTS_SLOW).write_to_fp(buffer)
+            return buffer.getvalue()
 
         except Exception as e:
             logger.error(f"gTTS failed: {e}")
-            print(f"\n[SPEECH OUTPUT]: {text}\n")
-
-        finally:
-            try:
-                if 'temp_path' in locals() and os.path.exists(temp_path):
-                    os.unlink(temp_path)
-            except Exception:
-                pass
+            return None
 
     # ── ElevenLabs (production) ───────────────────────
-    def _speak_elevenlabs(self, text: str):
+    def _synthesize_elevenlabs(self, text: str) -> Optional[bytes]:
+        global _elevenlabs_client
+
         try:
-            from elevenlabs import ElevenLabs, play
+            from elevenlabs import ElevenLabs
+
+            if _elevenlabs_client is None:
+                _elevenlabs_client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
 
-            client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
-            audio = client.text_to_speech.convert(
+            audio = _elevenlabs_client.text_to_speech.convert(
                 voice_id=ELEVENLABS_VOICE_ID,
                 text=text,
                 model_id="eleven_turbo_v2",
             )
-            play(audio)
+            return b"".join(audio)
 
         except Exception as e:
             logger.error(f"ElevenLabs failed: {e} — falling back to gTTS")
-            self._speak_gtts(text)
\ No newline at end of file
+            return None
+
+    # ── Playback ──────────────────────────────────────
+    def _play(self, audio: bytes):
+        """Decode MP3 bytes in memory and play through sounddevice."""
+        try:
+            import soundfile as sf
+            import sounddevice as sd
+
+            samples, rate = sf.read(io.BytesIO(audio), dtype="float32")
+            mono = samples if samples.ndim == 1 else samples.mean(axis=1)
+
+            _set_now_playing((mono, rate, time.monotonic()))
+            try:
+                sd.play(samples, rate)
+                sd.wait()
+            finally:
+                _set_now_playing(None)
+
+        except Exception as e:
+            logger.debug(f"In-memory playback unavailable ({e}) — using temp file")
+            self._play_file(audio)
+
+    def _play_file(self, audio: bytes):
+        temp_path = None
+        try:
+            import playsound
+
+            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
+                f.write(audio)
+                temp_path = f.name
+
+            playsound.playsound(temp_path)
+
+        except Exception as e:
+            logger.error(f"Audio playback failed: {e}")
+
+        finally:
+            try:
+                if temp_path and os.path.exists(temp_path):
+                    os.unlink(temp_path)
+            except Exception:
+                pass
@@ -4,6 +4,7 @@ import base64
 import cv2
 import numpy as np
 from utils.logger import logger
+from utils.timing import span
 
 
 def frame_to_base64(frame: np.ndarray, quality: int = 85) -> str:
@@ -12,10 +13,11 @@ def frame_to_base64(frame: np.ndarray, quality: int = 85) -> str:
     GPT-4o Vision API expects this format.
     """
     encode_params = [cv2.IMWRITE_JPEG_QUALITY, quality]
-    success, buffer = cv2.imencode('.jpg', frame, encode_params)
-    if not success:
-        raise RuntimeError("Failed to encode image frame to JPEG")
-    b64 = base64.b64encode(buffer).decode('utf-8')
+    with span("frame_encode"):
+        success, buffer = cv2.imencode('.jpg', frame, encode_params)
+        if not success:
+            raise RuntimeError("Failed to encode image frame to JPEG")
+        b64 = base64.b64encode(buffer).decode('utf-8')
     logger.debug(f"Image encoded — size: {len(b64) // 1024} KB")
     return b64
 
@@ -0,0 +1,55 @@
+# utils/queues.py — Bounded queues for real-time pipelines.
+# put() never blocks: when the queue is full the oldest item is dropped, so a slow
+# consumer always sees the freshest data instead of backing up its producer.
+
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+
+class DropOldestQueue:
+    """
+    Usage: q = DropOldestQueue(maxsize=1)
+           q.put(frame)                 # producer — never waits
+           item = q.get(timeout=0.5)    # consumer — None on timeout or once closed and drained
+    """
+
+    def __init__(self, maxsize: int = 1):
+        self._items   = deque(maxlen=maxsize)
+        self._cond    = threading.Condition()
+        self._closed  = False
+        self.dropped  = 0
+
+    def put(self, item: Any):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1          # deque(maxlen) discards the oldest on append
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._items:
+                if self._closed:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return self._items.popleft()
+
+    def clear(self):
+        with self._cond:
+            self._items.clear()
+
+    def close(self):
+        """Wake every waiting consumer; get() returns None once the queue is empty."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
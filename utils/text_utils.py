@@ -0,0 +1,139 @@
+# utils/text_utils.py — Sentence chunking for incremental speech output,
+# and transcript normalization for local intent matching.
+
+import re
+import unicodedata
+from typing import Iterable, Iterator, List
+
+# Sentence end = . ! ? (or Hindi danda) followed by whitespace, or a line break
+_BOUNDARY = re.compile(r"(?<=[.!?।])\s+|\n+")
+
+MIN_SENTENCE_CHARS = 12    # merge tiny fragments ("Rs.", "No.") into the next sentence
+MAX_SENTENCE_CHARS = 220   # force a split on very long runs without punctuation
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split complete text into speakable sentences."""
+    return list(iter_sentences([text]))
+
+
+def iter_sentences(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Turn a stream of text deltas (e.g. LLM tokens) into whole sentences.
+    Each sentence is yielded as soon as its boundary arrives, so the caller
+    can start speaking while the rest is still generating.
+    """
+    buffer = ""
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+
+        while True:
+            cut = _find_cut(buffer)
+            if cut is None:
+                break
+            sentence, buffer = buffer[:cut].strip(), buffer[cut:].lstrip()
+            if sentence:
+                yield sentence
+
+    tail = buffer.strip()
+    if tail:
+        yield tail
+
+
+def _find_cut(buffer: str):
+    """Index where the first complete sentence in `buffer` ends, or None."""
+    for match in _BOUNDARY.finditer(buffer):
+        if len(buffer[:match.start()].strip()) >= MIN_SENTENCE_CHARS:
+            return match.end()
+
+    if len(buffer) > MAX_SENTENCE_CHARS:
+        # No usable boundary yet — break at the last comma or space instead
+        window = buffer[:MAX_SENTENCE_CHARS]
+        pos = max(window.rfind(", "), window.rfind(" "))
+        return pos + 1 if pos > 0 else MAX_SENTENCE_CHARS
+
+    return None
+
+
+def normalize_transcript(text: str) -> str:
+    """
+    Case-fold, drop punctuation/symbols and collapse whitespace.
+    Works on Devanagari too — vowel signs are marks, not punctuation, so they survive.
+    """
+    text = unicodedata.normalize("NFC", text or "").casefold()
+    text = text.replace("'", "").replace("\u2019", "")
+    chars = [
+        " " if unicodedata.category(ch)[0] in ("P", "S") else ch
+        for ch in text
+    ]
+    return " ".join("".join(chars).split())
+
+
+# ── Transliteration — Devanagari → rough Latin, so "रुको" and "ruko" share a key ──
+_DEV_VOWELS = {
+    "अ": "a", "आ": "a", "इ": "i", "ई": "i", "उ": "u", "ऊ": "u", "ऋ": "ri",
+    "ए": "e", "ऐ": "ai", "ओ": "o", "औ": "au",
+}
+_DEV_MATRAS = {
+    "ा": "a", "ि": "i", "ी": "i", "ु": "u", "ू": "u", "ृ": "ri",
+    "े": "e", "ै": "ai", "ो": "o", "ौ": "au",
+}
+_DEV_CONSONANTS = {
+    "क": "k", "ख": "kh", "ग": "g", "घ": "gh", "ङ": "n",
+    "च": "ch", "छ": "chh", "ज": "j", "झ": "jh", "ञ": "n",
+    "ट": "t", "ठ": "th", "ड": "d", "ढ": "dh", "ण": "n",
+    "त": "t", "थ": "th", "द": "d", "ध": "dh", "न": "n",
+    "प": "p", "फ": "ph", "ब": "b", "भ": "bh", "म": "m",
+    "य": "y", "र": "r", "ल": "l", "व": "v",
+    "श": "sh", "ष": "sh", "स": "s", "ह": "h",
+}
+_DEV_SIGNS = {"ं": "n", "ँ": "n", "ः": "h", "़": "", "्": ""}
+_VIRAMA = "्"
+_NUKTA  = "़"
+
+# Common Hinglish spelling drift, applied after lower-casing
+_HINGLISH_FOLDS = [
+    (re.compile(r"([a-z])\1+"), r"\1"),   # doubled letters: "aaj"→"aj", "padho"≠"paddho"
+    (re.compile(r"w"), "v"),               # dhanyawad / dhanyavad
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"z"), "j"),
+    (re.compile(r"q"), "k"),
+    (re.compile(r"(?<=[a-z])h\b"), ""),    # trailing aspirate: "kyah"/"kya"
+    (re.compile(r"ain\b"), "ai"),          # hain / hai
+]
+
+
+def transliterate_devanagari(text: str) -> str:
+    """Very small Devanagari → Latin transliterator (inherent 'a', schwa dropped at word end)."""
+    out = []
+    chars = list(text)
+    for i, ch in enumerate(chars):
+        nxt = chars[i + 1] if i + 1 < len(chars) else ""
+        if ch in _DEV_CONSONANTS:
+            out.append(_DEV_CONSONANTS[ch])
+            # inherent vowel unless a matra/virama follows or the word ends here
+            if nxt and nxt not in _DEV_MATRAS and nxt not in (_VIRAMA, _NUKTA) and not nxt.isspace():
+                out.append("a")
+        elif ch in _DEV_VOWELS:
+            out.append(_DEV_VOWELS[ch])
+        elif ch in _DEV_MATRAS:
+            out.append(_DEV_MATRAS[ch])
+        elif ch in _DEV_SIGNS:
+            out.append(_DEV_SIGNS[ch])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def canonical_transcript(text: str) -> str:
+    """
+    normalize_transcript + transliteration + Hinglish spelling folds.
+    Used as a cache key — equal keys mean "the user said the same thing".
+    """
+    text = transliterate_devanagari(normalize_transcript(text))
+    for pattern, repl in _HINGLISH_FOLDS:
+        text = pattern.sub(repl, text)
+    return " ".join(text.split())
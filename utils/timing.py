@@ -0,0 +1,113 @@
+# utils/timing.py — Per-request latency spans + rolling per-stage percentiles.
+#
+#   with tracing() as trace:            # one per request (mic utterance / web call)
+#       with span("stt_upload"):
+#           ...
+#   trace.breakdown()  → {"total_ms", "spans": [...], "by_stage": {...}}
+#   latency_metrics.summary() → {"stt_upload": {"count", "p50", "p95", "p99", "mean"}, ...}
+#
+# The active trace lives in a ContextVar, so spans opened in run_blocking() workers
+# (which copy the context) land in the request that started them. Spans outside any
+# trace (startup, camera open) still feed the rolling metrics.
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+import numpy as np
+
+METRICS_WINDOW = 500   # most recent samples kept per stage
+
+_current: ContextVar[Optional["Trace"]] = ContextVar("latency_trace", default=None)
+
+
+class Trace:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans = []              # (name, start offset s, duration s) — list.append is thread-safe
+
+    def add(self, name: str, started: float, duration: float):
+        self.spans.append((name, started - self.start, duration))
+
+    def breakdown(self) -> dict:
+        by_stage: Dict[str, float] = {}
+        for name, _, duration in self.spans:
+            by_stage[name] = by_stage.get(name, 0.0) + duration * 1000
+
+        return {
+            "total_ms": round((time.perf_counter() - self.start) * 1000, 1),
+            "spans": [
+                {"name": name, "start_ms": round(offset * 1000, 1), "ms": round(duration * 1000, 1)}
+                for name, offset, duration in sorted(self.spans, key=lambda s: s[1])
+            ],
+            "by_stage": {k: round(v, 1) for k, v in by_stage.items()},
+        }
+
+
+class LatencyMetrics:
+    """Rolling window of durations (ms) per stage name."""
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self.window   = window
+        self._samples: Dict[str, deque] = {}
+        self._lock    = threading.Lock()
+
+    def record(self, name: str, ms: float):
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self.window)).append(ms)
+
+    def summary(self) -> dict:
+        with self._lock:
+            snapshot = {name: np.array(s) for name, s in self._samples.items() if s}
+
+        result = {}
+        for name, values in sorted(snapshot.items()):
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            result[name] = {
+                "count": int(len(values)),
+                "p50":   round(float(p50), 1),
+                "p95":   round(float(p95), 1),
+                "p99":   round(float(p99), 1),
+                "mean":  round(float(values.mean()), 1),
+            }
+        return result
+
+
+latency_metrics = LatencyMetrics()
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def tracing(trace: Optional[Trace] = None):
+    """Make `trace` (or a fresh one) the active trace for this context."""
+    trace = trace or Trace()
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+def record_span(name: str, started: float):
+    """Close a span opened at perf_counter() value `started` — for stages that can't use `with`."""
+    duration = time.perf_counter() - started
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, started, duration)
+    latency_metrics.record(name, duration * 1000)
+
+
+@contextmanager
+def span(name: str):
+    """Time a stage — recorded into the active trace (if any) and the rolling metrics."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, started)